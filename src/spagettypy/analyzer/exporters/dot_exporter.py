@@ -0,0 +1,217 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, Sequence, Type
+import sys
+
+from ..graph import GraphProto, IndexedGraphProto
+from ..model import (
+    AttributeInfo,
+    ClassInfo,
+    DirectoryNode,
+    FileInfo,
+    FunctionInfo,
+    ModuleInfo,
+    Relation,
+)
+from ..serialization import node_id
+
+
+NODE_STYLE: dict[type, str] = {
+    DirectoryNode: 'shape=folder',
+    FileInfo: 'shape=note',
+    ModuleInfo: 'shape=tab, style=filled, fillcolor="#e8f0fe"',
+    ClassInfo: 'shape=box, style=filled, fillcolor="#fff4d6"',
+    FunctionInfo: 'shape=ellipse',
+    AttributeInfo: 'shape=plaintext',
+}
+
+EDGE_STYLE: dict[Relation, str] = {
+    Relation.CONTAINS: 'color="#999999", arrowhead=none',
+    Relation.IMPORTS: 'style=dashed',
+    Relation.FROM: 'style=dotted',
+    Relation.DEFINES: '',
+    Relation.METHODS: 'arrowhead=diamond',
+    Relation.CALLINGS: 'color="#1a73e8"',
+    Relation.AGREGATES: 'arrowhead=odiamond',
+    Relation.ATTRACCES: 'style=dotted, color="#999999"',
+    Relation.USES: 'style=dashed, color="#999999"',
+    Relation.INHERIT: 'arrowhead=empty',
+    Relation.ATTRIBUTE: 'arrowhead=dot',
+}
+
+
+def _quote(text: Any) -> str:
+    text = str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{text}"'
+
+
+def _label(node: Any) -> str:
+    if isinstance(node, FileInfo):
+        return f"{node.name}{node.format}"
+    if isinstance(node, DirectoryNode):
+        return Path(node.path).name or str(node.path)
+    return getattr(node, "name", str(node))
+
+
+class DotExporter:
+    """
+    Потоковый экспорт в Graphviz DOT: узлы и рёбра пишутся в файл по мере обхода графа.
+    cluster=True — каталоги (DirectoryNode) становятся вложенными subgraph cluster_*,
+    в них попадают файлы каталога и их модули; рёбра CONTAINS от каталогов не пишутся.
+    Кластер определяется полным путём каталога, каждый кластер и узел выводятся один раз.
+    Узлы и их исходящие рёбра пишутся и фильтруются (тип узла, Relation) в одном обходе узлов;
+    ребро пишется, если подходят оба конца. Лишняя память — файлы каталогов.
+    """
+    def __init__(
+        self,
+        only_classes: Optional[Sequence[Type]] = None,
+        relations: Optional[Sequence[Relation]] = None,
+        cluster: bool = True,
+        rankdir: str = "LR",
+    ) -> None:
+        self.only_classes = tuple(only_classes) if only_classes else None
+        self.relations = frozenset(relations) if relations else None
+        self.cluster = cluster
+        self.rankdir = rankdir
+
+    @contextmanager
+    def _open(self, target: Optional[Path | str | IO[str]]) -> Iterator[IO[str]]:
+        if target is None:
+            yield sys.stdout
+        elif isinstance(target, (str, Path)):
+            with open(target, "w", encoding="utf-8") as handle:
+                yield handle
+        else:
+            yield target
+
+    # ------ фильтры ------
+    def _match(self, node: Any) -> bool:
+        return self.only_classes is None or isinstance(node, self.only_classes)
+
+    @staticmethod
+    def _adjacency(graph: GraphProto) -> Iterator[tuple[Any, Iterable[tuple[Any, Any, Any]]]]:
+        """Узлы с исходящими рёбрами; у графа без out_edges рёбра группируются за один проход"""
+        if isinstance(graph, IndexedGraphProto):
+            for node in graph.nodes():
+                yield node, graph.out_edges(node)
+            return
+        grouped: dict[Any, list[tuple[Any, Any, Any]]] = {}
+        for edge in graph.edges():
+            grouped.setdefault(edge[0], []).append(edge)
+        for node in graph.nodes():
+            yield node, grouped.pop(node, ())
+
+    # ------ кластеры ------
+    @staticmethod
+    def _dir_key(path: Any) -> tuple[str, ...]:
+        """Полный путь каталога файла: ключ кластера ('.' — корень)"""
+        return tuple(part for part in Path(path).parts if part != ".")
+
+    def _directory_files(self, graph: GraphProto) -> tuple[dict[tuple[str, ...], list[Any]], dict[Any, list[Any]]]:
+        """
+        Файлы, подвешенные к каталогам, по полному пути каталога и модули этих файлов.
+        DirectoryNode хранит только имя каталога ('pkg/sub/pkg' — два узла 'pkg' на одном),
+        поэтому кластер определяется по FileInfo.path, а не по рёбрам между каталогами.
+        """
+        files: dict[tuple[str, ...], list[Any]] = {}
+        modules: dict[Any, list[Any]] = {}
+        seen: set[Any] = set()
+
+        def add(file: Any) -> None:
+            if file not in seen:
+                seen.add(file)
+                files.setdefault(self._dir_key(file.path), []).append(file)
+
+        if isinstance(graph, IndexedGraphProto):
+            for directory in graph.nodes_of_type(DirectoryNode):
+                for _, child, _ in graph.out_edges(directory):
+                    if isinstance(child, FileInfo):
+                        add(child)
+            for file in seen:
+                modules[file] = [
+                    m for _, m, data in graph.out_edges(file)
+                    if isinstance(m, ModuleInfo) and data == Relation.CONTAINS
+                ]
+        else:
+            for u, v, data in graph.edges():
+                if isinstance(u, DirectoryNode) and isinstance(v, FileInfo):
+                    add(v)
+                elif isinstance(u, FileInfo) and isinstance(v, ModuleInfo) and data == Relation.CONTAINS:
+                    modules.setdefault(u, []).append(v)
+        return files, modules
+
+    def _write_clusters(self, graph: GraphProto, out: IO[str]) -> set[Any]:
+        """Пишет вложенные кластеры каталогов, возвращает уже выведенные узлы"""
+        files, modules = self._directory_files(graph)
+        members: dict[tuple[str, ...], list[Any]] = {}
+        emitted: set[Any] = set()
+        for key, dir_files in files.items():
+            for file in dir_files:
+                for node in (file, *modules.get(file, ())):
+                    if node not in emitted and self._match(node):
+                        emitted.add(node)
+                        members.setdefault(key, []).append(node)
+
+        # только каталоги с подходящими узлами и их предки — пустые кластеры не выводятся
+        children: dict[tuple[str, ...], set[tuple[str, ...]]] = {}
+        for key in members:
+            while key:
+                parent = key[:-1]
+                siblings = children.setdefault(parent, set())
+                if key in siblings:
+                    break
+                siblings.add(key)
+                key = parent
+        if not members:
+            return emitted
+
+        # стек: (каталог, глубина, заголовок или закрытие); ключ — полный путь, каждый кластер один раз
+        stack: list[tuple[tuple[str, ...], int, bool]] = [((), 1, True)]
+        while stack:
+            key, depth, opening = stack.pop()
+            indent = "    " * depth
+            if not opening:
+                out.write(f"{indent}}}\n")
+                continue
+            directory = DirectoryNode(Path(*key) if key else Path("."))
+            out.write(f"{indent}subgraph {_quote('cluster_' + node_id(directory))} {{\n")
+            out.write(f"{indent}    label={_quote(_label(directory))};\n")
+            for node in members.get(key, ()):
+                out.write(f"{indent}    " + self._node(node))
+            stack.append((key, depth, False))
+            for child in sorted(children.get(key, ()), reverse=True):
+                stack.append((child, depth + 1, True))
+        return emitted
+
+    # ------ запись ------
+    @staticmethod
+    def _node(node: Any) -> str:
+        style = NODE_STYLE.get(type(node), "shape=plaintext")
+        return f"{_quote(node_id(node))} [label={_quote(_label(node))}, {style}];\n"
+
+    @staticmethod
+    def _edge(u: Any, v: Any, data: Any) -> str:
+        style = EDGE_STYLE.get(data, "") if isinstance(data, Relation) else ""
+        attrs = f"label={_quote(data)}" + (f", {style}" if style else "") if data is not None else style
+        return f"    {_quote(node_id(u))} -> {_quote(node_id(v))}" + (f" [{attrs}]" if attrs else "") + ";\n"
+
+    def write(self, graph: GraphProto, out: IO[str]) -> None:
+        out.write("digraph spagettypy {\n")
+        out.write(f"    rankdir={self.rankdir};\n    compound=true;\n    node [fontname=\"Helvetica\"];\n")
+        emitted = self._write_clusters(graph, out) if self.cluster else set()
+        for node, edges in self._adjacency(graph):
+            # каталоги — кластеры, их рёбра CONTAINS не пишутся; у неподходящего узла нет и рёбер
+            if (self.cluster and isinstance(node, DirectoryNode)) or not self._match(node):
+                continue
+            if node not in emitted:
+                out.write("    " + self._node(node))
+            for u, v, data in edges:
+                if (self.relations is None or data in self.relations) and self._match(v):
+                    out.write(self._edge(u, v, data))
+        out.write("}\n")
+
+    def __call__(self, graph: GraphProto, target: Optional[Path | str | IO[str]] = None) -> None:
+        """Пишет DOT в файл (путь), поток или stdout (target=None)"""
+        with self._open(target) as out:
+            self.write(graph, out)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import IO, BinaryIO, Iterator, Optional, cast
+import gzip
+import io
+import json
+import sys
+
+from ..graph import GraphProto
+from ..serialization import SCHEMA_VERSION, encode_edge, encode_node
+
+
+class JsonFormat(StrEnum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+class JsonExporter:
+    """
+    Потоковый экспорт графа: узлы и рёбра пишутся по одному, документ целиком в памяти не собирается.
+    json   — {"schema": 1, "nodes": [...], "edges": [...]}
+    ndjson — строка-заголовок {"kind": "meta"}, затем по строке на узел ("kind": "node") и ребро ("kind": "edge").
+    Рёбра ссылаются на узлы по стабильным id ('Тип:ключ'), см. analyzer.serialization.
+    """
+    def __init__(self, format: JsonFormat = JsonFormat.JSON, compress: bool = False) -> None:
+        self.format = JsonFormat(format)
+        self.compress = compress
+
+    @contextmanager
+    def _open(self, target: Optional[Path | IO]) -> Iterator[IO[str]]:
+        if target is None:
+            target = sys.stdout
+        if isinstance(target, (str, Path)):
+            handle = gzip.open(target, "wt", encoding="utf-8") if self.compress else open(target, "w", encoding="utf-8")
+            with handle:
+                yield handle
+            return
+        # чужой поток не закрывается: обёртки над ним отцепляются или закрывают только себя
+        if not self.compress:
+            if not isinstance(target, (io.RawIOBase, io.BufferedIOBase)):
+                yield target
+                return
+            text = io.TextIOWrapper(cast(BinaryIO, target), encoding="utf-8")
+            try:
+                yield text
+            finally:
+                text.flush()
+                text.detach()
+            return
+        # сжатие пишется в байтовый поток (для текстового stdout — sys.stdout.buffer)
+        raw = target if isinstance(target, (io.RawIOBase, io.BufferedIOBase)) else getattr(target, "buffer", None)
+        if raw is None:
+            raise TypeError("compress=True: нужен путь или байтовый поток")
+        with gzip.GzipFile(fileobj=raw, mode="wb") as zipped, io.TextIOWrapper(zipped, encoding="utf-8") as zipped_text:
+            yield zipped_text
+
+    @staticmethod
+    def _dump(record: dict) -> str:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+    def _write_json(self, graph: GraphProto, out: IO[str]) -> None:
+        out.write(f'{{"schema":{SCHEMA_VERSION},"nodes":[')
+        sep = "\n"
+        for node in graph.nodes():
+            out.write(sep)
+            out.write(self._dump(encode_node(node)))
+            sep = ",\n"
+        out.write('\n],"edges":[')
+        sep = "\n"
+        for u, v, data in graph.edges():
+            out.write(sep)
+            out.write(self._dump(encode_edge(u, v, data)))
+            sep = ",\n"
+        out.write("\n]}\n")
+
+    def _write_ndjson(self, graph: GraphProto, out: IO[str]) -> None:
+        out.write(self._dump({"kind": "meta", "schema": SCHEMA_VERSION}) + "\n")
+        for node in graph.nodes():
+            out.write(self._dump({"kind": "node", **encode_node(node)}) + "\n")
+        for u, v, data in graph.edges():
+            out.write(self._dump({"kind": "edge", **encode_edge(u, v, data)}) + "\n")
+
+    def __call__(self, graph: GraphProto, target: Optional[Path | IO] = None) -> None:
+        """Пишет граф в файл (путь), поток или stdout (target=None)"""
+        with self._open(target) as out:
+            if self.format == JsonFormat.NDJSON:
+                self._write_ndjson(graph, out)
+            else:
+                self._write_json(graph, out)
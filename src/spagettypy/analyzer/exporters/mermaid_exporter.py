@@ -1,7 +1,17 @@
-from typing import Type, Sequence
+from typing import Type, Sequence, Optional, IO, Any
 from io import StringIO
 from enum import StrEnum
-from ..graph import GraphProto,FilterEdgeByClass
+from html import escape
+from pathlib import Path
+import re
+from ..graph import GraphProto,FilterEdgeByClass,FilterEdgeByRelations
+from ..model import Relation, ModuleInfo, FileInfo
+from ..parsers.base import module_key
+
+class PartitionBy(StrEnum):
+    PACKAGE = "package"
+    COMPONENT = "component"
+
 
 class Direction(StrEnum):
     TOPDOWN = "TD"
@@ -10,57 +20,68 @@ class Direction(StrEnum):
     RIGHTLEFT = "RL"
 
 
-def render_mermaid_html(mermaid_code: str) -> str:
-    return f"""
+_HTML_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
       <meta charset="UTF-8">
       <script type="module">
         import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';
-        mermaid.initialize({{ startOnLoad: true }});
+        mermaid.initialize({ startOnLoad: true });
       </script>
     </head>
     <body>
       <pre class="mermaid">
-        {mermaid_code}
+        """
+_HTML_TAIL = """
       </pre>
     </body>
     </html>
-    """   
+    """
+
+
+def render_mermaid_html(mermaid_code: str) -> str:
+    return f"{_HTML_HEAD}{mermaid_code}{_HTML_TAIL}"
 
 
-class MermaidExporter:
-    def __init__(self, direction: Direction = Direction.TOPDOWN, only_classes:Sequence[Type] = None ):
+EDGE_STYLE = {
+    "imports": "-.->",
+    "defines": "-->",
+    "inherits": "--|>",
+    "uses": "-.->",
+    "calls": "-.->",
+    "has": "==>",
+    "composes": "==>",
+    "aggregates": "--o",
+}
+
+
+class BaseMermaidExporter:
+    """Выборка рёбер и строки mermaid; как их разложить по диаграммам, решают наследники"""
+    def __init__(
+        self, 
+        direction: Direction = Direction.TOPDOWN, 
+        only_classes: Optional[Sequence[Type]] = None,
+        relations: Optional[Sequence[Relation]] = None
+    ):
         self.direction = direction
-        if only_classes:
-            self.filter = FilterEdgeByClass(filter_by=only_classes)
-        
-    def __call__(self, graph:GraphProto) -> str:
-        buf = StringIO()
-        buf.write(f"graph {self.direction.value}\n")
-        
-        EDGE_STYLE = {
-            "imports": "-.->",
-            "defines": "-->",
-            "inherits": "--|>",
-            "uses": "-.->",
-            "calls": "-.->",
-            "has": "==>",
-            "composes": "==>",
-            "aggregates": "--o",
-        }
-        for src, dst, data in self.filter(graph):
-            src_id = self._id(src)
-            dst_id = self._id(dst)
-            label = self._label(data)
-            
-              
-            
-            style = EDGE_STYLE.get(label, "-->")
-            buf.write(f"    {src_id} {style} {dst_id}\n")
+        self.filter = FilterEdgeByClass(filter_by=only_classes) if only_classes else None
+        # выборка по Relation идёт по корзинам рёбер графа, а не по всем рёбрам
+        self.relations = FilterEdgeByRelations(filter_by=relations) if relations else None
 
-        return render_mermaid_html(buf.getvalue())
+    def _edges(self, graph: GraphProto):
+        if self.relations:
+            edges = self.relations(graph)
+            if self.filter:
+                edges = ((u, v, d) for u, v, d in edges if self.filter.match(u) and self.filter.match(v))
+            return edges
+        if self.filter:
+            return self.filter(graph)
+        return graph.edges()
+
+    def _line(self, src, dst, data) -> str:
+        style = EDGE_STYLE.get(self._label(data), "-->")
+        return f"    {self._id(src)} {style} {self._id(dst)}\n"
 
     @staticmethod
     def _id(obj):
@@ -72,4 +93,169 @@ class MermaidExporter:
     def _label(data):
         if isinstance(data, dict):
             return data.get("type", "")
-        return str(data)
\ No newline at end of file
+        return str(data)
+
+
+class MermaidExporter(BaseMermaidExporter):
+    def __call__(self, graph:GraphProto) -> str:
+        buf = StringIO()
+        buf.write(f"graph {self.direction.value}\n")
+        
+        for src, dst, data in self._edges(graph):
+            buf.write(self._line(src, dst, data))
+
+        return render_mermaid_html(buf.getvalue())
+
+
+class _Partition:
+    """Одна диаграмма на диске: узлы считаются для бюджета, рёбра дописываются в файл"""
+    def __init__(self, name: str, path: Path) -> None:
+        self.name = name
+        self.path = path
+        self.nodes: set[str] = set()
+        self.node_count = 0
+        self.edges = 0
+        self.handle: Optional[IO[str]] = None
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def finish(self) -> None:
+        # заполненной части множество узлов больше не нужно — остаётся только число для index.html
+        self.node_count = len(self.nodes)
+        self.nodes = set()
+
+
+class PartitionedMermaidExporter(BaseMermaidExporter):
+    """
+    Большой граф → несколько лёгких диаграмм и index.html со ссылками на них.
+    by=package   — ребро попадает в диаграмму пакета исходного узла ('pkg.sub');
+    by=component — компоненты связности (union-find за один проход по рёбрам), мелкие
+                   компоненты укладываются в одну диаграмму, пока хватает бюджета.
+    max_nodes — бюджет узлов на диаграмму: переполненная часть продолжается в 'имя-2', 'имя-3'...
+    Рёбра пишутся в файлы сразу; в памяти — только множества id узлов частей.
+    """
+    INDEX = "index.html"
+
+    def __init__(
+        self,
+        by: PartitionBy = PartitionBy.PACKAGE,
+        max_nodes: int = 300,
+        max_open_files: int = 64,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.by = PartitionBy(by)
+        self.max_nodes = max(2, max_nodes)
+        self.max_open_files = max_open_files
+
+    # ------ разбиение ------
+    @staticmethod
+    def _package(node) -> str:
+        module = node if isinstance(node, ModuleInfo) else getattr(node, "module", None)
+        if isinstance(module, ModuleInfo):
+            key = module_key(module) or module.name
+            return key.rpartition(".")[0]
+        if isinstance(node, FileInfo):
+            return ".".join(p for p in Path(node.path).parts if p not in (".", "/"))
+        return ""
+
+    def _components(self, graph: GraphProto) -> dict[str, str]:
+        """id узла → имя диаграммы: компоненты связности, упакованные в бюджет"""
+        parent: dict[str, str] = {}
+
+        def find(x: str) -> str:
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for src, dst, _ in self._edges(graph):
+            a, b = find(self._id(src)), find(self._id(dst))
+            if a != b:
+                parent[b] = a
+        sizes: dict[str, int] = {}
+        for node in parent:
+            root = find(node)
+            sizes[root] = sizes.get(root, 0) + 1
+        bins: dict[str, str] = {}
+        number, used = 0, self.max_nodes
+        for root, size in sizes.items():
+            if used + size > self.max_nodes:
+                number, used = number + 1, 0
+            bins[root] = f"component-{number}"
+            used += size
+        return {node: bins[find(node)] for node in parent}
+
+    # ------ файлы ------
+    @staticmethod
+    def _file_name(name: str, part: int) -> str:
+        base = re.sub(r"[^\w.-]+", "_", name) or "_root"
+        return f"{base}.html" if part == 1 else f"{base}-{part}.html"
+
+    def _write(self, partition: _Partition, text: str, opened: dict[str, _Partition]) -> None:
+        if partition.handle is None:
+            if len(opened) >= self.max_open_files:
+                # закрываем самый давний файл, при следующей записи он откроется на дозапись
+                _, oldest = next(iter(opened.items()))
+                oldest.close()
+                del opened[oldest.path.name]
+            new = not partition.path.exists()
+            partition.handle = open(partition.path, "a", encoding="utf-8")
+            if new:
+                partition.handle.write(f"{_HTML_HEAD}graph {self.direction.value}\n")
+        opened.pop(partition.path.name, None)
+        opened[partition.path.name] = partition
+        partition.handle.write(text)
+
+    def _write_index(self, out_dir: Path, partitions: list[_Partition]) -> Path:
+        index = out_dir / self.INDEX
+        with open(index, "w", encoding="utf-8") as f:
+            f.write("<!DOCTYPE html>\n<html>\n<head><meta charset=\"UTF-8\"><title>SpagettyPy</title></head>\n<body>\n<ul>\n")
+            for p in partitions:
+                f.write(
+                    f'  <li><a href="{escape(p.path.name)}">{escape(p.name or "(root)")}</a>'
+                    f" — {p.node_count} nodes, {p.edges} edges</li>\n"
+                )
+            f.write("</ul>\n</body>\n</html>\n")
+        return index
+
+    def __call__(self, graph: GraphProto, out_dir: Path) -> Path:
+        """Пишет диаграммы в out_dir, возвращает путь к index.html"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        components = self._components(graph) if self.by == PartitionBy.COMPONENT else None
+        current: dict[str, _Partition] = {}
+        parts: dict[str, int] = {}
+        partitions: list[_Partition] = []
+        opened: dict[str, _Partition] = {}
+        try:
+            for src, dst, data in self._edges(graph):
+                src_id, dst_id = self._id(src), self._id(dst)
+                name = components[src_id] if components is not None else self._package(src)
+                partition = current.get(name)
+                new_nodes = {src_id, dst_id} - partition.nodes if partition else {src_id, dst_id}
+                if partition is None or len(partition.nodes) + len(new_nodes) > self.max_nodes:
+                    if partition is not None:
+                        partition.finish()
+                    parts[name] = parts.get(name, 0) + 1
+                    partition = current[name] = _Partition(name, out_dir / self._file_name(name, parts[name]))
+                    partition.path.unlink(missing_ok=True)
+                    partitions.append(partition)
+                    new_nodes = {src_id, dst_id}
+                partition.nodes |= new_nodes
+                partition.edges += 1
+                self._write(partition, self._line(src, dst, data), opened)
+        finally:
+            for partition in opened.values():
+                partition.close()
+        for partition in current.values():
+            partition.finish()
+        for partition in partitions:
+            with open(partition.path, "a", encoding="utf-8") as f:
+                f.write(_HTML_TAIL)
+        return self._write_index(out_dir, partitions)
+
@@ -113,8 +113,13 @@ class DirectoryFormatter:
         filter_by_dirnfile = FilterNodeByClass(filter_by=(DirectoryNode, FileInfo))
 
         
-        stats = { "files" :0,"dicrectories":0}
-        
+        stats = { "files" :0,"directories":0}
+        for node in filter_by_dirnfile(graph):
+            if isinstance(node, FileInfo):
+                stats["files"] += 1
+            else:
+                stats["directories"] += 1
+        return stats
          
 
 class ClassFormatter:
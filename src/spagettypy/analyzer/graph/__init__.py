@@ -1,13 +1,20 @@
 from .networkx_facade import GraphX
-from .interfaces import GraphProto,FilerEdge,FilerNode,FinderEdge,FinderNode
-from .filters import FilterNodeByClass,FilterEdgeByClass
+from .frozen_graph import FrozenGraph
+from .sqlite_graph import SQLiteGraph
+from .interfaces import GraphProto,IndexedGraphProto,MutableGraphProto,FilerEdge,FilerNode,FinderEdge,FinderNode
+from .filters import FilterNodeByClass,FilterEdgeByClass,FilterEdgeByRelations
 from .finders import FindNodeByName, FindNodeByImportLike
 
 __all__ = [
     "GraphX" ,
+    "FrozenGraph",
+    "SQLiteGraph",
     "GraphProto", 
+    "IndexedGraphProto",
+    "MutableGraphProto",
     "FilterNodeByClass", 
     "FilterEdgeByClass",
+    "FilterEdgeByRelations",
     "FindNodeByName",
     "FindNodeByImportLike",
     "FilerEdge",
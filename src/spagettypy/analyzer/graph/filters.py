@@ -1,11 +1,10 @@
-from .interfaces import GraphProto
-from typing import Iterator, TypeVar, Optional,Type, Sequence,Generic
+from .interfaces import GraphProto, IndexedGraphProto
+from typing import Any, Iterator, TypeVar, Optional,Type, Sequence,Generic
 import inspect
 from ..model import Relation
 
 
 N = TypeVar("N") 
-Rel = TypeVar("Rel", bound=Relation)
 T = TypeVar("T")
 
 
@@ -25,8 +24,13 @@ class BaseTypeFilter(Generic[T]):
 
 
 class FilterNodeByClass(BaseTypeFilter):
-    def __call__(self, graph: GraphProto) -> Iterator[N]:
-        if self.filter_by:
+    def __call__(self, graph: GraphProto) -> Iterator[Any]:
+        if self.filter_by and isinstance(graph, IndexedGraphProto):
+            # индекс по типу: каждый узел один раз; как и раньше — только узлы, входящие в рёбра
+            for node in graph.nodes_of_type(self.filter_by, self.include):
+                if graph.degree(node):
+                    yield node
+        elif self.filter_by:
             edges = list(graph.edges())
             for u, v, data in edges:
                 if self.include == isinstance(v, self.filter_by) :
@@ -38,16 +42,30 @@ class FilterNodeByClass(BaseTypeFilter):
 class FilterEdgeByClass(BaseTypeFilter):
     
     def __call__(self, graph: GraphProto) -> Iterator[tuple[N,N,Optional[str]]]:
-        if self.filter_by:
+        if self.filter_by and self.include and isinstance(graph, IndexedGraphProto):
+            # только исходящие рёбра узлов нужного типа
+            for u in graph.nodes_of_type(self.filter_by):
+                for _, v, data in graph.out_edges(u):
+                    if isinstance(v, self.filter_by):
+                        yield u, v, data
+        elif self.filter_by:
             edges = list(graph.edges())
             for u, v, data in edges:
                 if self.include == (isinstance(v, self.filter_by) and isinstance(u, self.filter_by)):
                     yield u, v, data
                     
 
-class FilterEdgeByRelations(BaseTypeFilter[Rel]):
-    def __call__(self, graph: GraphProto) -> Iterator[tuple[N,N,Optional[str]]]:
-        if self.filter_by:
+class FilterEdgeByRelations:
+    """Рёбра по значению Relation (а не по типу, как BaseTypeFilter)"""
+    def __init__(self, filter_by: Relation | Sequence[Relation], include: bool = True):
+        self.include = include
+        self.filter_by: tuple[Relation, ...] = (filter_by,) if isinstance(filter_by, Relation) else tuple(filter_by)
+
+    def __call__(self, graph: GraphProto) -> Iterator[tuple[Any, Any, Optional[Relation]]]:
+        if self.filter_by and isinstance(graph, IndexedGraphProto):
+            # корзины по Relation: затрагиваются только подходящие рёбра
+            yield from graph.edges_by_relation(self.filter_by, self.include)
+        elif self.filter_by:
             edges = list(graph.edges())
             for u, v, data in edges:
                 if self.include == (data in self.filter_by):
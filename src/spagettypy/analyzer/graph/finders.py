@@ -1,6 +1,7 @@
-from .interfaces import GraphProto
-from typing import Iterator, TypeVar, Optional, Type ,Sequence
+from .interfaces import GraphProto, IndexedGraphProto
+from typing import Iterator, TypeVar, Optional, Type ,Sequence, Any
 from pathlib import Path
+from ..model import FileInfo
 
 
 N = TypeVar("N")  
@@ -8,28 +9,41 @@ N = TypeVar("N")
 class FindNodeByName:
     def __init__(self, graph: GraphProto):
         self.graph = graph
+        # графы с индексом по имени (GraphX) отвечают без обхода всех узлов
+        self._index = graph if isinstance(graph, IndexedGraphProto) else None
     
     def __call__(self,prop: str) -> Optional[N]:
+        if self._index is not None:
+            return next(self._index.nodes_by_name(prop), None)
         for node in list(self.graph.nodes()):
             if hasattr(node, "name") and getattr(node, "name") == prop:
                 return node
         return None
     
     
-from pathlib import Path
-from typing import Optional, TypeVar
-
-N = TypeVar("N")
-
 class FindNodeByImportLike:
     """
     Ищет узел в графе по пути импорта, даже если путь укорочен:
     'analyzer.parsers.structure_analyzer' → structure_analyzer из src/spagettypy/analyzer/parsers/
     """
 
-    def __init__(self, graph, root: Path):
+    def __init__(self, graph, root: Path, index: Optional[Any] = None):
         self.graph = graph
         self.root = root.resolve()
+        # индекс модулей проекта ('a.b.c' → путь), см. parsers.module_index.ModuleIndex
+        self.index = index
+        self._indexed = isinstance(graph, IndexedGraphProto)
+
+    def _from_index(self, import_like: str) -> Optional[FileInfo]:
+        path = self.index.get(import_like) if self.index is not None else None
+        if path is None or path.suffix != ".py":
+            return None
+        try:
+            rel_dir = path.parent.relative_to(self.root)
+        except ValueError:
+            return None
+        node = FileInfo(name=path.stem, format=path.suffix, path=rel_dir)
+        return node if self.graph.has_node(node) else None
 
     # 🔹 вспомогательная функция для получения нормализованного "пути модуля"
     def _import_path_of(self, node) -> Optional[str]:
@@ -37,10 +51,12 @@ class FindNodeByImportLike:
         node_name = getattr(node, "name", None)
         if not node_path or not node_name:
             return None
-        try:
-            rel = Path(node_path).relative_to(self.root)
-        except ValueError:
-            return None
+        rel = Path(node_path)
+        if rel.is_absolute():
+            try:
+                rel = rel.relative_to(self.root)
+            except ValueError:
+                return None
 
         parts = list(rel.parts)
         # добавляем имя файла без расширения
@@ -48,11 +64,19 @@ class FindNodeByImportLike:
         return ".".join(parts)
 
     # 🔹 поиск по частичному совпадению пути импорта
-    def __call__(self, import_like: str) -> Optional[N]:
+    def __call__(self, import_like: str) -> Optional[Any]:
         import_like = import_like.strip(".")
         segments = import_like.split(".")
         target_name = segments[-1]
 
+        # O(1): файл модуля из индекса, если он уже есть в графе
+        node = self._from_index(import_like)
+        if node is not None:
+            return node
+
+        if self._indexed:
+            return self._find_indexed(import_like, target_name)
+
         # Сначала — точное совпадение полного пути
         for node in list(self.graph.nodes()):
             ipath = self._import_path_of(node)
@@ -65,3 +89,17 @@ class FindNodeByImportLike:
                 return node
 
         return None
+
+    def _find_indexed(self, import_like: str, target_name: str) -> Optional[N]:
+        """Тот же поиск через индексы графа: путь импорта, затем кандидаты с тем же именем"""
+        node = next(self.graph.nodes_by_import_path(import_like), None)
+        if node is not None:
+            return node
+
+        candidates = list(self.graph.nodes_by_name(target_name))
+        suffix = f".{import_like}"
+        for node in candidates:
+            ipath = self._import_path_of(node)
+            if ipath and (ipath == import_like or ipath.endswith(suffix)):
+                return node
+        return candidates[0] if candidates else None
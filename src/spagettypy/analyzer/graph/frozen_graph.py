@@ -0,0 +1,248 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Any, Generic, Iterable, Iterator, Optional, TypeVar
+
+from ..model import Relation
+from .networkx_facade import GraphX, import_path_of, print_summary, _relation_key, _UNHASHABLE
+
+
+N = TypeVar("N")
+R = TypeVar("R", bound=Relation)
+
+
+class FrozenGraph(Generic[N, R]):
+    """
+    Неизменяемый снимок GraphX в формате CSR.
+    Узлы пронумерованы, смежность хранится в array: прямая (out_ptr/out_dst) и обратная
+    (in_ptr/in_src/in_edge), связи — номера в небольшой таблице relations.
+    Порядок узлов и рёбер совпадает с исходным графом.
+    """
+
+    def __init__(self, nodes: list[N], edges: Iterable[tuple[N, N, Optional[R]]]) -> None:
+        self._nodes = list(nodes)
+        self._ids = {node: i for i, node in enumerate(self._nodes)}
+        self.relations: list[Any] = []
+        codes: dict[Any, int] = {}
+
+        rows: list[list[tuple[int, int]]] = [[] for _ in self._nodes]
+        for u, v, data in edges:
+            key = _relation_key(data)
+            if key is _UNHASHABLE:
+                code = len(self.relations)
+                self.relations.append(data)
+            else:
+                if key not in codes:
+                    codes[key] = len(self.relations)
+                    self.relations.append(data)
+                code = codes[key]
+            rows[self._ids[u]].append((self._ids[v], code))
+
+        rel_type = "B" if len(self.relations) <= 0xFF else "H" if len(self.relations) <= 0xFFFF else "I"
+        self.out_ptr = array("Q", [0])
+        self.out_dst = array("I")
+        self.out_rel = array(rel_type)
+        for row in rows:
+            for dst, code in row:
+                self.out_dst.append(dst)
+                self.out_rel.append(code)
+            self.out_ptr.append(len(self.out_dst))
+
+        # обратная смежность: подсчёт входящих, затем раскладка по позициям (counting sort)
+        counts = [0] * (len(self._nodes) + 1)
+        for dst in self.out_dst:
+            counts[dst + 1] += 1
+        for i in range(len(self._nodes)):
+            counts[i + 1] += counts[i]
+        self.in_ptr = array("Q", counts)
+        self.in_src = array("I", bytes(4 * len(self.out_dst)))
+        self.in_edge = array("Q", bytes(8 * len(self.out_dst)))
+        cursor = counts[:-1]
+        for src in range(len(self._nodes)):
+            for e in range(self.out_ptr[src], self.out_ptr[src + 1]):
+                pos = cursor[self.out_dst[e]]
+                self.in_src[pos] = src
+                self.in_edge[pos] = e
+                cursor[self.out_dst[e]] += 1
+
+        self._build_indexes()
+
+    @classmethod
+    def from_graph(cls, graph: Any) -> FrozenGraph[N, R]:
+        return cls(list(graph.nodes()), graph.edges())
+
+    # ------ индексы ------
+    def _build_indexes(self) -> None:
+        by_name: dict[str, list[int]] = {}
+        by_import_path: dict[str, list[int]] = {}
+        by_type: dict[type, list[int]] = {}
+        for i, node in enumerate(self._nodes):
+            by_type.setdefault(type(node), []).append(i)
+            name = getattr(node, "name", None)
+            if isinstance(name, str):
+                by_name.setdefault(name, []).append(i)
+            ipath = import_path_of(node)
+            if ipath:
+                by_import_path.setdefault(ipath, []).append(i)
+        self._by_name = {k: array("I", v) for k, v in by_name.items()}
+        self._by_import_path = {k: array("I", v) for k, v in by_import_path.items()}
+        self._by_type = {k: array("I", v) for k, v in by_type.items()}
+
+        by_relation: dict[int, list[int]] = {}
+        for e, code in enumerate(self.out_rel):
+            by_relation.setdefault(code, []).append(e)
+        self._by_relation = {k: array("Q", v) for k, v in by_relation.items()}
+        # исходная вершина ребра по его номеру — для edges_by_relation
+        self._edge_src = array("I", bytes(4 * len(self.out_dst)))
+        for src in range(len(self._nodes)):
+            for e in range(self.out_ptr[src], self.out_ptr[src + 1]):
+                self._edge_src[e] = src
+
+    def nodes_by_name(self, name: str) -> Iterator[N]:
+        return (self._nodes[i] for i in self._by_name.get(name, ()))
+
+    def nodes_by_import_path(self, import_path: str) -> Iterator[N]:
+        return (self._nodes[i] for i in self._by_import_path.get(import_path, ()))
+
+    def nodes_of_type(self, types: type | tuple[type, ...], include: bool = True) -> Iterator[N]:
+        for node_type, ids in self._by_type.items():
+            if issubclass(node_type, types) == include:
+                yield from (self._nodes[i] for i in ids)
+
+    def _edge(self, e: int) -> tuple[N, N, Optional[R]]:
+        return (self._nodes[self._edge_src[e]], self._nodes[self.out_dst[e]], self.relations[self.out_rel[e]])
+
+    def edges_by_relation(self, relations: Iterable[Any], include: bool = True) -> Iterator[tuple[N, N, Optional[R]]]:
+        wanted = {r for r in relations if _relation_key(r) is not _UNHASHABLE}
+        for code, edge_ids in self._by_relation.items():
+            data = self.relations[code]
+            hashable = _relation_key(data) is not _UNHASHABLE
+            if (hashable and data in wanted) == include or (not hashable and not include):
+                for e in edge_ids:
+                    yield self._edge(e)
+
+    def relation_counts(self) -> dict[Any, int]:
+        counts: dict[Any, int] = {}
+        for code, edge_ids in self._by_relation.items():
+            data = self.relations[code]
+            if _relation_key(data) is not _UNHASHABLE:
+                counts[data] = counts.get(data, 0) + len(edge_ids)
+        return counts
+
+    # ------ узлы и рёбра ------
+    def add_node(self, node: N) -> None:
+        raise TypeError("FrozenGraph is read-only, use thaw()")
+
+    def add_edge(self, source: N, target: N, data: Optional[R] = None) -> None:
+        raise TypeError("FrozenGraph is read-only, use thaw()")
+
+    def has_node(self, node: N) -> bool:
+        return node in self._ids
+
+    def nodes(self) -> Iterator[N]:
+        return iter(self._nodes)
+
+    def _find_edge(self, source: N, target: N) -> Optional[int]:
+        src = self._ids.get(source)
+        dst = self._ids.get(target)
+        if src is None or dst is None:
+            return None
+        for e in range(self.out_ptr[src], self.out_ptr[src + 1]):
+            if self.out_dst[e] == dst:
+                return e
+        return None
+
+    def has_edge(self, source: N, target: N) -> bool:
+        return self._find_edge(source, target) is not None
+
+    def get_edge_data(self, source: N, target: N) -> Optional[R]:
+        e = self._find_edge(source, target)
+        return None if e is None else self.relations[self.out_rel[e]]
+
+    def edges(self) -> Iterator[tuple[N, N, Optional[R]]]:
+        nodes, relations = self._nodes, self.relations
+        for src, u in enumerate(nodes):
+            for e in range(self.out_ptr[src], self.out_ptr[src + 1]):
+                yield (u, nodes[self.out_dst[e]], relations[self.out_rel[e]])
+
+    def out_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        src = self._ids[node]
+        for e in range(self.out_ptr[src], self.out_ptr[src + 1]):
+            yield (node, self._nodes[self.out_dst[e]], self.relations[self.out_rel[e]])
+
+    def in_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        dst = self._ids[node]
+        for pos in range(self.in_ptr[dst], self.in_ptr[dst + 1]):
+            e = self.in_edge[pos]
+            yield (self._nodes[self.in_src[pos]], node, self.relations[self.out_rel[e]])
+
+    def degree(self, node: N) -> int:
+        i = self._ids[node]
+        return (self.out_ptr[i + 1] - self.out_ptr[i]) + (self.in_ptr[i + 1] - self.in_ptr[i])
+
+    def children(self, node: N) -> Iterator[N]:
+        return (v for _, v, _ in self.out_edges(node))
+
+    def parents(self, node: N) -> Iterator[N]:
+        return (u for u, _, _ in self.in_edges(node))
+
+    def _reach(self, node: N, ptr: array, targets: array) -> set[N]:
+        start = self._ids[node]
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            for pos in range(ptr[i], ptr[i + 1]):
+                j = targets[pos]
+                if j not in seen:
+                    seen.add(j)
+                    queue.append(j)
+        seen.discard(start)
+        return {self._nodes[i] for i in seen}
+
+    def descendants(self, node: N) -> set[N]:
+        return self._reach(node, self.out_ptr, self.out_dst)
+
+    def ancestors(self, node: N) -> set[N]:
+        return self._reach(node, self.in_ptr, self.in_src)
+
+    def subgraph(self, nodes: list[N]) -> GraphX[N, R]:
+        return self.thaw().subgraph(nodes)
+
+    def thaw(self) -> GraphX[N, R]:
+        """Обратно в изменяемый GraphX"""
+        graph = GraphX[N, R]()
+        for node in self._nodes:
+            graph.add_node(node)
+        for u, v, data in self.edges():
+            graph.add_edge(u, v, data=data)
+        return graph
+
+    def __getstate__(self) -> dict[str, Any]:
+        # индексы не сохраняются: они восстанавливаются по массивам при загрузке
+        state = {k: getattr(self, k) for k in ("_nodes", "relations", "out_ptr", "out_dst", "out_rel", "in_ptr", "in_src", "in_edge")}
+        # массивы из снимка — memoryview поверх mmap, в pickle уходит их копия
+        for k, v in state.items():
+            if isinstance(v, memoryview):
+                state[k] = array(v.format)
+                state[k].frombytes(v.cast("B"))
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+        self._ids = {node: i for i, node in enumerate(self._nodes)}
+        self._build_indexes()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._ids
+
+    def __repr__(self) -> str:
+        return f"FrozenGraph({len(self._nodes)} nodes, {len(self.out_dst)} edges)"
+
+    # ------ users methods ------
+    def show_summary(self) -> None:
+        print_summary(self)
@@ -1,4 +1,4 @@
-from typing import Protocol, TypeVar, Optional,Iterator, Any
+from typing import Protocol, TypeVar, Optional,Iterator, Any, Iterable, runtime_checkable
 from ..model import Relation
 
 N = TypeVar("N")  
@@ -10,6 +10,26 @@ class GraphProto(Protocol[N,E]):
     def add_node(self, node: N) -> None:...
     def edges(self) -> Iterator[tuple[N, N, Optional[E]]]:...
     def nodes(self) -> Iterator[N]:...
+
+
+@runtime_checkable
+class IndexedGraphProto(GraphProto[N,E], Protocol):
+    """Граф со вторичными индексами; finders/filters используют их вместо полного обхода"""
+    def nodes_by_name(self, name: str) -> Iterator[N]:...
+    def nodes_by_import_path(self, import_path: str) -> Iterator[N]:...
+    def nodes_of_type(self, types: type | tuple[type, ...], include: bool = True) -> Iterator[N]:...
+    def out_edges(self, node: N) -> Iterator[tuple[N, N, Optional[E]]]:...
+    def in_edges(self, node: N) -> Iterator[tuple[N, N, Optional[E]]]:...
+    def degree(self, node: N) -> int:...
+    def edges_by_relation(self, relations: Iterable[E], include: bool = True) -> Iterator[tuple[N, N, Optional[E]]]:...
+    def relation_counts(self) -> dict[E, int]:...
+
+
+class MutableGraphProto(IndexedGraphProto[N,E], Protocol):
+    """Граф, из которого можно удалять узлы и рёбра (точечное обновление, см. parsers.incremental)"""
+    def has_node(self, node: N) -> bool:...
+    def remove_node(self, node: N) -> None:...
+    def remove_edge(self, source: N, target: N) -> None:...
     
 class FilerNode(Protocol):
     def __call__(self, graph: GraphProto) -> Iterator[N]:...
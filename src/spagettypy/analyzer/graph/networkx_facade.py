@@ -1,23 +1,139 @@
 from __future__ import annotations
-from typing import Generic, TypeVar, Iterator, Optional, Any
+from typing import TYPE_CHECKING, Generic, TypeVar, Iterator, Optional, Any, Iterable
 import networkx as nx
+from pathlib import Path, PurePath
 from ..model import FileInfo, Relation
 
+if TYPE_CHECKING:
+    from .frozen_graph import FrozenGraph
+
 
 N = TypeVar("N")  
-R = TypeVar("E", bound=Relation)  
+R = TypeVar("R", bound=Relation)
+
+# корзина для рёбер с нехэшируемым data (например, dict)
+_UNHASHABLE = object()
+
+
+def _relation_key(data: Any) -> Any:
+    try:
+        hash(data)
+    except TypeError:
+        return _UNHASHABLE
+    return data
+
+
+def import_path_of(node: Any) -> Optional[str]:
+    """Нормализованный путь импорта узла: части path + name через точку"""
+    node_path = getattr(node, "path", None)
+    node_name = getattr(node, "name", None)
+    if not node_path or not isinstance(node_path, (str, PurePath)) or not isinstance(node_name, str):
+        return None
+    path = Path(node_path)
+    parts = [p for p in path.parts if p not in (".", path.anchor)]
+    parts.append(node_name)
+    return ".".join(parts)
 
 
 class GraphX(Generic[N, R]):
     
     def __init__(self):
         self._graph: nx.DiGraph = nx.DiGraph()
-
+        # вторичные индексы, поддерживаются в add_node/add_edge/remove_node
+        self._by_name: dict[str, dict[N, None]] = {}
+        self._by_import_path: dict[str, dict[N, None]] = {}
+        self._by_type: dict[type, dict[N, None]] = {}
+        self._by_relation: dict[Any, dict[tuple[N, N], None]] = {}
+
+    # ------ индексы ------
+    def _index_node(self, node: N) -> None:
+        self._by_type.setdefault(type(node), {})[node] = None
+        name = getattr(node, "name", None)
+        if isinstance(name, str):
+            self._by_name.setdefault(name, {})[node] = None
+        ipath = import_path_of(node)
+        if ipath:
+            self._by_import_path.setdefault(ipath, {})[node] = None
+
+    def _unindex_node(self, node: N) -> None:
+        node_type = type(node)
+        if node not in self._by_type.get(node_type, ()):
+            # равный по __eq__ узел другого типа (BaseData сравниваются по имени)
+            node_type = next((t for t, b in self._by_type.items() if node in b), node_type)
+        bucket = self._by_type.get(node_type)
+        if bucket is not None:
+            bucket.pop(node, None)
+            if not bucket:
+                del self._by_type[node_type]
+        for index, key in ((self._by_name, getattr(node, "name", None)), (self._by_import_path, import_path_of(node))):
+            if not isinstance(key, str):
+                continue
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(node, None)
+                if not bucket:
+                    del index[key]
+
+    def _reindex(self) -> None:
+        self._by_name = {}
+        self._by_import_path = {}
+        self._by_type = {}
+        self._by_relation = {}
+        for node in self._graph.nodes:
+            self._index_node(node)
+        for u, v, attrs in self._graph.edges(data=True):
+            self._index_edge(u, v, attrs.get("data"))
+
+    def _index_edge(self, source: N, target: N, data: Any) -> None:
+        self._by_relation.setdefault(_relation_key(data), {})[(source, target)] = None
+
+    def _unindex_edge(self, source: N, target: N, data: Any) -> None:
+        key = _relation_key(data)
+        bucket = self._by_relation.get(key)
+        if bucket is not None:
+            bucket.pop((source, target), None)
+            if not bucket:
+                del self._by_relation[key]
+
+    def nodes_by_name(self, name: str) -> Iterator[N]:
+        return iter(list(self._by_name.get(name, ())))
+
+    def nodes_by_import_path(self, import_path: str) -> Iterator[N]:
+        return iter(list(self._by_import_path.get(import_path, ())))
+
+    def nodes_of_type(self, types: type | tuple[type, ...], include: bool = True) -> Iterator[N]:
+        """Узлы, которые являются (include=True) или не являются экземплярами types; каждый — один раз"""
+        for node_type, bucket in list(self._by_type.items()):
+            if issubclass(node_type, types) == include:
+                yield from list(bucket)
+
+    def edges_by_relation(self, relations: Iterable[Any], include: bool = True) -> Iterator[tuple[N, N, Optional[R]]]:
+        """Рёбра с data из relations (или, при include=False, все остальные) — без обхода прочих рёбер"""
+        wanted = [r for r in relations if _relation_key(r) is not _UNHASHABLE]
+        if include:
+            keys = [r for r in dict.fromkeys(wanted) if r in self._by_relation]
+        else:
+            keys = [k for k in self._by_relation if k is _UNHASHABLE or k not in wanted]
+        for key in keys:
+            for u, v in list(self._by_relation.get(key, ())):
+                yield (u, v, self.get_edge_data(u, v) if key is _UNHASHABLE else key)
+
+    def relation_counts(self) -> dict[Any, int]:
+        """Число рёбер по каждому значению Relation (O(число видов связей))"""
+        return {k: len(b) for k, b in self._by_relation.items() if k is not _UNHASHABLE}
+
+    # ------ узлы и рёбра ------
     def add_node(self, node: N) -> None:
-        self._graph.add_node(node)
+        if node not in self._graph:
+            self._graph.add_node(node)
+            self._index_node(node)
 
     def remove_node(self, node: N) -> None:
+        if node in self._graph:
+            for u, v, attrs in list(self._graph.in_edges(node, data=True)) + list(self._graph.out_edges(node, data=True)):
+                self._unindex_edge(u, v, attrs.get("data"))
         self._graph.remove_node(node)
+        self._unindex_node(node)
 
     def has_node(self, node: N) -> bool:
         return self._graph.has_node(node)
@@ -26,10 +142,17 @@ class GraphX(Generic[N, R]):
         return iter(self._graph.nodes)
 
     def add_edge(self, source: N, target: N, data: Optional[R] = None) -> None:
+        self.add_node(source)
+        self.add_node(target)
+        if self._graph.has_edge(source, target):
+            self._unindex_edge(source, target, self.get_edge_data(source, target))
         self._graph.add_edge(source, target, data=data)
+        self._index_edge(source, target, data)
 
     def remove_edge(self, source: N, target: N) -> None:
+        data = self.get_edge_data(source, target)
         self._graph.remove_edge(source, target)
+        self._unindex_edge(source, target, data)
 
     def has_edge(self, source: N, target: N) -> bool:
         return self._graph.has_edge(source, target)
@@ -38,6 +161,17 @@ class GraphX(Generic[N, R]):
         for u, v, attrs in self._graph.edges(data=True):
             yield (u, v, attrs.get("data"))
 
+    def out_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        for u, v, attrs in self._graph.out_edges(node, data=True):
+            yield (u, v, attrs.get("data"))
+
+    def in_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        for u, v, attrs in self._graph.in_edges(node, data=True):
+            yield (u, v, attrs.get("data"))
+
+    def degree(self, node: N) -> int:
+        return self._graph.degree(node)
+
     def children(self, node: N) -> Iterator[N]:
         return self._graph.successors(node)
 
@@ -58,8 +192,17 @@ class GraphX(Generic[N, R]):
     def subgraph(self, nodes: list[N]) -> GraphX[N, R]:
         sub = GraphX[N, R]()
         sub._graph = self._graph.subgraph(nodes).copy()
+        sub._reindex()
         return sub
 
+    def __getstate__(self) -> dict[str, Any]:
+        # индексы не сохраняются: они восстанавливаются по графу при загрузке
+        return {"graph": self._graph}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._graph = state["graph"]
+        self._reindex()
+
     def __len__(self) -> int:
         return len(self._graph)
 
@@ -70,21 +213,28 @@ class GraphX(Generic[N, R]):
         return f"TypedGraph({len(self._graph.nodes)} nodes, {len(self._graph.edges)} edges)"
     
     
+    def freeze(self) -> "FrozenGraph[N, R]":
+        """Компактный неизменяемый снимок (CSR на array) для экспорта и аналитики"""
+        from .frozen_graph import FrozenGraph
+        return FrozenGraph.from_graph(self)
+    
+    
     # ------ users methods ------
     def show_summary(self) -> None:
-        nodes = list(self._graph.nodes())
-        edges = list(self._graph.edges())
-        print(f"Узлов: {len(nodes)}")
-        print(f"Рёбер: {len(edges)}")
-        for u, v, in edges:
-            if isinstance(v, FileInfo):
-                v_label = str(v.path / f"{v.name}{v.format}")
-            else:
-                v_label = str(getattr(v, "path", getattr(v, "name", str(v))))
-            u_label = str(getattr(u, "path", getattr(u, "name", str(u))))
-            relations = self.get_edge_data(u,v)
-            print(f"{u.__class__.__name__}:{u_label} --({relations or ""})--> {v.__class__.__name__}:{v_label}")
-
-
-        
-
+        print_summary(self)
+
+
+def print_summary(graph: Any) -> None:
+    """Сводка по графу: числа узлов, рёбер и связей, затем список рёбер"""
+    edges = list(graph.edges())
+    print(f"Узлов: {len(graph)}")
+    print(f"Рёбер: {len(edges)}")
+    for relation, count in graph.relation_counts().items():
+        print(f"  {relation or '-'}: {count}")
+    for u, v, relations in edges:
+        if isinstance(v, FileInfo):
+            v_label = str(v.path / f"{v.name}{v.format}")
+        else:
+            v_label = str(getattr(v, "path", getattr(v, "name", str(v))))
+        u_label = str(getattr(u, "path", getattr(u, "name", str(u))))
+        print(f"{u.__class__.__name__}:{u_label} --({relations or ""})--> {v.__class__.__name__}:{v_label}")
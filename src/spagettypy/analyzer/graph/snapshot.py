@@ -0,0 +1,221 @@
+"""
+Бинарный снимок графа (.spg):
+
+    заголовок   MAGIC, версия, порядок байт, таблица секций (смещение, число элементов)
+    строки      str_ptr (Q) + str_blob (UTF-8) — все строки снимка, каждая один раз
+    узлы        node_class, node_id (I — номера строк), node_field_ptr (Q),
+                field_key, field_value (I — имя поля и его значение в JSON, тоже строки)
+    рёбра       CSR из FrozenGraph: out_ptr/out_dst/out_rel, in_ptr/in_src/in_edge,
+                relations (I — номера строк)
+
+Секции выровнены по 8 байт; при загрузке массивы рёбер — memoryview поверх mmap, без копирования.
+"""
+
+from __future__ import annotations
+from array import array
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from typing import Any, Literal
+import json
+import mmap
+import os
+import struct
+import sys
+
+from ..serialization import _value, decode_node, decode_relation, encode_node, node_id
+from .frozen_graph import FrozenGraph
+from .interfaces import GraphProto
+
+MAGIC = b"SPGSNAP\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sIB3x")
+_SECTION = struct.Struct("<QQ")
+_ALIGN = 8
+
+# коды array/memoryview, которые встречаются в секциях
+ArrayCode = Literal["B", "I", "Q"]
+
+# порядок и типы секций фиксированы форматом
+SECTIONS: tuple[tuple[str, ArrayCode], ...] = (
+    ("str_ptr", "Q"),
+    ("str_blob", "B"),
+    ("node_class", "I"),
+    ("node_id", "I"),
+    ("node_field_ptr", "Q"),
+    ("field_key", "I"),
+    ("field_value", "I"),
+    ("relations", "I"),
+    ("out_ptr", "Q"),
+    ("out_dst", "I"),
+    ("out_rel", "I"),
+    ("in_ptr", "Q"),
+    ("in_src", "I"),
+    ("in_edge", "Q"),
+)
+_LITTLE = sys.byteorder == "little"
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.ptr = array("Q", [0])
+        self.blob = bytearray()
+
+    def __call__(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.ptr) - 1
+            self.blob += text.encode("utf-8")
+            self.ptr.append(len(self.blob))
+        return sid
+
+
+class _Strings:
+    """Таблица строк снимка: строка декодируется при первом обращении"""
+    def __init__(self, ptr: Any, blob: Any) -> None:
+        self.ptr = ptr
+        self.blob = blob
+        self._cache: dict[int, str] = {}
+
+    def __getitem__(self, sid: int) -> str:
+        text = self._cache.get(sid)
+        if text is None:
+            text = self._cache[sid] = bytes(self.blob[self.ptr[sid]:self.ptr[sid + 1]]).decode("utf-8")
+        return text
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def is_snapshot(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# ------ запись ------
+def save_snapshot(graph: GraphProto, path: Path) -> None:
+    """Сохраняет граф в бинарный снимок (атомарно, через временный файл)"""
+    frozen = graph if isinstance(graph, FrozenGraph) else FrozenGraph.from_graph(graph)
+    intern = _Interner()
+
+    sections: dict[str, array] = {name: array(code) for name, code in SECTIONS}
+    sections["node_field_ptr"].append(0)
+    for node in frozen.nodes():
+        record = encode_node(node)
+        sections["node_class"].append(intern(record.pop("class")))
+        sections["node_id"].append(intern(record.pop("id")))
+        for key, value in record.items():
+            sections["field_key"].append(intern(key))
+            sections["field_value"].append(intern(_dumps(value)))
+        sections["node_field_ptr"].append(len(sections["field_key"]))
+    sections["relations"].extend(intern(_dumps(_value(r))) for r in frozen.relations)
+    for name, code in SECTIONS[-6:]:
+        # out_rel в FrozenGraph может быть B/H — в снимке всегда I
+        data = getattr(frozen, name)
+        sections[name] = data if isinstance(data, array) and data.typecode == code else array(code, data)
+    sections["str_ptr"] = intern.ptr
+    sections["str_blob"] = array("B", bytes(intern.blob))
+
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    header_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+    offset = -(-header_size // _ALIGN) * _ALIGN
+    table = []
+    for name, _ in SECTIONS:
+        data = sections[name]
+        table.append((offset, len(data)))
+        offset += -(-len(data) * data.itemsize // _ALIGN) * _ALIGN
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 1 if _LITTLE else 0))
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for (name, _), (start, _) in zip(SECTIONS, table):
+            f.write(b"\x00" * (start - f.tell()))
+            sections[name].tofile(f)
+        f.write(b"\x00" * (offset - f.tell()))
+    os.replace(tmp, path)
+
+
+# ------ чтение ------
+def _sections(buffer: memoryview) -> dict[str, Any]:
+    magic, version, little = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("not a spagettypy snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    result: dict[str, memoryview | array] = {}
+    for i, (name, code) in enumerate(SECTIONS):
+        start, count = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+        size = count * array(code).itemsize
+        view = buffer[start:start + size]
+        if bool(little) == _LITTLE:
+            result[name] = view if code == "B" else view.cast(code)
+        else:
+            # снимок с другим порядком байт — копия с перестановкой
+            data = array(code, bytes(view))
+            data.byteswap()
+            result[name] = data
+    return result
+
+
+def _link(nodes: list[Any], by_id: dict[str, Any]) -> None:
+    """Ссылки module/file у узлов → настоящие узлы снимка, а не заглушки декодера"""
+    for node in nodes:
+        for attr in ("module", "file"):
+            ref = getattr(node, attr, None)
+            if ref is None:
+                continue
+            real = by_id.get(node_id(ref))
+            if real is not None and real is not ref:
+                try:
+                    setattr(node, attr, real)
+                except (AttributeError, FrozenInstanceError):
+                    pass
+
+
+def load_snapshot(path: Path, use_mmap: bool = True) -> FrozenGraph:
+    """
+    Загружает снимок в FrozenGraph.
+    Узлы восстанавливаются сразу (нужны для хэширования), массивы рёбер остаются в mmap.
+    """
+    with open(path, "rb") as f:
+        if use_mmap:
+            buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            buffer = memoryview(f.read())
+    s = _sections(buffer)
+    strings = _Strings(s["str_ptr"], s["str_blob"])
+
+    values: dict[int, Any] = {}
+
+    def value_of(sid: int) -> Any:
+        value = values.get(sid)
+        if value is None and sid not in values:
+            value = values[sid] = json.loads(strings[sid])
+        # списки (args_types) не делятся между узлами
+        return list(value) if isinstance(value, list) else value
+
+    nodes = []
+    by_id: dict[str, Any] = {}
+    field_key, field_value, field_ptr = s["field_key"], s["field_value"], s["node_field_ptr"]
+    for i, (class_sid, id_sid) in enumerate(zip(s["node_class"], s["node_id"])):
+        start, end = field_ptr[i], field_ptr[i + 1]
+        record = dict(zip(map(strings.__getitem__, field_key[start:end]), map(value_of, field_value[start:end])))
+        record["class"] = strings[class_sid]
+        record["id"] = strings[id_sid]
+        node = decode_node(record)
+        nodes.append(node)
+        by_id[record["id"]] = node
+    _link(nodes, by_id)
+
+    graph = FrozenGraph.__new__(FrozenGraph)
+    graph.__setstate__({
+        "_nodes": nodes,
+        "relations": [decode_relation(json.loads(strings[sid])) for sid in s["relations"]],
+        **{name: s[name] for name in ("out_ptr", "out_dst", "out_rel", "in_ptr", "in_src", "in_edge")},
+    })
+    return graph
@@ -0,0 +1,536 @@
+from __future__ import annotations
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generic, Iterable, Iterator, Optional, TypeVar
+import json
+import os
+import sqlite3
+import weakref
+
+from ..model import BaseData, FileInfo, Relation
+from ..serialization import MODEL_TYPES, _value, decode_node, decode_relation, encode_node, node_id
+from .networkx_facade import GraphX, import_path_of, print_summary, _relation_key, _UNHASHABLE
+
+if TYPE_CHECKING:
+    from .frozen_graph import FrozenGraph
+
+
+N = TypeVar("N")
+R = TypeVar("R", bound=Relation)
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    class TEXT NOT NULL,
+    name TEXT,
+    import_path TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes(name);
+CREATE INDEX IF NOT EXISTS nodes_import_path ON nodes(import_path);
+CREATE INDEX IF NOT EXISTS nodes_class ON nodes(class);
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    src INTEGER NOT NULL,
+    dst INTEGER NOT NULL,
+    rel INTEGER NOT NULL,
+    src_record TEXT,
+    dst_record TEXT,
+    UNIQUE (src, dst)
+);
+CREATE INDEX IF NOT EXISTS edges_src ON edges(src, id);
+CREATE INDEX IF NOT EXISTS edges_dst ON edges(dst, id);
+CREATE INDEX IF NOT EXISTS edges_rel ON edges(rel);
+"""
+
+_NODE_ID = "(SELECT id FROM nodes WHERE key = ?)"
+# параметров в одном запросе SQLite не больше 999 (старые сборки)
+_CHUNK = 500
+_EDGE_SELECT = """
+SELECT s.key, s.record, d.key, d.record, e.src_record, e.dst_record, r.value
+FROM edges e
+JOIN nodes s ON s.id = e.src
+JOIN nodes d ON d.id = e.dst
+JOIN relations r ON r.id = e.rel
+"""
+
+
+def identity(node: Any) -> str:
+    """
+    Ключ узла в таблице nodes — те же правила равенства, что у GraphX:
+    BaseData равны по имени (независимо от типа), FileInfo — по всем полям, DirectoryNode — по пути.
+    """
+    if isinstance(node, BaseData):
+        return f"BaseData:{node.name}"
+    if isinstance(node, FileInfo) and node.is_exclude:
+        return f"{node_id(node)}:exclude"
+    return node_id(node)
+
+
+def _dumps(node: Any) -> str:
+    record = encode_node(node)
+    # файл модуля класса/функции: по нему строится ключ модуля (parsers.base.module_key), как у живого узла GraphX
+    module_file = getattr(getattr(node, "module", None), "file", None)
+    if module_file is not None:
+        record["module_file"] = _value(module_file)
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(data: str) -> Any:
+    record = json.loads(data)
+    node = decode_node(record)
+    if "module_file" in record and getattr(node, "module", None) is not None:
+        node.module = decode_node({"class": "ModuleInfo", "id": record["module"], "name": node.module.name, "file": record["module_file"]})
+    return node
+
+
+def _weakrefable(node: Any) -> bool:
+    """У строк и чисел нет weakref, но равные значения и неотличимы"""
+    return type(node).__weakrefoffset__ != 0
+
+
+def is_sqlite(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+class SQLiteGraph(Generic[N, R]):
+    """
+    GraphProto в файле SQLite: размер графа ограничен диском, а не памятью.
+    Таблицы nodes / relations / edges с индексами по имени, пути импорта, типу, связи и обеим вершинам.
+    Запись буферизуется и вливается пачками (executemany в одной транзакции) — по достижении batch_size
+    или перед чтением, которое задевает буфер: запрос по ключу, имени, пути импорта или типу
+    сбрасывает буфер, только если в нём есть такие узлы; полные обходы сбрасывают его всегда.
+    Узлы хранятся записями analyzer.serialization. Порядок узлов и рёбер — порядок добавления, как у GraphX.
+
+    Как у GraphX, узлом остаётся первый добавленный объект: пока он жив, чтения отдают его самого
+    (слабая карта ключ → объект), иначе — копию из записи, которая с этого момента представляет узел.
+    Повторное добавление узла перезаписывает запись (INSERT … ON CONFLICT DO UPDATE) — изменения
+    scope/span/type не теряются, а равный ему другой объект запись не трогает. Если концом ребра передан
+    такой другой объект, его запись хранится в самом ребре: рёбра читаются с теми же концами, что у GraphX.
+    LRU (cache_size) только держит недавние узлы и их записи, чтобы не декодировать и не писать их повторно.
+    """
+
+    def __init__(self, path: Path | str = ":memory:", batch_size: int = 10_000, cache_size: int = 10_000) -> None:
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._pid = os.getpid()
+        self._readonly = False
+        self._db = self._connect()
+        # узлы, которых, возможно, нет в базе, и повторно добавленные узлы графа — кодируются при flush
+        self._pending_nodes: dict[str, Any] = {}
+        self._touched: dict[str, Any] = {}
+        self._pending_edges: list[tuple[str, str, str, Any, Any]] = []
+        self._pending_relations: dict[str, None] = {}
+        # что в буфере: по этим ключам, именам, путям импорта и типам чтение сначала сбрасывает буфер
+        self._dirty_keys: set[str] = set()
+        self._dirty_names: set[str] = set()
+        self._dirty_paths: set[str] = set()
+        self._dirty_classes: set[str] = set()
+        # ключ → объект, который представляет узел графа (пока он жив)
+        self._owners: weakref.WeakValueDictionary[str, Any] = weakref.WeakValueDictionary()
+        # недавние ключи → (объект-узел графа, его последняя запись)
+        self._recent: OrderedDict[str, tuple[Any, str]] = OrderedDict()
+
+    # ------ соединение ------
+    def _connect(self) -> sqlite3.Connection:
+        if self._readonly:
+            db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(edges)")}
+            for column in ("src_record", "dst_record"):
+                if column not in columns:
+                    # файл прошлой версии: концы рёбер в нём всегда совпадали с узлами
+                    db.execute(f"ALTER TABLE edges ADD COLUMN {column} TEXT")
+            db.commit()
+        return db
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # воркер после fork: соединение родителя не используется, граф открывается только для чтения;
+            # записи воркера не нужны — его факты возвращаются родителю через FileFacts
+            self._pid = os.getpid()
+            self._readonly = True
+            self._clear_pending()
+            self._db = self._connect()
+        return self._db
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> SQLiteGraph[N, R]:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------ узлы графа ------
+    def _remember(self, key: str, node: Any, record: str) -> None:
+        self._recent[key] = (node, record)
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def _own(self, key: str, node: Any) -> None:
+        if _weakrefable(node):
+            self._owners[key] = node
+
+    def _is_node(self, key: str, node: Any) -> bool:
+        """node — сам узел графа, а не равный ему другой объект"""
+        owner = self._owners.get(key)
+        return owner is node if owner is not None else not _weakrefable(node)
+
+    # ------ запись ------
+    def _mark(self, key: str, node: Any) -> None:
+        name = getattr(node, "name", None)
+        if isinstance(name, str):
+            self._dirty_names.add(name)
+        path = import_path_of(node)
+        if path is not None:
+            self._dirty_paths.add(path)
+        self._dirty_classes.add(type(node).__name__)
+
+    def _queue_node(self, node: N) -> str:
+        key = identity(node)
+        self._dirty_keys.add(key)
+        owner = self._owners.get(key)
+        if owner is node:
+            if key not in self._pending_nodes:
+                # объект мог измениться с прошлой записи
+                self._touched[key] = node
+                self._mark(key, node)
+        elif owner is None and key not in self._pending_nodes and key not in self._recent:
+            # новый узел или узел, чей объект уже не жив: решается при flush по базе
+            self._pending_nodes[key] = node
+            self._own(key, node)
+            self._mark(key, node)
+        return key
+
+    @staticmethod
+    def _row_values(key: str, node: Any, record: str) -> tuple[str, str, Optional[str], Optional[str], str]:
+        name = getattr(node, "name", None)
+        return (key, type(node).__name__, name if isinstance(name, str) else None, import_path_of(node), record)
+
+    def _clear_pending(self) -> None:
+        self._pending_nodes, self._touched, self._pending_edges, self._pending_relations = {}, {}, [], {}
+        self._dirty_keys, self._dirty_names, self._dirty_paths, self._dirty_classes = set(), set(), set(), set()
+
+    def _existing(self, keys: list[str]) -> Iterator[str]:
+        for i in range(0, len(keys), _CHUNK):
+            chunk = keys[i:i + _CHUNK]
+            for (key,) in self.db.execute(f"SELECT key FROM nodes WHERE key IN ({','.join('?' * len(chunk))})", chunk):
+                yield key
+
+    def flush(self) -> None:
+        """Вливает накопленные узлы и рёбра одной транзакцией"""
+        if self._readonly or not (self._pending_nodes or self._touched or self._pending_edges):
+            return
+        # ключ уже в базе: узлом остаётся прежний объект, переданный — лишь равный ему
+        for key in list(self._existing(list(self._pending_nodes))):
+            node = self._pending_nodes.pop(key)
+            if self._owners.get(key) is node:
+                del self._owners[key]
+        rows = []
+        for key, node in (*self._pending_nodes.items(), *self._touched.items()):
+            record = _dumps(node)
+            recent = self._recent.get(key)
+            if recent is not None and recent[0] is node and recent[1] == record:
+                continue
+            rows.append(self._row_values(key, node, record))
+            self._remember(key, node, record)
+        edges = [
+            (
+                src, dst, relation,
+                None if self._is_node(src, source) else _dumps(source),
+                None if self._is_node(dst, target) else _dumps(target),
+            )
+            for src, dst, relation, source, target in self._pending_edges
+        ]
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO nodes (key, class, name, import_path, record) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET class = excluded.class, name = excluded.name, "
+                "import_path = excluded.import_path, record = excluded.record",
+                rows,
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO relations (value) VALUES (?)",
+                ((value,) for value in self._pending_relations),
+            )
+            # WHERE true — чтобы SQLite разобрал ON CONFLICT после SELECT;
+            # у существующего ребра, как у GraphX, меняется только связь, концы остаются прежними
+            self.db.executemany(
+                f"INSERT INTO edges (src, dst, rel, src_record, dst_record) SELECT {_NODE_ID}, {_NODE_ID}, "
+                "(SELECT id FROM relations WHERE value = ?), ?, ? WHERE true "
+                "ON CONFLICT (src, dst) DO UPDATE SET rel = excluded.rel",
+                edges,
+            )
+        self._clear_pending()
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending_nodes) + len(self._touched) + len(self._pending_edges) >= self.batch_size:
+            self.flush()
+
+    def add_node(self, node: N) -> None:
+        if self._readonly:
+            return
+        self._queue_node(node)
+        self._maybe_flush()
+
+    def add_edge(self, source: N, target: N, data: Optional[R] = None) -> None:
+        if self._readonly:
+            return
+        relation = json.dumps(_value(data), ensure_ascii=False)
+        self._pending_relations[relation] = None
+        src = self._queue_node(source)
+        dst = self._queue_node(target)
+        self._pending_edges.append((src, dst, relation, source, target))
+        self._maybe_flush()
+
+    def remove_node(self, node: N) -> None:
+        self.flush()
+        key = identity(node)
+        row = self._row_of(key)
+        if row is None:
+            raise KeyError(f"The node {node} is not in the graph.")
+        with self.db:
+            self.db.execute("DELETE FROM edges WHERE src = ? OR dst = ?", (row, row))
+            self.db.execute("DELETE FROM nodes WHERE id = ?", (row,))
+        self._owners.pop(key, None)
+        self._recent.pop(key, None)
+
+    def remove_edge(self, source: N, target: N) -> None:
+        self.flush()
+        with self.db:
+            cursor = self.db.execute(
+                f"DELETE FROM edges WHERE src = {_NODE_ID} AND dst = {_NODE_ID}", (identity(source), identity(target))
+            )
+        if not cursor.rowcount:
+            raise KeyError(f"The edge {source}-{target} is not in the graph.")
+
+    # ------ чтение ------
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        """Запрос к базе как есть; полные обходы вызывают flush() сами, точечные — _sync()"""
+        return self.db.execute(sql, tuple(params))
+
+    def _sync(self, *keys: str) -> None:
+        if any(key in self._dirty_keys for key in keys):
+            self.flush()
+
+    def _row_of(self, key: str) -> Optional[int]:
+        found = self._query("SELECT id FROM nodes WHERE key = ?", (key,)).fetchone()
+        return found[0] if found else None
+
+    def _row(self, node: N) -> Optional[int]:
+        key = identity(node)
+        self._sync(key)
+        return self._row_of(key)
+
+    def _decode(self, key: str, record: str) -> N:
+        """Узел графа: живой объект-узел, иначе копия из записи (она теперь и представляет узел)"""
+        owner = self._owners.get(key)
+        if owner is not None:
+            return owner
+        recent = self._recent.get(key)
+        if recent is not None:
+            self._recent.move_to_end(key)
+            return recent[0]
+        node = _loads(record)
+        self._own(key, node)
+        self._remember(key, node, record)
+        return node
+
+    def _nodes(self, sql: str, params: Iterable[Any] = ()) -> Iterator[N]:
+        for key, record in self._query(sql, params):
+            yield self._decode(key, record)
+
+    def _edges(
+        self, where: str = "", params: Iterable[Any] = (), order: str = "e.src, e.id", own_source: bool = False
+    ) -> Iterator[tuple[N, N, Optional[R]]]:
+        """
+        Рёбра запроса. Цель — объект, с которым ребро добавлено впервые (как ключ смежности GraphX);
+        источник — узел графа, а для in_edges (own_source) — тоже объект из ребра.
+        """
+        relations: dict[str, Any] = {}
+        rows = self._query(f"{_EDGE_SELECT} {where} ORDER BY {order}", params)
+        for src, src_record, dst, dst_record, src_own, dst_own, value in rows:
+            if value not in relations:
+                relations[value] = decode_relation(json.loads(value))
+            source = _loads(src_own) if own_source and src_own else self._decode(src, src_record)
+            target = _loads(dst_own) if dst_own else self._decode(dst, dst_record)
+            yield (source, target, relations[value])
+
+    def has_node(self, node: N) -> bool:
+        key = identity(node)
+        if key in self._pending_nodes or key in self._touched:
+            return True
+        return self._row_of(key) is not None
+
+    def nodes(self) -> Iterator[N]:
+        self.flush()
+        return self._nodes("SELECT key, record FROM nodes ORDER BY id")
+
+    def has_edge(self, source: N, target: N) -> bool:
+        self._sync(identity(source), identity(target))
+        return self._query(
+            f"SELECT 1 FROM edges WHERE src = {_NODE_ID} AND dst = {_NODE_ID}", (identity(source), identity(target))
+        ).fetchone() is not None
+
+    def get_edge_data(self, source: N, target: N) -> Optional[R]:
+        self._sync(identity(source), identity(target))
+        found = self._query(
+            f"SELECT r.value FROM edges e JOIN relations r ON r.id = e.rel WHERE e.src = {_NODE_ID} AND e.dst = {_NODE_ID}",
+            (identity(source), identity(target)),
+        ).fetchone()
+        return decode_relation(json.loads(found[0])) if found else None
+
+    def edges(self) -> Iterator[tuple[N, N, Optional[R]]]:
+        self.flush()
+        return self._edges()
+
+    def out_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        key = identity(node)
+        self._sync(key)
+        return self._edges(f"WHERE e.src = {_NODE_ID}", (key,))
+
+    def in_edges(self, node: N) -> Iterator[tuple[N, N, Optional[R]]]:
+        key = identity(node)
+        self._sync(key)
+        return self._edges(f"WHERE e.dst = {_NODE_ID}", (key,), order="e.src, e.id", own_source=True)
+
+    def degree(self, node: N) -> int:
+        row = self._row(node)
+        if row is None:
+            return 0
+        return self._query(
+            "SELECT (SELECT COUNT(*) FROM edges WHERE src = ?) + (SELECT COUNT(*) FROM edges WHERE dst = ?)", (row, row)
+        ).fetchone()[0]
+
+    def children(self, node: N) -> Iterator[N]:
+        return (v for _, v, _ in self.out_edges(node))
+
+    def parents(self, node: N) -> Iterator[N]:
+        return (u for u, _, _ in self.in_edges(node))
+
+    def _reach(self, node: N, sql: str) -> set[N]:
+        self.flush()
+        start = self._row(node)
+        if start is None:
+            raise KeyError(f"The node {node} is not in the graph.")
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for (row,) in self._query(sql, (queue.popleft(),)).fetchall():
+                if row not in seen:
+                    seen.add(row)
+                    queue.append(row)
+        seen.discard(start)
+        return set(self._nodes_by_rows(seen))
+
+    def _nodes_by_rows(self, rows: Iterable[int]) -> Iterator[N]:
+        rows = list(rows)
+        for i in range(0, len(rows), _CHUNK):
+            chunk = rows[i:i + _CHUNK]
+            yield from self._nodes(f"SELECT key, record FROM nodes WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+
+    def descendants(self, node: N) -> set[N]:
+        return self._reach(node, "SELECT dst FROM edges WHERE src = ?")
+
+    def ancestors(self, node: N) -> set[N]:
+        return self._reach(node, "SELECT src FROM edges WHERE dst = ?")
+
+    # ------ индексы ------
+    def nodes_by_name(self, name: str) -> Iterator[N]:
+        if name in self._dirty_names:
+            self.flush()
+        return self._nodes("SELECT key, record FROM nodes WHERE name = ? ORDER BY id", (name,))
+
+    def nodes_by_import_path(self, import_path: str) -> Iterator[N]:
+        if import_path in self._dirty_paths:
+            self.flush()
+        return self._nodes("SELECT key, record FROM nodes WHERE import_path = ? ORDER BY id", (import_path,))
+
+    def nodes_of_type(self, types: type | tuple[type, ...], include: bool = True) -> Iterator[N]:
+        known = {**MODEL_TYPES, "str": str}
+        if any(issubclass(known.get(name, object), types) == include for name in self._dirty_classes):
+            self.flush()
+        classes = [
+            name for (name,) in self._query("SELECT DISTINCT class FROM nodes").fetchall()
+            if issubclass(known.get(name, object), types) == include
+        ]
+        if not classes:
+            return iter(())
+        return self._nodes(
+            f"SELECT key, record FROM nodes WHERE class IN ({','.join('?' * len(classes))}) ORDER BY id", classes
+        )
+
+    def edges_by_relation(self, relations: Iterable[Any], include: bool = True) -> Iterator[tuple[N, N, Optional[R]]]:
+        self.flush()
+        wanted = [json.dumps(_value(r), ensure_ascii=False) for r in relations if _relation_key(r) is not _UNHASHABLE]
+        marks = ",".join("?" * len(wanted))
+        if include:
+            if not wanted:
+                return iter(())
+            return self._edges(f"WHERE r.value IN ({marks})", wanted, order="e.rel, e.id")
+        return self._edges(f"WHERE r.value NOT IN ({marks})" if wanted else "", wanted, order="e.rel, e.id")
+
+    def relation_counts(self) -> dict[Any, int]:
+        self.flush()
+        counts: dict[Any, int] = {}
+        for value, count in self._query(
+            "SELECT r.value, COUNT(*) FROM edges e JOIN relations r ON r.id = e.rel GROUP BY e.rel ORDER BY e.rel"
+        ):
+            relation = decode_relation(json.loads(value))
+            if _relation_key(relation) is not _UNHASHABLE:
+                counts[relation] = counts.get(relation, 0) + count
+        return counts
+
+    # ------ прочее ------
+    def subgraph(self, nodes: list[N]) -> GraphX[N, R]:
+        """Подграф в памяти (GraphX) на заданных узлах"""
+        keys = {identity(node) for node in nodes}
+        sub = GraphX[N, R]()
+        for node in nodes:
+            sub.add_node(node)
+        for node in nodes:
+            for u, v, data in self.out_edges(node):
+                if identity(v) in keys:
+                    sub.add_edge(u, v, data=data)
+        return sub
+
+    def freeze(self) -> "FrozenGraph[N, R]":
+        from .frozen_graph import FrozenGraph
+        return FrozenGraph.from_graph(self)
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._query("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def __contains__(self, node: Any) -> bool:
+        return self.has_node(node)
+
+    def __repr__(self) -> str:
+        self.flush()
+        edges = self._query("SELECT COUNT(*) FROM edges").fetchone()[0]
+        return f"SQLiteGraph({self.path}: {len(self)} nodes, {edges} edges)"
+
+    # ------ users methods ------
+    def show_summary(self) -> None:
+        print_summary(self)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+from pathlib import Path
+import os
+import pickle
+
+from .interfaces import GraphProto
+from .snapshot import is_snapshot, load_snapshot
+from .sqlite_graph import SQLiteGraph, is_sqlite
+
+
+def save_graph(graph: GraphProto, path: Path) -> None:
+    """Сохраняет проанализированный граф в файл"""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_graph(path: Path) -> GraphProto:
+    """Загружает граф, сохранённый save_graph, save_snapshot или SQLiteGraph (формат определяется по сигнатуре)"""
+    if is_snapshot(path):
+        return load_snapshot(path)
+    if is_sqlite(path):
+        return SQLiteGraph(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -1,8 +1,11 @@
 from __future__ import annotations 
 from dataclasses import dataclass, field 
 from pathlib import Path 
-from typing import List, Optional, Any, Literal
+from typing import List, Optional, Any, Literal, Iterator
+from contextlib import contextmanager
 from enum import StrEnum
+import re
+import zlib
 
 
 
@@ -57,30 +60,149 @@ class AttributionType(StrEnum):
     DICT = "dict"
     UNKNOWN = "unknown"
 
-@dataclass(slots=True, frozen=True) 
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class FileInfo:
     name: str
     format: str
     path: Path
     is_exclude:bool = False
 
-@dataclass(slots=True,frozen=True)
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class DirectoryNode:
     path: Path    
     
 
+class LineOffsetTable:
+    """
+    Начала строк файла, считаются один раз на файл.
+    Строки делятся так же, как в ast (\r\n, \r, \n); колонки ast — байтовые смещения UTF-8.
+    С path таблица хранит только путь, смещения и контрольную сумму текста: текст читается
+    из файла при запросе фрагмента, и при pickle (воркеры, кэш анализа) исходник не копируется.
+    Если файл изменился после анализа, смещения к нему не подходят — фрагменты не выдаются (None).
+    Внутри LineOffsetTable.reading() каждый файл читается и сверяется один раз за проход.
+    """
+    __slots__ = ("_source", "path", "starts", "length", "checksum")
+    _NEWLINE = re.compile(r"\r\n|\r|\n")
+    # тексты файлов текущего прохода reading(): (путь, длина, сумма) → текст или None
+    _pass: Optional[dict[tuple[str, int, Optional[int]], Optional[str]]] = None
+
+    def __init__(self, source: str, path: Optional[Path | str] = None) -> None:
+        self.path = None if path is None else str(path)
+        self._source = source if path is None else None
+        self.checksum = None if path is None else self._checksum(source)
+        self.length = len(source)
+        self.starts = [0]
+        self.starts.extend(m.end() for m in self._NEWLINE.finditer(source))
+
+    @staticmethod
+    def _checksum(source: str) -> int:
+        return zlib.crc32(source.encode("utf-8", errors="surrogatepass"))
+
+    @classmethod
+    @contextmanager
+    def reading(cls) -> Iterator[None]:
+        """Проход чтения фрагментов (экспорт): текст файла читается один раз и отпускается в конце"""
+        outer = cls._pass
+        if outer is None:
+            cls._pass = {}
+        try:
+            yield
+        finally:
+            cls._pass = outer
+
+    def _load(self) -> Optional[str]:
+        """Текст файла, если он тот же, что при анализе"""
+        assert self.path is not None
+        try:
+            # тот же текстовый режим, что при разборе (ASTAnalyzerPipeline._read), — смещения совпадают
+            with open(self.path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        if len(text) != self.length or (self.checksum is not None and self._checksum(text) != self.checksum):
+            return None
+        return text
+
+    @property
+    def source(self) -> Optional[str]:
+        """Текст файла; None — файл удалён или изменился после анализа"""
+        if self.path is None:
+            return self._source or ""
+        cache = LineOffsetTable._pass
+        if cache is None:
+            return self._load()
+        key = (self.path, self.length, self.checksum)
+        if key not in cache:
+            cache[key] = self._load()
+        return cache[key]
+
+    @property
+    def line_count(self) -> int:
+        # завершающий перевод строки не открывает новую строку
+        if len(self.starts) > 1 and self.starts[-1] == self.length:
+            return len(self.starts) - 1
+        return len(self.starts)
+
+    def _line(self, source: str, lineno: int) -> str:
+        start = self.starts[lineno - 1]
+        end = self.starts[lineno] if lineno < len(self.starts) else len(source)
+        return source[start:end].rstrip("\r\n")
+
+    def line(self, lineno: int) -> Optional[str]:
+        """Строка lineno (с 1) без перевода строки"""
+        source = self.source
+        return None if source is None else self._line(source, lineno)
+
+    def _offset(self, source: str, lineno: int, col: int) -> int:
+        line = self._line(source, lineno)
+        if not line.isascii():
+            col = len(line.encode("utf-8")[:col].decode("utf-8", errors="replace"))
+        return self.starts[lineno - 1] + col
+
+    def offset(self, lineno: int, col: int) -> Optional[int]:
+        """Смещение в source по строке и байтовой колонке ast"""
+        source = self.source
+        return None if source is None else self._offset(source, lineno, col)
+
+    def segment(self, start_line: int, start_col: int, end_line: int, end_col: int) -> Optional[str]:
+        source = self.source
+        if source is None:
+            return None
+        return source[self._offset(source, start_line, start_col):self._offset(source, end_line, end_col)]
+
+    def __getstate__(self):
+        if self.path is None:
+            return self._source
+        return self.path, self.starts, self.length, self.checksum
+
+    def __setstate__(self, state: str | tuple[str, list[int], int] | tuple[str, list[int], int, Optional[int]]) -> None:
+        if isinstance(state, str):
+            LineOffsetTable.__init__(self, state)
+            return
+        self._source = None
+        # графы, сохранённые до контрольной суммы, сверяются только по длине
+        self.path, self.starts, self.length, self.checksum = (*state, None)[:4]
+
+
 @dataclass(slots=True)
 class CodeSpan:
     start_line: int
     end_line: int
     start_col: int
     end_col: int
-    source: Optional[str] = None 
+    table: Optional[LineOffsetTable] = field(default=None, repr=False, compare=False)
+
+    @property
+    def source(self) -> Optional[str]:
+        """Текст фрагмента; вырезается из таблицы файла только по запросу, None — файл изменился"""
+        if self.table is None:
+            return None
+        return self.table.segment(self.start_line, self.start_col, self.end_line, self.end_col)
     
     def __repr__(self) -> str:
         return f"{self.start_line}-{self.end_line}"   
 
-@dataclass(slots=True,kw_only=True)  
+@dataclass(slots=True, kw_only=True, weakref_slot=True)
 class BaseData:     
     name: str 
     scope: ImportScope = ImportScope.UNKNOWN
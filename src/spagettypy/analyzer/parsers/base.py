@@ -1,22 +1,26 @@
 import ast
-from ..model import ModuleInfo, ClassInfo, FunctionInfo, CodeSpan, BaseData, ImportScope, AttributeInfo
+from ..model import ModuleInfo, ClassInfo, FunctionInfo, CodeSpan, BaseData, ImportScope, AttributeInfo, LineOffsetTable, FileInfo
 from ..graph.interfaces import GraphProto, FinderNode
 from typing import List,Optional, Generic, Type, Callable, Any, Sequence, Dict
 from pathlib import Path
-import re
 from collections import deque
 from dataclasses import field
+import json
 
 ScopeType = ModuleInfo | ClassInfo | FunctionInfo
 
 
+def _same(node: Any) -> Any:
+    return node
+
+
 class BaseResolver:
     def __init__(
         self, 
         finder: Any, 
         factory: Any, 
         import_classifier: Optional[Callable] = None,
-        type_adapter: Callable[[Any], Any] = lambda e: e
+        type_adapter: Callable[[Any], Any] = _same
     ):
         self.finder = finder
         self.factory = factory
@@ -58,8 +62,15 @@ class BaseResolver:
 
 
 class FactoryCodeSpan:
-    def __init__(self, source):
+    """
+    Создаёт CodeSpan по узлам одного файла; таблица строк строится один раз на файл.
+    С path таблица держит только путь и смещения, текст фрагмента читается из файла по запросу;
+    без keep_source у CodeSpan нет таблицы и текст фрагментов недоступен.
+    """
+    def __init__(self, source, keep_source: bool = True, path: Optional[Path | str] = None):
         self.source = source
+        self.table = LineOffsetTable(source or "", path)
+        self.keep_source = keep_source
     
     def create_codespan(self,node: ast.AST) -> CodeSpan:
         return CodeSpan(
@@ -67,23 +78,24 @@ class FactoryCodeSpan:
             end_line=getattr(node, "end_lineno", node.lineno),
             start_col=node.col_offset,
             end_col=getattr(node, "end_col_offset", node.col_offset),
-            source=ast.get_source_segment(self.source, node),
+            table=self.table if self.keep_source else None,
         )
     
-    def create_codespan_from_file(self, file : Sequence[Optional[Sequence[str]]]) -> CodeSpan:
-        total_lines = len(re.findall(r"[\n']+?", file))
-        end_col = 1
-        if total_lines>0:
-            end_col = len(file[total_lines-1])
+    def create_codespan_from_file(self, file: str) -> CodeSpan:
+        table = self.table if file == self.source else LineOffsetTable(file or "")
+        total_lines = table.line_count
+        # последняя строка — из уже прочитанного текста, а не из файла
+        end_col = len(file[table.starts[total_lines - 1]:].rstrip("\r\n")) if file else 1
         return CodeSpan(
             start_line=1,
             end_line=total_lines,
             start_col=1,
             end_col=end_col,
-            source=None,
         )
 
 
+def _no_codespan(node: ast.AST) -> CodeSpan:
+    raise RuntimeError("CodeSpan запрошен вне разбора файла (до prepare или после release)")
 
 
 class AttributeFactory:
@@ -92,20 +104,104 @@ class AttributeFactory:
 
 
 class AnalyzerBase(ast.NodeVisitor):
-    def __init__(self, graph:GraphProto):
+    # меняется при изменении фактов, которые выдаёт анализатор (входит в ключ кэша)
+    version: str = "1"
+
+    def __init__(self, graph:GraphProto, symbols: Optional["SymbolTable"] = None):
         super().__init__()
         self.graph = graph
         self.module:Optional[ModuleInfo] = None
         self.current_class:Optional[ClassInfo] = None
         self.functions:List[FunctionInfo] = []
-        self._get_codespan = None
+        self._get_codespan: Callable[[ast.AST], CodeSpan] = _no_codespan
+        # общая таблица символов проекта (необязательна) и ключ текущего модуля в ней
+        self.symbols = symbols
+        self.module_key: Optional[str] = None
 
 
-    def analyze(self, tree: ast.AST, module: ModuleInfo, factory_codespan: FactoryCodeSpan):
+    def prepare(self, module: ModuleInfo, factory_codespan: FactoryCodeSpan) -> None:
         self.module = module
+        # класс прошлого файла не должен забирать функции этого (и зависеть от порядка файлов)
+        self.current_class = None
         self._get_codespan = factory_codespan.create_codespan
+        self.module_key = module_key(module) if self.symbols is not None else None
+
+    def analyze(self, tree: ast.AST, module: ModuleInfo, factory_codespan: FactoryCodeSpan):
+        self.prepare(module, factory_codespan)
         self.visit(tree)
 
+    def release(self) -> None:
+        """Отпускает ссылки на дерево и исходник файла после его разбора"""
+        self._get_codespan = _no_codespan
+
+    def file_extras(self) -> Any:
+        """Данные последнего файла вне графа; пайплайн сохраняет их в FileFacts.extras"""
+        return None
+
+    def restore_extras(self, data: Any) -> None:
+        """Восстанавливает file_extras файла, взятого из кэша"""
+
+    def finalize(self) -> None:
+        """Вызывается после всех файлов запуска (межмодульные связи)"""
+
+
+class VisitorDispatcher:
+    """
+    Обходит дерево один раз и передаёт каждый узел только тем анализаторам,
+    у которых есть visit_<ИмяУзла>. Семантика как у NodeVisitor:
+    если visit_* не вызвал generic_visit, поддерево для этого анализатора пропускается.
+    """
+    def __init__(self, analyzers: Sequence[ast.NodeVisitor]):
+        self.analyzers = list(analyzers)
+        self._routes: Dict[type, tuple[tuple[int, Callable[[ast.AST], Any]], ...]] = {}
+
+    def _routes_for(self, node_type: type) -> tuple[tuple[int, Callable[[ast.AST], Any]], ...]:
+        routes = self._routes.get(node_type)
+        if routes is None:
+            name = f"visit_{node_type.__name__}"
+            routes = tuple(
+                (i, getattr(analyzer, name))
+                for i, analyzer in enumerate(self.analyzers)
+                # методы самого NodeVisitor (visit_Constant) интереса не объявляют
+                if getattr(type(analyzer), name, None) not in (None, getattr(ast.NodeVisitor, name, None))
+            )
+            self._routes[node_type] = routes
+        return routes
+
+    def dispatch(self, tree: ast.AST) -> None:
+        descended = [False] * len(self.analyzers)
+
+        def marker(index: int) -> Callable[[ast.AST], None]:
+            def generic_visit(node: ast.AST) -> None:
+                descended[index] = True
+            return generic_visit
+
+        for i, analyzer in enumerate(self.analyzers):
+            analyzer.__dict__["generic_visit"] = marker(i)
+        try:
+            stack: List[tuple[ast.AST, frozenset[int]]] = [(tree, frozenset(range(len(self.analyzers))))]
+            while stack:
+                node, active = stack.pop()
+                routes = self._routes_for(type(node))
+                if routes:
+                    pruned = set()
+                    for i, method in routes:
+                        if i not in active:
+                            continue
+                        descended[i] = False
+                        method(node)
+                        if not descended[i]:
+                            pruned.add(i)
+                    if pruned:
+                        active = active - pruned
+                        if not active:
+                            continue
+                children = list(ast.iter_child_nodes(node))
+                stack.extend((child, active) for child in reversed(children))
+        finally:
+            for analyzer in self.analyzers:
+                analyzer.__dict__.pop("generic_visit", None)
+
 
 
 
@@ -161,3 +257,144 @@ class SymbolRepository:
             print(f"[Scope {scope.name}]")
             for k, v in scope.symbols.items():
                 print(f"  {k} -> {type(v).__name__}")
+
+
+def module_key(module: Any) -> Optional[str]:
+    """Полное имя модуля по его файлу: 'pkg.sub.mod' (для __init__.py — имя пакета)"""
+    file = module if isinstance(module, FileInfo) else getattr(module, "file", None)
+    if file is None:
+        return getattr(module, "name", None)
+    path = Path(file.path)
+    parts = [p for p in path.parts if p not in (".", path.anchor)]
+    if file.name != "__init__":
+        parts.append(file.name)
+    return ".".join(parts) or file.name
+
+
+class SymbolTable(SymbolRepository):
+    """
+    Проектная таблица символов с ключами 'pkg.mod.Class', 'pkg.mod.Class.method'.
+    У каждого модуля свой Scope (родитель — глобальный): локальное имя → полный ключ,
+    туда же попадают импортированные имена. Разрешение имени — два обращения к dict.
+    """
+    FORMAT = 1
+
+    def __init__(self):
+        super().__init__()
+        self.symbols: Dict[str, Any] = {}
+        self.modules: Dict[str, Scope] = {}
+        self._owned: Dict[str, Dict[str, None]] = {}
+
+    def module_scope(self, module: str) -> Scope:
+        scope = self.modules.get(module)
+        if scope is None:
+            scope = self.modules[module] = Scope(name=module, parent=self.global_scope)
+        return scope
+
+    # ------ заполнение ------
+    def define(self, module: str, qualname: str, obj: Any) -> str:
+        """Регистрирует определение модуля; имя верхнего уровня видно в его Scope"""
+        key = f"{module}.{qualname}" if qualname else module
+        self.symbols[key] = obj
+        self._owned.setdefault(module, {})[key] = None
+        if qualname and "." not in qualname:
+            self.module_scope(module).symbols[qualname] = key
+        return key
+
+    def alias(self, module: str, local: str, target: str) -> None:
+        """Импортированное имя: local в модуле module ссылается на ключ target"""
+        self.module_scope(module).symbols[local] = target
+
+    def drop_module(self, module: str) -> None:
+        for key in self._owned.pop(module, ()):
+            self.symbols.pop(key, None)
+        self.modules.pop(module, None)
+
+    # ------ разрешение ------
+    def get(self, key: str) -> Optional[Any]:
+        return self.symbols.get(key)
+
+    def qualify(self, module: str, name: str) -> Optional[str]:
+        """'Base' или 'mod.Base' в модуле module → полный ключ (если имя известно модулю)"""
+        head, _, rest = name.partition(".")
+        scope = self.modules.get(module)
+        key = scope.lookup(head) if scope else None
+        if key is None:
+            return None
+        return f"{key}.{rest}" if rest else key
+
+    def lookup(self, module: str, name: str) -> Optional[Any]:
+        key = self.qualify(module, name)
+        return self.symbols.get(key) if key else None
+
+    # ------ перенос между запусками и через кэш ------
+    def export_module(self, module: str) -> Dict[str, Any]:
+        scope = self.modules.get(module)
+        return {
+            "symbols": {key: self.symbols[key] for key in self._owned.get(module, ()) if key in self.symbols},
+            "scope": dict(scope.symbols) if scope else {},
+        }
+
+    def merge_module(self, module: str, data: Dict[str, Any]) -> None:
+        self.drop_module(module)
+        self.symbols.update(data["symbols"])
+        self._owned[module] = dict.fromkeys(data["symbols"])
+        self.module_scope(module).symbols.update(data["scope"])
+
+    @staticmethod
+    def _describe(obj: Any) -> Dict[str, Any]:
+        entry = {"kind": type(obj).__name__, "name": getattr(obj, "name", str(obj))}
+        owner = getattr(obj, "module", None)
+        if owner is not None:
+            entry["module"] = getattr(owner, "name", None)
+        if isinstance(obj, AttributeInfo):
+            entry["annotation"] = obj.annotation
+            entry["value"] = obj.value if isinstance(obj.value, str) else None
+        return entry
+
+    @staticmethod
+    def _materialize(entry: Dict[str, Any]) -> Any:
+        kind, name = entry["kind"], entry["name"]
+        if kind == "ClassInfo":
+            return ClassInfo(name=name, module=ModuleInfo(name=entry.get("module") or ""))
+        if kind == "FunctionInfo":
+            return FunctionInfo(name=name, module=ModuleInfo(name=entry.get("module") or ""))
+        if kind == "AttributeInfo":
+            return AttributeInfo(name=name, annotation=entry["annotation"], value=entry.get("value"))
+        return ModuleInfo(name=name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        modules = {}
+        for module in sorted(set(self._owned) | set(self.modules)):
+            data = self.export_module(module)
+            modules[module] = {
+                "symbols": {key: self._describe(obj) for key, obj in data["symbols"].items()},
+                "scope": data["scope"],
+            }
+        return {"format": self.FORMAT, "modules": modules}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolTable":
+        table = cls()
+        if data.get("format") != cls.FORMAT:
+            return table
+        for module, entry in data.get("modules", {}).items():
+            symbols = {key: cls._materialize(d) for key, d in entry.get("symbols", {}).items()}
+            table.merge_module(module, {"symbols": symbols, "scope": entry.get("scope", {})})
+        return table
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=1), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "SymbolTable":
+        try:
+            return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return cls()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.symbols
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import hashlib
+import os
+import pickle
+
+from .facts import FileFacts
+
+CACHE_FORMAT = "7"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class AnalysisCache:
+    """
+    Дисковый кэш фактов анализа по файлам.
+    Ключ: путь файла + хэш его содержимого + набор/версии анализаторов + конфигурация.
+    Путь входит в ключ, потому что факты ссылаются на свой файл (FileInfo → ModuleInfo):
+    у файлов с одинаковым содержимым (пустые __init__.py) записи разные.
+    Межмодульные связи (импорты, INHERIT, CALLINGS) в факты не попадают — они строятся в finalize.
+    Для неизменённых файлов хватает одного stat (mtime + size), иначе — одного хэша.
+    При превышении max_bytes выбрасываются самые давно использованные записи (LRU).
+    """
+    INDEX_NAME = "index.pickle"
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.files: dict[str, tuple[int, int, str]] = {}
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        # сумма размеров entries: ведётся при put/_drop, вытеснение не пересчитывает её
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load_index()
+
+    # ------ ключи ------
+    @staticmethod
+    def signature(analyzers: Iterable[Any], config: Optional[dict[str, Any]] = None) -> str:
+        """Подпись набора анализаторов и конфигурации — часть ключа кэша"""
+        parts = [CACHE_FORMAT]
+        for analyzer in analyzers:
+            cls = type(analyzer)
+            parts.append(f"{cls.__module__}.{cls.__qualname__}:{getattr(analyzer, 'version', '')}")
+        for k, v in sorted((config or {}).items()):
+            parts.append(f"{k}={v}")
+        return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _digest(self, path: Path) -> str:
+        """Хэш содержимого; пересчитывается только если изменились mtime или размер"""
+        st = path.stat()
+        name = str(path)
+        known = self.files.get(name)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return known[2]
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        self.files[name] = (st.st_mtime_ns, st.st_size, digest)
+        self._dirty = True
+        return digest
+
+    def key(self, path: Path, signature: str) -> str:
+        digest = self._digest(path)
+        where = hashlib.blake2b(str(path).encode("utf-8"), digest_size=8).hexdigest()
+        return f"{digest}{where}{signature}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / "objects" / key[:2] / f"{key}.pickle"
+
+    # ------ доступ ------
+    def get(self, key: str) -> Optional[FileFacts]:
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                facts = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self._drop(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self._dirty = True
+        self.hits += 1
+        return facts
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def put(self, key: str, facts: FileFacts) -> None:
+        payload = pickle.dumps(facts, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(entry, payload)
+        self.total_bytes += len(payload) - self.entries.get(key, 0)
+        self.entries[key] = len(payload)
+        self.entries.move_to_end(key)
+        self._dirty = True
+        self._evict()
+
+    def _drop(self, key: str) -> None:
+        self.total_bytes -= self.entries.pop(key, 0)
+        self._entry_path(key).unlink(missing_ok=True)
+        self._dirty = True
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._drop(next(iter(self.entries)))
+
+    # ------ индекс ------
+    def _load_index(self) -> None:
+        index = self.directory / self.INDEX_NAME
+        if not index.exists():
+            return
+        try:
+            with open(index, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if data.get("format") != CACHE_FORMAT:
+            return
+        self.files = data.get("files", {})
+        self.entries = OrderedDict(data.get("entries", ()))
+        self.total_bytes = sum(self.entries.values())
+
+    def flush(self) -> None:
+        """Сохраняет индекс (порядок LRU и stat-кэш файлов) на диск"""
+        if not self._dirty:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = {"format": CACHE_FORMAT, "files": self.files, "entries": list(self.entries.items())}
+        self._write_atomic(self.directory / self.INDEX_NAME, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        self._dirty = False
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
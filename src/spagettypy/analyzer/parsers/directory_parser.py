@@ -1,10 +1,14 @@
 from __future__ import annotations
-from typing import Optional, Iterable, List, Set
+from typing import Optional, Iterable, Iterator, List, Set, Callable
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 import pygit2
+from pygit2.enums import FileStatus
 from pathspec import PathSpec
-from pathlib import Path
+from pathlib import Path, PurePath
 from ..graph import GraphProto
-from .interfaces import FileChecherProto
+from .interfaces import FileChecherProto, DirectoryWalkerProto
+from .ignore_engine import IgnoreEngine
 from ..model import Relation,FileInfo, DirectoryNode
 
 class GitFinder:
@@ -21,66 +25,37 @@ class GitFinder:
 
 class GitignoreFileChecker:
     """Проверяет,не входит ли файл или папка в .gitignore"""
-    def __init__(self, start_path: str | Path) -> None:
-        if isinstance(start_path, Path):
-            start_path = str(start_path)
-        # Ищем путь до .git/
-        git_finder = GitFinder()
-        repo_path = str(git_finder(start_path))
-        if not repo_path:
-            self.git_repo = None
-            self.repo_root = None
-            return
-        self.git_repo = pygit2.Repository(repo_path)
-        self.repo_root = Path(repo_path).parent 
+    def __init__(self, start_path: str | Path, engine: Optional[IgnoreEngine] = None) -> None:
+        if engine is None:
+            git_dir = GitFinder()(str(start_path))
+            engine = IgnoreEngine(Path(start_path), git_dir=git_dir)
+        self.engine = engine
+        self.repo_root = engine.repo_root
         
     def __call__(self, file: FileInfo) -> bool:
-        if not self.git_repo or not self.repo_root:
-            return False
+        return not self.engine.is_file_ignored(file)
 
-        abs_path = Path(file.path) / f"{file.name}{file.format}"
-        rel_path = abs_path.relative_to(self.repo_root)  
-        rel_str = str(rel_path).replace("\\", "/")
-
-        ignored = self.git_repo.path_is_ignored(rel_str)
-        return not ignored
+    def check_dir(self, path: Path) -> bool:
+        """Спускаться ли в каталог: .git и игнорируемые каталоги отсекаются целиком"""
+        return not self.engine.is_dir_ignored(path)
     
 
 
 class GitExcludeFileChecker:
     """Проверяет, исключён ли файл локально через .git/info/exclude"""
     def __init__(self, start_path: str | Path) -> None:
-        
-        if isinstance(start_path, Path):
-            start_path = str(start_path)
-        
-        git_finder = GitFinder()
-        repo_path = git_finder(start_path)
-
-        if not repo_path:
-            self.git_repo = None
-            self.repo_root = None
-            return
-
-        self.git_repo = pygit2.Repository(repo_path)
-        self.repo_root = Path(repo_path).parent  # корень репо
-
+        git_dir = GitFinder()(str(start_path))
+        self.repo_root = git_dir.parent if git_dir else None
         # абсолютный путь до exclude файла
-        self.exclude_file:Optional[Path] = Path(repo_path) / "info" / "exclude"
-        if not self.exclude_file.exists():
+        self.exclude_file: Optional[Path] = Path(git_dir) / "info" / "exclude" if git_dir else None
+        if self.exclude_file is not None and not self.exclude_file.exists():
             self.exclude_file = None
+        self.engine = IgnoreEngine(Path(start_path), git_dir=git_dir, gitignore=False)
 
     def __call__(self, file: FileInfo) -> bool:
-        if not (self.git_repo and self.exclude_file and self.repo_root):
+        if not self.exclude_file:
             return False
-
-        abs_path = Path(file.path) / f"{file.name}{file.format}"
-        rel_path = abs_path.relative_to(self.repo_root)
-        rel_str = str(rel_path).replace("\\", "/")
-
-        # .git/info/exclude обрабатывается тем же методом, что и .gitignore
-        ignored = self.git_repo.path_is_ignored(rel_str)
-        return ignored
+        return self.engine.is_file_ignored(file)
 
 
 
@@ -118,26 +93,209 @@ class ExcludeFileChecher:
     def __call__(self, file: FileInfo ) -> bool:
         file_path = str(Path(file.path, file.name+file.format))           
         return not self.exlude_filter.match_file(file_path)
+
+    def check_dir(self, path: Path) -> bool:
+        # завершающий "/" — чтобы срабатывали шаблоны каталогов вида "build/"
+        return not self.exlude_filter.match_file(f"{path}/")
     
 
 
+class ScandirWalker:
+    """
+    Ленивый обход дерева через os.scandir: файлы отдаются по мере обхода,
+    каталоги, отвергнутые check_dir, не открываются вовсе.
+    Порядок детерминирован (по имени). Симлинки на каталоги по умолчанию не обходятся
+    (как os.walk); с follow_symlinks=True петли отсекаются по (st_dev, st_ino).
+    """
+    def __init__(self, follow_symlinks: bool = False) -> None:
+        self.follow_symlinks = follow_symlinks
+
+    def _list(self, current: str) -> Optional[tuple[tuple[int, int], List[FileInfo], List[str]]]:
+        """Один каталог: (st_dev, st_ino), его файлы и подкаталоги — по имени"""
+        try:
+            st = os.stat(current)
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return None
+
+        dir_path = Path(current)
+        files: List[FileInfo] = []
+        subdirs: List[str] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                is_link = entry.is_symlink()
+            except OSError:
+                is_dir = is_link = False
+            if is_dir:
+                # симлинк на каталог — не файл; обходится только по явному follow_symlinks
+                if self.follow_symlinks or not is_link:
+                    subdirs.append(entry.path)
+                continue
+            name = PurePath(entry.name)
+            files.append(FileInfo(name=name.stem, format=name.suffix, path=dir_path))
+        return (st.st_dev, st.st_ino), files, subdirs
+
+    @staticmethod
+    def _accepted(subdirs: List[str], check_dir: Optional[Callable[[Path], bool]]) -> List[str]:
+        if check_dir is None:
+            return subdirs
+        return [d for d in subdirs if check_dir(Path(d))]
+
+    def __call__(self, path: Path, check_dir: Optional[Callable[[Path], bool]] = None) -> Iterator[FileInfo]:
+        stack = [str(path)]
+        seen: set[tuple[int, int]] = set()
+        while stack:
+            listing = self._list(stack.pop())
+            if listing is None:
+                continue
+            key, files, subdirs = listing
+            if key in seen:
+                continue
+            seen.add(key)
+            yield from files
+            stack.extend(reversed(self._accepted(subdirs, check_dir)))
+
+
+class ThreadedScandirWalker(ScandirWalker):
+    """
+    Тот же обход, но чтение каталогов (readdir/stat) идёт в пуле потоков —
+    для сетевых и overlay-ФС, где обход упирается в задержки, а не в CPU.
+    Заранее читается не больше max_pending каталогов с вершины стека;
+    результат выдаётся в порядке последовательного обхода, check_dir зовётся из вызывающего потока.
+    """
+    def __init__(self, workers: int = 8, max_pending: Optional[int] = None, follow_symlinks: bool = False) -> None:
+        super().__init__(follow_symlinks)
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+
+    def __call__(self, path: Path, check_dir: Optional[Callable[[Path], bool]] = None) -> Iterator[FileInfo]:
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scandir")
+        futures: dict[str, Future] = {}
+        stack = [str(path)]
+        seen: set[tuple[int, int]] = set()
+        try:
+            while stack:
+                current = stack.pop()
+                future = futures.pop(current, None) or pool.submit(self._list, current)
+                listing = future.result()
+                if listing is None:
+                    continue
+                key, files, subdirs = listing
+                if key in seen:
+                    continue
+                seen.add(key)
+                stack.extend(reversed(self._accepted(subdirs, check_dir)))
+                # подкачка: каталоги, которые будут прочитаны следующими
+                for upcoming in reversed(stack[-self.max_pending:]):
+                    if len(futures) >= self.max_pending:
+                        break
+                    if upcoming not in futures:
+                        futures[upcoming] = pool.submit(self._list, upcoming)
+                yield from files
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class GitIndexWalker:
+    """
+    Список файлов из индекса git и статуса рабочей копии вместо обхода диска:
+    отслеживаемые файлы (кроме удалённых) + неотслеживаемые неигнорируемые.
+    В игнорируемые каталоги (build/, .venv/ ...) libgit2 не спускается вовсе.
+    """
+    SUBMODULE_MODE = 0o160000
+
+    def __init__(self, git_dir: Path) -> None:
+        self.repo = pygit2.Repository(str(git_dir))
+        self.workdir = Path(self.repo.workdir).resolve()
+
+    def _paths(self) -> set[str]:
+        status = self.repo.status(untracked_files="all", ignored=False)
+        paths = {
+            entry.path for entry in self.repo.index
+            if entry.mode != self.SUBMODULE_MODE
+            and not status.get(entry.path, 0) & (FileStatus.WT_DELETED | FileStatus.INDEX_DELETED)
+        }
+        paths.update(p for p, flags in status.items() if flags & FileStatus.WT_NEW)
+        return paths
+
+    def __call__(self, path: Path, check_dir: Optional[Callable[[Path], bool]] = None) -> Iterator[FileInfo]:
+        root = Path(path).resolve()
+        try:
+            prefix = root.relative_to(self.workdir).as_posix()
+        except ValueError:
+            return
+        prefix = "" if prefix == "." else f"{prefix}/"
+
+        allowed: dict[str, bool] = {"": True}
+        def dir_allowed(rel_dir: str) -> bool:
+            # каталог разрешён, если разрешены он сам и все его предки
+            known = allowed.get(rel_dir)
+            if known is None:
+                parent = rel_dir.rpartition("/")[0]
+                known = dir_allowed(parent) and (check_dir is None or check_dir(root / rel_dir))
+                allowed[rel_dir] = known
+            return known
+
+        for rel in sorted(self._paths()):
+            if not rel.startswith(prefix):
+                continue
+            rel_dir, _, name = rel[len(prefix):].rpartition("/")
+            if not dir_allowed(rel_dir):
+                continue
+            file_name = PurePath(name)
+            yield FileInfo(name=file_name.stem, format=file_name.suffix, path=root / rel_dir if rel_dir else root)
+
+
 class DirectoryParser:
-    def __init__(self,base_path: Optional[Path] = None, checkers: Optional[Iterable[FileChecherProto]] = None) -> None:
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        checkers: Optional[Iterable[FileChecherProto]] = None,
+        walker: Optional[DirectoryWalkerProto] = None,
+    ) -> None:
         self.checkers = checkers
         self.base_path = base_path.resolve() if base_path else None
         self.graph:Optional[GraphProto] = None
+        self.walker = walker or ScandirWalker()
         
         
     def _split_dirs(self, rel_path: Path) -> tuple[DirectoryNode, ...]:
         return tuple(DirectoryNode(Path(part)) for part in rel_path.parts if part not in (".", ""))    
         
     def __call__(self,graph: GraphProto, context: Path) -> GraphProto:
-        all_files:List[FileInfo] = self.parse_directory(context)
-        filtred_files:List[FileInfo] = self.apply_filters(files=all_files)
+        return self.add_files(graph, self.iter_files(context))
+
+    def check_dir(self, path: Path) -> bool:
+        """Спускаться ли в каталог: решают проверки, у которых есть check_dir"""
+        return all(checker.check_dir(path) for checker in self.checkers or () if hasattr(checker, "check_dir"))
+
+    def check_file(self, file: FileInfo) -> bool:
+        """Проходит ли файл все проверки"""
+        return all(checker(file) for checker in self.checkers or ())
+
+    def iter_files(self, path: Path) -> Iterator[FileInfo]:
+        """Отфильтрованные файлы по мере обхода; исключённые каталоги отсекаются до спуска"""
+        for f in self.walker(path, self.check_dir):
+            if self.check_file(f):
+                yield f
+
+    def file_node(self, f: FileInfo) -> FileInfo:
+        """Узел графа для найденного файла (путь относительно base_path)"""
+        return FileInfo(
+            name=f.name,
+            format=f.format,
+            path=self._rel(f.path),
+            is_exclude=f.is_exclude,
+        )
+
+    def add_files(self, graph: GraphProto, files: Iterable[FileInfo]) -> GraphProto:
+        """Добавляет в граф уже отфильтрованные файлы вместе с цепочками каталогов"""
         self.graph = graph
         tree_map: dict[tuple[DirectoryNode, ...], list[FileInfo]] = {}
 
-        for f in filtred_files:
+        for f in files:
             rel_dir = self._rel(f.path)
             key = self._split_dirs(rel_dir)
             tree_map.setdefault(key, []).append(f)
@@ -162,12 +320,7 @@ class DirectoryParser:
             for f in tree_map[key]:
                 
                 rel_file = self._rel(f.path / f"{f.name}{f.format}")
-                file_node = FileInfo(
-                    name=f.name,
-                    format=f.format,
-                    path=self._rel(f.path),
-                    is_exclude=f.is_exclude,
-                )
+                file_node = self.file_node(f)
                 
                 if rel_file != self._rel(f.path):
                     self.graph.add_edge(current_dir, file_node, Relation.CONTAINS)
@@ -187,13 +340,8 @@ class DirectoryParser:
     
     
     def parse_directory(self, path:Path) -> List[FileInfo]:
-        files:List[FileInfo]  = []
-        for dirName, subdirList, fileList in path.walk():
-            for file in fileList:
-                filename = str(Path(file).stem)
-                format = str(Path(file).suffix) 
-                files.append(FileInfo(name=filename,format=format,path=dirName))
-        return files
+        """Все файлы дерева, без фильтров"""
+        return list(self.walker(path))
     
     def _filter(self,filecker:FileChecherProto, files:List[FileInfo]) -> List[FileInfo]:
         return list(filter(filecker.__call__,files))
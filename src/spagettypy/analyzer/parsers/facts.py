@@ -0,0 +1,59 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Tuple
+
+from ..graph import GraphProto
+
+# Слот, которым помечаются операции самого пайплайна (а не анализаторов)
+PIPELINE_SLOT = -1
+
+NODE = "node"
+EDGE = "edge"
+
+FactOp = Tuple[int, str, Any, Any, Any]
+
+
+@dataclass(slots=True)
+class FileFacts:
+    """Факты, которые дал один файл: последовательность операций над графом и данные вне графа (extras)."""
+    ops: List[FactOp] = field(default_factory=list)
+    # "symbols" — экспорт модуля из таблицы символов, номер слота — file_extras анализатора
+    extras: dict[str | int, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __iter__(self) -> Iterator[FactOp]:
+        return iter(self.ops)
+
+
+class FactRecorder:
+    """Обёртка над GraphProto: пробрасывает изменения в граф и записывает их в FileFacts"""
+    def __init__(self, graph: Optional[GraphProto], facts: FileFacts, slot: int = PIPELINE_SLOT):
+        self.graph = graph
+        self.facts = facts
+        self.slot = slot
+
+    def add_node(self, node: Any) -> None:
+        self.facts.ops.append((self.slot, NODE, node, None, None))
+        if self.graph is not None:
+            self.graph.add_node(node)
+
+    def add_edge(self, source: Any, target: Any, data: Optional[Any] = None) -> None:
+        self.facts.ops.append((self.slot, EDGE, source, target, data))
+        if self.graph is not None:
+            self.graph.add_edge(source, target, data=data)
+
+    def __getattr__(self, name: str) -> Any:
+        # чтение (nodes, edges, индексы) идёт напрямую в граф
+        return getattr(self.graph, name)
+
+
+def replay_facts(facts: FileFacts, graphs: dict[int, GraphProto]) -> None:
+    """Проигрывает записанные операции в графы, соответствующие слотам"""
+    for slot, op, u, v, data in facts.ops:
+        graph = graphs.get(slot, graphs[PIPELINE_SLOT])
+        if op == NODE:
+            graph.add_node(u)
+        else:
+            graph.add_edge(u, v, data=data)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+import os
+
+from pathspec import GitIgnoreSpec
+from pathspec.pattern import Pattern
+
+from ..model import FileInfo
+
+GITIGNORE = ".gitignore"
+
+
+def _translate(line: str, prefix: str) -> Optional[str]:
+    """Шаблон из вложенного .gitignore → шаблон относительно корня репозитория"""
+    line = line.rstrip("\r\n")
+    if not line.strip() or line.startswith("#"):
+        return None
+    if not prefix:
+        return line
+    negate = line.startswith("!")
+    body = line[1:] if negate else line
+    # "/" в начале или середине привязывает шаблон к каталогу файла .gitignore
+    if "/" in body.rstrip("/"):
+        body = f"{prefix}/{body.lstrip('/')}"
+    else:
+        body = f"{prefix}/**/{body}"
+    return f"!{body}" if negate else body
+
+
+class IgnoreEngine:
+    """
+    Один матчер на запуск: .git/info/exclude, корневой и вложенные .gitignore
+    (подгружаются по мере спуска в каталоги) и шаблоны --exclude.
+    Пути сравниваются относительно корня репозитория (git) и base_path (--exclude);
+    относительные префиксы каталогов кэшируются, поэтому проверка файла — одна склейка строк.
+    """
+    def __init__(
+        self,
+        base_path: Path,
+        git_dir: Optional[Path] = None,
+        excludes: Iterable[str] = (),
+        gitignore: bool = True,
+        info_exclude: bool = True,
+    ) -> None:
+        self.base_path = Path(base_path).resolve()
+        self.git_dir = Path(git_dir) if git_dir else None
+        self.repo_root = self.git_dir.parent if self.git_dir else None
+        self.gitignore = gitignore and self.git_dir is not None
+        self._patterns: List[Pattern] = []
+        self._git_spec = GitIgnoreSpec([])
+        self._exclude_spec = GitIgnoreSpec.from_lines(excludes)
+        self._loaded: set[str] = set()
+        self._prefixes: dict[str, tuple[Optional[str], Optional[str]]] = {}
+        if info_exclude and self.git_dir is not None:
+            self._add_file(self.git_dir / "info" / "exclude", "")
+
+    # ------ шаблоны ------
+    def _add_file(self, path: Path, prefix: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                lines = [_translate(line, prefix) for line in f]
+        except OSError:
+            return
+        # шаблоны файла компилируются один раз; спецификация пересобирается из готовых
+        patterns = GitIgnoreSpec.from_lines([line for line in lines if line is not None]).patterns
+        if patterns:
+            self._patterns.extend(patterns)
+            self._git_spec = GitIgnoreSpec(self._patterns)
+
+    def _load(self, directory: str) -> None:
+        """Подгружает .gitignore каталога и всех его предков (предки — первыми)"""
+        if directory in self._loaded or not self.gitignore:
+            return
+        pending = []
+        current = directory
+        while current not in self._loaded:
+            self._loaded.add(current)
+            git_rel, _ = self._prefix(current)
+            if git_rel is None:
+                break
+            pending.append((current, git_rel))
+            if not git_rel:
+                break
+            current = os.path.dirname(current)
+        for current, git_rel in reversed(pending):
+            self._add_file(Path(current, GITIGNORE), git_rel)
+
+    # ------ пути ------
+    @staticmethod
+    def _relative(directory: str, root: Optional[Path]) -> Optional[str]:
+        if root is None:
+            return None
+        rel = os.path.relpath(directory, root)
+        if rel == ".":
+            return ""
+        if rel == ".." or rel.startswith(".." + os.sep):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def _prefix(self, directory: str) -> tuple[Optional[str], Optional[str]]:
+        """(путь от корня репозитория, путь от base_path) для каталога"""
+        known = self._prefixes.get(directory)
+        if known is None:
+            known = self._prefixes[directory] = (
+                self._relative(directory, self.repo_root),
+                self._relative(directory, self.base_path),
+            )
+        return known
+
+    def _absolute(self, path: Path | str) -> str:
+        path = str(path)
+        return path if os.path.isabs(path) else os.path.join(self.base_path, path)
+
+    # ------ запросы ------
+    def is_ignored(self, path: Path | str, is_dir: bool = False) -> bool:
+        full = self._absolute(path)
+        parent, name = os.path.split(full)
+        if is_dir and name == ".git":
+            return True
+        self._load(parent)
+        git_rel, base_rel = self._prefix(parent)
+        suffix = f"{name}/" if is_dir else name
+        if base_rel is not None and self._exclude_spec.match_file(f"{base_rel}/{suffix}" if base_rel else suffix):
+            return True
+        if git_rel is not None and self._patterns:
+            return self._git_spec.match_file(f"{git_rel}/{suffix}" if git_rel else suffix)
+        return False
+
+    def is_dir_ignored(self, path: Path | str) -> bool:
+        """Каталог игнорируется целиком — обход может не спускаться в него"""
+        return self.is_ignored(path, is_dir=True)
+
+    def is_file_ignored(self, file: FileInfo) -> bool:
+        return self.is_ignored(os.path.join(self._absolute(file.path), f"{file.name}{file.format}"))
+
+    def ignored(self, paths: Iterable[Path | str]) -> List[bool]:
+        """
+        Пакетная проверка файлов: флаг для каждого пути в исходном порядке.
+        Каталоги разбираются по одному разу, каждая спецификация проходит
+        по всем относительным путям одним вызовом match_files.
+        """
+        flags: List[bool] = []
+        by_base: dict[str, List[int]] = {}
+        by_git: dict[str, List[int]] = {}
+        for i, path in enumerate(paths):
+            parent, name = os.path.split(self._absolute(path))
+            self._load(parent)
+            git_rel, base_rel = self._prefix(parent)
+            flags.append(False)
+            if base_rel is not None:
+                by_base.setdefault(f"{base_rel}/{name}" if base_rel else name, []).append(i)
+            if git_rel is not None:
+                by_git.setdefault(f"{git_rel}/{name}" if git_rel else name, []).append(i)
+        for spec, index in ((self._exclude_spec, by_base), (self._git_spec, by_git)):
+            if not spec.patterns:
+                continue
+            for rel in spec.match_files(index):
+                for i in index[os.fspath(rel)]:
+                    flags[i] = True
+        return flags
+
+    def filter_files(self, files: Iterable[FileInfo]) -> Iterator[FileInfo]:
+        """Файлы, которые не игнорируются (одной пакетной проверкой)"""
+        files = list(files)
+        flags = self.ignored(os.path.join(self._absolute(f.path), f"{f.name}{f.format}") for f in files)
+        return (f for f, ignored in zip(files, flags) if not ignored)
+
+
+class IgnoreFileChecker:
+    """Проверка файлов и каталогов через общий IgnoreEngine"""
+    def __init__(self, engine: IgnoreEngine) -> None:
+        self.engine = engine
+
+    def __call__(self, file: FileInfo) -> bool:
+        return not self.engine.is_file_ignored(file)
+
+    def check_dir(self, path: Path) -> bool:
+        return not self.engine.is_dir_ignored(path)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+import os
+import time
+import pygit2
+from pygit2.enums import DiffOption, DiffFind
+
+from ..graph import MutableGraphProto
+from ..model import Relation, FileInfo, ModuleInfo
+from .directory_parser import DirectoryParser, GitFinder
+
+# Связи, по которым модуль владеет узлами (классы, функции, атрибуты)
+OWNED_RELATIONS = (Relation.DEFINES, Relation.METHODS, Relation.ATTRIBUTE)
+# Рёбра от узлов модуля, которые строит не он, а импортирующий модуль
+FOREIGN_RELATIONS = (Relation.FROM,)
+# Связи других модулей с узлами модуля, разрешаемые в их finalize
+DEPENDENT_RELATIONS = (Relation.IMPORTS, Relation.INHERIT, Relation.CALLINGS)
+# Окно «свежего» mtime каталога: грубые ФС хранят mtime с точностью до 2 с
+RACY_MTIME_NS = 2_000_000_000
+
+
+@dataclass(slots=True)
+class ChangeSet:
+    """Изменённые файлы (абсолютные пути): что переанализировать и что удалить"""
+    changed: List[Path] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+class GitChangeFinder:
+    """Файлы, изменённые, добавленные, удалённые или переименованные с коммита base (включая рабочую копию)"""
+    def __init__(self, start_path: str | Path) -> None:
+        self.base_path = Path(start_path).resolve()
+        repo_path = GitFinder()(str(self.base_path))
+        self.repo = pygit2.Repository(str(repo_path)) if repo_path else None
+
+    def __call__(self, base: str) -> ChangeSet:
+        changes = ChangeSet()
+        if self.repo is None:
+            return changes
+        commit = self.repo.revparse_single(base).peel(pygit2.Commit)
+        diff = commit.tree.diff_to_workdir(
+            flags=DiffOption.INCLUDE_UNTRACKED | DiffOption.RECURSE_UNTRACKED_DIRS
+        )
+        diff.find_similar(flags=DiffFind.FIND_RENAMES | DiffFind.FIND_FOR_UNTRACKED)
+        workdir = Path(self.repo.workdir)
+
+        for delta in diff.deltas:
+            status = delta.status_char()
+            old_path = workdir / delta.old_file.path
+            new_path = workdir / delta.new_file.path
+            if status == "D":
+                changes.removed.append(old_path)
+            elif status == "R":
+                changes.removed.append(old_path)
+                changes.changed.append(new_path)
+            else:
+                changes.changed.append(new_path)
+
+        changes.changed = [p for p in changes.changed if self._inside(p)]
+        changes.removed = [p for p in changes.removed if self._inside(p)]
+        return changes
+
+    def _inside(self, path: Path) -> bool:
+        return self.base_path == path or self.base_path in path.parents
+
+
+class GraphPatcher:
+    """
+    Точечно обновляет граф: удаляет устаревшие узлы и рёбра модулей изменённых файлов
+    и добавляет файлы заново через DirectoryParser (с теми же фильтрами).
+    Удаляются только рёбра, построенные самим модулем: FROM от его узлов к нему строят импортирующие модули.
+    Модули, чьи импорты, наследование или вызовы ведут в изменённые модули, переанализируются вместе с ними —
+    их связи разрешаются в finalize по уже обновлённым модулям.
+    """
+    def __init__(self, graph: MutableGraphProto, parser: DirectoryParser) -> None:
+        self.graph = graph
+        self.parser = parser
+        # узлы удалённых файлов последнего вызова: их модули убираются и из таблицы символов
+        self.removed: List[FileInfo] = []
+
+    def _file_node(self, path: Path) -> FileInfo:
+        return self.parser.file_node(FileInfo(name=path.stem, format=path.suffix, path=path.parent))
+
+    def _file_path(self, file: FileInfo) -> Path:
+        return Path(self.parser.base_path or "", file.path, f"{file.name}{file.format}")
+
+    def _drop_owned(self, owner, keep_foreign: bool = True, seen: Optional[set] = None) -> None:
+        """
+        Удаляет исходящие рёбра владельца; узлы, на которые больше никто не ссылается, — тоже.
+        keep_foreign — рёбра импортирующих модулей (FROM) остаются: модуль разберётся заново.
+        """
+        # узлы равны по имени: функция main модуля main — тот же узел, владение может замкнуться
+        seen = set() if seen is None else seen
+        seen.add(owner)
+        for _, target, data in list(self.graph.out_edges(owner)):
+            if keep_foreign and data in FOREIGN_RELATIONS:
+                continue
+            self.graph.remove_edge(owner, target)
+            if data in OWNED_RELATIONS and target not in seen:
+                self._drop_owned(target, keep_foreign, seen)
+            elif data == Relation.IMPORTS:
+                self._drop_from(target)
+            if self.graph.has_node(target) and not self.graph.degree(target):
+                self.graph.remove_node(target)
+
+    def _drop_from(self, imported) -> None:
+        """FROM импортированного узла держится, пока его импортирует хоть один модуль"""
+        if not self.graph.has_node(imported):
+            return
+        if any(data == Relation.IMPORTS for _, _, data in self.graph.in_edges(imported)):
+            return
+        for _, base, data in list(self.graph.out_edges(imported)):
+            if data == Relation.FROM:
+                self.graph.remove_edge(imported, base)
+                if not self.graph.degree(base):
+                    self.graph.remove_node(base)
+
+    def drop_file(self, path: Path, keep_foreign: bool = True) -> None:
+        file_node = self._file_node(path)
+        if not self.graph.has_node(file_node):
+            return
+        for _, module, data in list(self.graph.out_edges(file_node)):
+            if isinstance(module, ModuleInfo) and data == Relation.CONTAINS:
+                self._drop_owned(module, keep_foreign)
+        # модуль остаётся в графе, пока его импортируют другие модули
+        for _, module, _ in list(self.graph.out_edges(file_node)):
+            self.graph.remove_edge(file_node, module)
+            if not self.graph.degree(module):
+                self.graph.remove_node(module)
+        self.graph.remove_node(file_node)
+
+    def add_files(self, paths: Iterable[Path]) -> List[FileInfo]:
+        found = [FileInfo(name=p.stem, format=p.suffix, path=p.parent) for p in paths if p.is_file()]
+        files = self.parser.apply_filters(found)
+        self.parser.add_files(self.graph, files)
+        return [self.parser.file_node(f) for f in files]
+
+    def dependents(self, paths: Iterable[Path]) -> List[Path]:
+        """Файлы других модулей, чьи импорты, наследование или вызовы ведут в модули paths"""
+        paths = list(paths)
+        skip = {self._file_node(p) for p in paths}
+        found: dict[FileInfo, None] = {}
+        for node in self._owned(paths):
+            for source, _, data in self.graph.in_edges(node):
+                if data not in DEPENDENT_RELATIONS:
+                    continue
+                module = source if isinstance(source, ModuleInfo) else getattr(source, "module", None)
+                file = getattr(module, "file", None)
+                if isinstance(file, FileInfo) and file not in skip and self.graph.has_node(file):
+                    found[file] = None
+        return [self._file_path(f) for f in found]
+
+    def __call__(self, changes: ChangeSet) -> List[FileInfo]:
+        """Применяет изменения; возвращает узлы файлов, которые нужно проанализировать заново"""
+        dependents = self.dependents([*changes.removed, *changes.changed])
+        self.removed = [self._file_node(p) for p in changes.removed]
+        for path in changes.removed:
+            # модуля больше нет: рёбра его импортёров тоже уходят, импортёры переанализируются
+            self.drop_file(path, keep_foreign=False)
+        for path in (*changes.changed, *dependents):
+            self.drop_file(path)
+        return self.add_files([*changes.changed, *dependents])
+
+    def _owned(self, paths: Iterable[Path]) -> Iterator[Any]:
+        """Узлы подграфов файлов: файл → модуль → его узлы"""
+        stack = [node for node in map(self._file_node, paths) if self.graph.has_node(node)]
+        seen = set()
+        while stack:
+            owner = stack.pop()
+            if owner in seen:
+                continue
+            seen.add(owner)
+            yield owner
+            for _, target, data in self.graph.out_edges(owner):
+                if data in OWNED_RELATIONS or (isinstance(owner, FileInfo) and data == Relation.CONTAINS):
+                    stack.append(target)
+
+    def footprint(self, paths: Iterable[Path]) -> frozenset:
+        """Рёбра подграфов файлов (файл → модуль → его узлы): по ним видно, изменился ли граф"""
+        return frozenset(edge for owner in self._owned(paths) for edge in self.graph.out_edges(owner))
+
+
+class PollingWatcher:
+    """
+    Следит за .py файлами опросом mtime/size; изменения склеиваются с задержкой debounce.
+    Содержимое каталога (отфильтрованные файлы и подкаталоги) запоминается по mtime каталога:
+    пока он не изменился, каталог не перечитывается и проверки парсера по нему не повторяются —
+    за опрос остаётся stat каталогов и отслеживаемых файлов.
+    Исключённые каталоги (check_dir парсера) не открываются, симлинки на каталоги не обходятся.
+    """
+    def __init__(self, parser: DirectoryParser, root: Path, suffixes: Iterable[str] = (".py",)) -> None:
+        self.parser = parser
+        self.root = Path(root)
+        self.suffixes = tuple(suffixes)
+        # каталог → (mtime_ns, файлы, подкаталоги)
+        self._listings: dict[Path, tuple[int, list[Path], list[Path]]] = {}
+        self._state = self._scan()
+
+    def _list(self, directory: Path) -> Optional[tuple[list[Path], list[Path]]]:
+        """Отслеживаемые файлы и допустимые подкаталоги; из памяти, если mtime каталога прежний"""
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            return None
+        known = self._listings.get(directory)
+        if known is not None and known[0] == mtime:
+            return known[1], known[2]
+
+        files: list[Path] = []
+        subdirs: list[Path] = []
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return None
+        for entry in entries:
+            path = Path(entry.path)
+            try:
+                is_dir = entry.is_dir()
+                is_link = entry.is_symlink()
+            except OSError:
+                continue
+            if is_dir:
+                if not is_link and self.parser.check_dir(path):
+                    subdirs.append(path)
+                continue
+            file = FileInfo(name=path.stem, format=path.suffix, path=directory)
+            if file.format in self.suffixes and self.parser.check_file(file):
+                files.append(path)
+        # каталог, изменённый только что, не запоминается: новая запись в тот же квант mtime была бы пропущена
+        if time.time_ns() - mtime > RACY_MTIME_NS:
+            self._listings[directory] = (mtime, files, subdirs)
+        else:
+            self._listings.pop(directory, None)
+        return files, subdirs
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        state = {}
+        visited: set[Path] = set()
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            listing = self._list(directory)
+            if listing is None:
+                continue
+            visited.add(directory)
+            files, subdirs = listing
+            for path in files:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+            stack.extend(reversed(subdirs))
+        for directory in self._listings.keys() - visited:
+            del self._listings[directory]
+        return state
+
+    def poll(self) -> ChangeSet:
+        current = self._scan()
+        changes = ChangeSet(
+            changed=[p for p, sig in current.items() if self._state.get(p) != sig],
+            removed=[p for p in self._state if p not in current],
+        )
+        self._state = current
+        return changes
+
+    def changes(self, interval: float = 0.5, debounce: float = 0.3) -> Iterator[ChangeSet]:
+        """Бесконечный поток пачек изменений: пачка отдаётся, когда правки затихли на debounce секунд"""
+        pending = ChangeSet()
+        quiet_since = time.monotonic()
+        while True:
+            found = self.poll()
+            now = time.monotonic()
+            if found:
+                pending.changed = list(dict.fromkeys([*pending.changed, *found.changed]))
+                pending.removed = list(dict.fromkeys([*pending.removed, *found.removed]))
+                quiet_since = now
+            elif pending and now - quiet_since >= debounce:
+                pending.changed = [p for p in pending.changed if p.exists()]
+                yield pending
+                pending = ChangeSet()
+            time.sleep(interval if not pending else min(interval, debounce))
+
+
+class LiveGraph:
+    """Граф, который держится в памяти и точечно обновляется пачками изменений"""
+    def __init__(self, graph: MutableGraphProto, parser: DirectoryParser, pipeline: Any) -> None:
+        self.graph = graph
+        self.patcher = GraphPatcher(graph, parser)
+        self.pipeline = pipeline
+
+    def update(self, changes: ChangeSet) -> bool:
+        """Переанализирует только затронутые модули; True, если граф действительно изменился"""
+        paths = [*changes.removed, *changes.changed]
+        before = self.patcher.footprint(paths)
+        pending = self.patcher(changes)
+        self.pipeline.forget(self.patcher.removed)
+        self.pipeline(self.graph, files=pending)
+        return before != self.patcher.footprint(paths)
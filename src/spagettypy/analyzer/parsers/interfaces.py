@@ -1,5 +1,5 @@
 
-from typing import Protocol,Optional, Any, Iterable, TypeVar, Type
+from typing import Protocol,Optional, Any, Iterable, TypeVar, Type, Callable, Iterator
 from pathlib import Path
 from ..model import FileInfo,ClassInfo, ModuleInfo, FunctionInfo
 from ..graph import GraphProto
@@ -12,6 +12,15 @@ class AnalyzerStageProto(Protocol):
 
 class FileChecherProto(Protocol):
     def __call__(self, file: FileInfo) -> bool: ...
+
+
+class DirChecherProto(FileChecherProto, Protocol):
+    """Проверка, которая умеет отсечь каталог целиком до обхода (необязательный метод check_dir)"""
+    def check_dir(self, path: Path) -> bool: ...
+
+
+class DirectoryWalkerProto(Protocol):
+    def __call__(self, path: Path, check_dir: Optional[Callable[[Path], bool]] = None) -> Iterator[FileInfo]: ...
     
 class FileFinderProto(Protocol):
     def __call__(self, prop: str) -> Optional[Path]: ...
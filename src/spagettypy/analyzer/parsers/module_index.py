@@ -0,0 +1,104 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+import os
+
+# Каталоги, в которых не бывает модулей проекта
+SKIP_DIRS = {"__pycache__", "node_modules"}
+# Корни src-раскладки — только от корня проекта ('src/pkg/mod.py' → 'pkg.mod')
+SRC_LAYOUT_ROOTS = ("src",)
+
+# Приоритет записи имени: прямое от корня важнее выведенного из src/, файл — каталога
+_DIRECT, _DIRECT_DIR, _DERIVED, _DERIVED_DIR = range(4)
+
+
+def strip_src_root(parts: tuple[str, ...], roots: Iterable[str] = SRC_LAYOUT_ROOTS) -> Optional[tuple[str, ...]]:
+    """Части пути без ведущего корня src-раскладки (None — путь не под таким корнем)"""
+    for root in roots:
+        root_parts = tuple(root.strip("/").split("/"))
+        if parts[:len(root_parts)] == root_parts:
+            return parts[len(root_parts):]
+    return None
+
+
+class ModuleIndex:
+    """
+    Индекс 'a.b.c' → путь, строится одним обходом проекта за запуск.
+    Учитывает обычные пакеты (__init__.py), namespace-пакеты (каталоги без __init__.py)
+    и src-раскладку: имена считаются и от корня, и от ведущих каталогов src_roots.
+    Имя от корня никогда не перезаписывается именем, выведенным из src-раскладки.
+    """
+    def __init__(self, root: Path, src_roots: Iterable[str] = SRC_LAYOUT_ROOTS):
+        self.root = Path(root).resolve()
+        self.src_roots = tuple(src_roots)
+        self._names: Dict[str, Path] = {}
+        self._ranks: Dict[str, int] = {}
+        self._built = False
+        self._stems: Dict[str, Path] = {}
+
+    def _walk(self) -> Iterator[tuple[Path, list[str]]]:
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+            yield Path(dirpath), sorted(f for f in filenames if f.endswith(".py"))
+
+    def _register(self, parts: tuple[str, ...], path: Path, rank: int) -> None:
+        if not parts:
+            return
+        name = ".".join(parts)
+        known = self._ranks.get(name)
+        # каталог не вытесняет уже найденное; файл того же приоритета — последний по обходу
+        if known is None or rank < known or (rank == known and rank in (_DIRECT, _DERIVED)):
+            self._names[name] = path
+            self._ranks[name] = rank
+
+    def build(self) -> "ModuleIndex":
+        self._names = {}
+        self._ranks = {}
+        self._stems = {}
+        for directory, files in self._walk():
+            rel = directory.relative_to(self.root).parts
+            bases = [(rel, _DIRECT, _DIRECT_DIR)]
+            derived = strip_src_root(rel, self.src_roots)
+            if derived is not None:
+                bases.append((derived, _DERIVED, _DERIVED_DIR))
+            for base, file_rank, dir_rank in bases:
+                if files:
+                    # пакет или namespace-пакет (вместе с предками); __init__.py переопределит каталог
+                    owner = directory
+                    for depth in range(len(base), 0, -1):
+                        self._register(base[:depth], owner, dir_rank)
+                        owner = owner.parent
+                for f in files:
+                    stem = f[:-3]
+                    path = directory / f
+                    if stem == "__init__":
+                        self._register(base, path, file_rank)
+                    else:
+                        self._register(base + (stem,), path, file_rank)
+            for f in files:
+                self._stems.setdefault(f[:-3], directory / f)
+        self._built = True
+        return self
+
+    @property
+    def names(self) -> Dict[str, Path]:
+        if not self._built:
+            self.build()
+        return self._names
+
+    def get(self, dotted: str) -> Optional[Path]:
+        """Точное совпадение полного имени модуля"""
+        return self.names.get(dotted.strip("."))
+
+    def find(self, dotted: str) -> Optional[Path]:
+        """Точное совпадение, иначе — первый файл с таким же последним сегментом имени"""
+        path = self.get(dotted)
+        if path is None:
+            path = self._stems.get(dotted.strip(".").rsplit(".", 1)[-1])
+        return path
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, dotted: str) -> bool:
+        return dotted in self.names
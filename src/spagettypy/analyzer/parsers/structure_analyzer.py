@@ -3,6 +3,8 @@ from typing import List, Iterable,Optional, Iterator, Any
 from pathlib import Path
 import ast
 import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from importlib.util import find_spec
 
 
@@ -17,9 +19,13 @@ from ..model import (
     ClassType,
     FunctionType,
     ImportScope,
-    AttributeInfo
+    AttributeInfo,
+    CodeSpan
     )
-from .base import AnalyzerBase, FactoryCodeSpan, BaseResolver, AttributeFactory
+from .base import AnalyzerBase, FactoryCodeSpan, BaseResolver, AttributeFactory, VisitorDispatcher, SymbolTable, module_key
+from .cache import AnalysisCache
+from .module_index import ModuleIndex
+from .facts import FileFacts, FactRecorder, PIPELINE_SLOT, replay_facts
 
 
 
@@ -28,33 +34,20 @@ ScopeType = ModuleInfo | ClassInfo | FunctionInfo
 class ModuleFileFinder:
     """Ищет файл модуля как в системных путях, так и локально внутри проекта."""
 
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, index: Optional[ModuleIndex] = None):
         self.root = root.resolve()
         # Добавляем корень проекта в sys.path (а не только src/)
         if str(self.root) not in sys.path:
             sys.path.insert(0, str(self.root))
+        self.index = index if index is not None else ModuleIndex(self.root)
 
     def _find_local_path(self, prop: str) -> Optional[Path]:
         """
         Ищет модуль по имени 'a.b.c' как файл a/b/c.py или a/b/c/__init__.py
-        внутри проекта, без предположений о структуре.
+        внутри проекта по индексу модулей (один обход дерева за запуск).
         """
-        parts = Path(*prop.split("."))
-        candidates = [
-            self.root / parts.with_suffix(".py"),
-            self.root / parts / "__init__.py",
-        ]
-
-        # если структура произвольная — ищем глубже (до 3 уровней вложенности)
-        for pyfile in self.root.rglob("*.py"):
-            if pyfile.stem == parts.name and parts.parts[-1] in pyfile.parts:
-                return pyfile.resolve()
-
-        for path in candidates:
-            if path.exists():
-                return path.resolve()
-
-        return None
+        path = self.index.find(prop)
+        return path.resolve() if path else None
 
     def __call__(self, prop: str) -> Optional[Path]:
         """Пробует найти модуль через importlib или локальный поиск."""
@@ -70,11 +63,69 @@ class ModuleFileFinder:
         return self._find_local_path(prop)
         
 
+class ImportScopeResolver:
+    """
+    Общий на запуск кэш: имя импорта → ImportScope.
+    Модули проекта ищутся сначала в ModuleIndex: локальный types.py или email/ затеняет stdlib.
+    Встроенные модули и stdlib определяются по sys.builtin_module_names / sys.stdlib_module_names
+    без обращения к importlib; остальное — через ModuleFileFinder один раз на имя.
+    """
+    def __init__(self, root: Path, index: Optional[ModuleIndex] = None):
+        self.root = root
+        self.find_path = ModuleFileFinder(root, index)
+        self._scopes: dict[str, ImportScope] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, name: str) -> ImportScope:
+        top = name.partition(".")[0]
+        index = self.find_path.index
+        # пакет проекта затеняет одноимённый stdlib-пакет и для его подмодулей
+        if index.get(name) is not None or index.get(top) is not None:
+            return ImportScope.LOCAL
+        if top in sys.builtin_module_names:
+            return ImportScope.BUILTIN
+        if top in sys.stdlib_module_names:
+            return ImportScope.STDLIB
+
+        file_path = self.find_path(name)
+        if not file_path:
+            # если модуль не найден через find_spec, считаем, что это stdlib
+            return ImportScope.STDLIB
+
+        # Проверяем путь относительно проекта
+        if self.root in file_path.parents:
+            return ImportScope.LOCAL
+        elif "site-packages" in str(file_path):
+            return ImportScope.DEPENDENCY
+        elif "lib" in str(file_path).lower() or "python" in str(file_path).lower():
+            return ImportScope.STDLIB
+        return ImportScope.UNKNOWN
+
+    def __call__(self, name: str) -> ImportScope:
+        scope = self._scopes.get(name)
+        if scope is not None:
+            self.hits += 1
+            return scope
+        self.misses += 1
+        scope = self._scopes[name] = self._resolve(name)
+        return scope
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._scopes)}
+
+
 class ModuleImportScopeClassifer:
     "Определяет тип модуля по его имени и пути до него"
-    def __init__(self, root: Path):
+    def __init__(
+        self, 
+        root: Path, 
+        index: Optional[ModuleIndex] = None, 
+        resolver: Optional[ImportScopeResolver] = None
+    ):
         self.root = root
-        self.find_path = ModuleFileFinder(root)
+        self.resolver = resolver if resolver is not None else ImportScopeResolver(root, index)
+        self.find_path = self.resolver.find_path
         
         
     def __call__(self, prop: str | Iterable[str], node: ModuleInfo) -> ModuleInfo:
@@ -88,21 +139,7 @@ class ModuleImportScopeClassifer:
             return node
 
         for name in names:
-            file_path = self.find_path(name)
-            if not file_path:
-                # если модуль не найден через find_spec, считаем, что это stdlib
-                node.scope = ImportScope.STDLIB
-                continue
-
-            # Проверяем путь относительно проекта
-            if self.root in file_path.parents:
-                node.scope = ImportScope.LOCAL
-            elif "site-packages" in str(file_path):
-                node.scope = ImportScope.DEPENDENCY
-            elif "lib" in str(file_path).lower() or "python" in str(file_path).lower():
-                node.scope = ImportScope.STDLIB
-            else:
-                node.scope = ImportScope.UNKNOWN
+            node.scope = self.resolver(name)
         return node
 
 
@@ -161,57 +198,233 @@ class ModuleResolver(BaseResolver):
 
 
 class ASTAnalyzerPipeline:
-    def __init__(self, analyzers: list[AnalyzerBase], root_path: Path):
+    def __init__(
+        self, 
+        analyzers: list[AnalyzerBase], 
+        root_path: Path, 
+        cache: Optional[AnalysisCache] = None,
+        jobs: int = 1,
+        index: Optional[ModuleIndex] = None,
+        scope_resolver: Optional[ImportScopeResolver] = None,
+        symbols: Optional[SymbolTable] = None,
+        low_memory: bool = False
+    ):
         self.analyzers = analyzers
+        # CodeSpan читает текст фрагмента из файла по запросу;
+        # low_memory: у CodeSpan нет и таблицы строк, текст фрагментов не доступен
+        self.low_memory = low_memory
         self.root_path = root_path
-        self.module_scope_classifier = ModuleImportScopeClassifer(root_path)
+        self.module_scope_classifier = ModuleImportScopeClassifer(root_path, index, scope_resolver)
+        self.cache = cache
+        self.jobs = max(1, jobs)
+        self.symbols = symbols
+        self.dispatcher = VisitorDispatcher(analyzers)
+        self.signature = AnalysisCache.signature(
+            analyzers, {"root": Path(root_path).resolve(), "symbols": symbols is not None, "low_memory": low_memory}
+        )
 
-    def __call__(self, graph: GraphProto) -> GraphProto:
+    def __call__(self, graph: GraphProto, files: Optional[Iterable[FileInfo]] = None) -> GraphProto:
+        """Анализирует все файлы графа или только переданные (инкрементальный режим)"""
         result = graph
-        filterbyclass: Iterator[FileInfo] = FilterNodeByClass(filter_by=FileInfo)
-        ony_files:List[FileInfo] = [n for n in filterbyclass(graph)]
-        to_module = FileToModuleAdapter()
+        if files is None:
+            filterbyclass: Iterator[FileInfo] = FilterNodeByClass(filter_by=FileInfo)
+            files = filterbyclass(graph)
+        ony_files:List[FileInfo] = list(files)
+        entries: List[tuple[FileInfo, Path, Optional[str]]] = []
         for file in ony_files:
             
             full_path = Path(self.root_path, file.path, file.name + file.format)
             if not full_path.exists():
                 continue
-            with open(full_path, "r", encoding="utf-8") as f:
-                source = f.read()
-            codespan_factory = FactoryCodeSpan(source)
-            
-            tree = ast.parse(source)
-            module = to_module(file)
-            module = self.module_scope_classifier(module.name,module)
-            module.span = codespan_factory.create_codespan_from_file(source)
-            graph.add_edge(file,module,data=Relation.CONTAINS)
-            
-            self.run(tree,module,codespan_factory)
-            
-            f.close()
+            key = self.cache.key(full_path, self.signature) if self.cache is not None else None
+            entries.append((file, full_path, key))
+
+        # файлы из кэша не разбираются; они вливаются в граф на своём месте среди остальных
+        fresh = [i for i, (_, _, key) in enumerate(entries) if self.cache is None or key is None or key not in self.cache]
+        if self.jobs > 1 and len(fresh) > 1:
+            self._run_parallel(graph, entries, fresh)
+        else:
+            for file, full_path, key in entries:
+                self._process(graph, file, full_path, key)
+
+        if self.cache is not None:
+            self.cache.flush()
+        for analyzer in self.analyzers:
+            analyzer.finalize()
         return result
-        
 
+    def _process(self, graph: GraphProto, file: FileInfo, full_path: Path, key: Optional[str]) -> None:
+        """Один файл в родителе: из кэша, если запись есть, иначе разбором"""
+        if self.cache is None or key is None:
+            self.analyze_file(graph, file, self._read(full_path))
+            return
+        facts = self.cache.get(key)
+        if facts is not None:
+            self.replay(graph, facts)
+        else:
+            self.cache.put(key, self.record_file(graph, file, self._read(full_path)))
+
+    def _run_parallel(self, graph: GraphProto, entries: List[tuple[FileInfo, Path, Optional[str]]], fresh: List[int]) -> None:
+        """
+        Разбор файлов в пуле процессов: воркеры возвращают FileFacts,
+        родитель вливает их и записи кэша в граф в исходном порядке файлов.
+        Факты файла зависят только от самого файла (межмодульные связи строятся в finalize),
+        поэтому граф совпадает с последовательным разбором при любом расписании воркеров.
+        Крупные файлы отправляются первыми, чтобы не стать хвостом.
+        """
+        order = sorted(fresh, key=lambda i: entries[i][1].stat().st_size, reverse=True)
+        # графы с буфером записи (SQLiteGraph) сбрасывают его до fork — воркеры читают уже записанное
+        flush = getattr(graph, "flush", None)
+        if flush is not None:
+            flush()
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context("fork") if "fork" in methods else None
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self, graph),
+        ) as pool:
+            futures = {pool.submit(_record_in_worker, entries[i][0], entries[i][1]): i for i in order}
+            done = as_completed(futures)
+            ready: dict[int, FileFacts] = {}
+            submitted = set(fresh)
+            for index, (file, full_path, key) in enumerate(entries):
+                if index not in submitted:
+                    self._process(graph, file, full_path, key)
+                    continue
+                while index not in ready:
+                    future = next(done)
+                    ready[futures[future]] = future.result()
+                facts = ready.pop(index)
+                self.replay(graph, facts)
+                if self.cache is not None and key is not None:
+                    self.cache.put(key, facts)
+
+    @staticmethod
+    def _read(full_path: Path) -> str:
+        with open(full_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def analyze_file(self, graph: GraphProto, file: FileInfo, source: str) -> None:
+        """Разбирает один файл и прогоняет по нему все анализаторы"""
+        to_module = FileToModuleAdapter()
+        full_path = Path(self.root_path, file.path, file.name + file.format).resolve()
+        codespan_factory = FactoryCodeSpan(source, keep_source=not self.low_memory, path=full_path)
+        
+        tree = ast.parse(source)
+        module = to_module(file)
+        module = self.module_scope_classifier(module.name,module)
+        module.span = codespan_factory.create_codespan_from_file(source)
+        graph.add_edge(file,module,data=Relation.CONTAINS)
+        key = module_key(module)
+        if self.symbols is not None and key is not None:
+            self.symbols.drop_module(key)
+            self.symbols.define(key, "", module)
+        
+        self.run(tree,module,codespan_factory)
+
+    def forget(self, files: Iterable[FileInfo]) -> None:
+        """Убирает из таблицы символов модули удалённых файлов (инкрементальный режим)"""
+        if self.symbols is None:
+            return
+        for file in files:
+            key = module_key(file)
+            if key is not None:
+                self.symbols.drop_module(key)
+
+    def record_file(self, graph: GraphProto, file: FileInfo, source: str) -> FileFacts:
+        """Как analyze_file, но дополнительно записывает все изменения графа в FileFacts"""
+        facts = FileFacts()
+        graphs = [analyzer.graph for analyzer in self.analyzers]
+        try:
+            for slot, analyzer in enumerate(self.analyzers):
+                analyzer.graph = FactRecorder(analyzer.graph, facts, slot)
+            self.analyze_file(FactRecorder(graph, facts), file, source)
+        finally:
+            for analyzer, own_graph in zip(self.analyzers, graphs):
+                analyzer.graph = own_graph
+        key = module_key(file)
+        if self.symbols is not None and key is not None:
+            facts.extras["symbols"] = (key, self.symbols.export_module(key))
+        for slot, analyzer in enumerate(self.analyzers):
+            data = analyzer.file_extras()
+            if data is not None:
+                facts.extras[slot] = data
+        return facts
+
+    def replay(self, graph: GraphProto, facts: FileFacts) -> None:
+        """Восстанавливает факты файла в графах без ast.parse"""
+        graphs = {slot: analyzer.graph for slot, analyzer in enumerate(self.analyzers)}
+        graphs[PIPELINE_SLOT] = graph
+        replay_facts(facts, graphs)
+        if self.symbols is not None and "symbols" in facts.extras:
+            self.symbols.merge_module(*facts.extras["symbols"])
+        for slot, analyzer in enumerate(self.analyzers):
+            if slot in facts.extras:
+                analyzer.restore_extras(facts.extras[slot])
 
     def run(self, tree: ast.AST, module:ModuleInfo, codespan: FactoryCodeSpan ):
         for analyzer in self.analyzers:
-            analyzer.analyze(tree,module,codespan)
+            analyzer.prepare(module,codespan)
+        try:
+            self.dispatcher.dispatch(tree)
+        finally:
+            # дерево и исходник файла больше ни на что не ссылаются
+            for analyzer in self.analyzers:
+                analyzer.release()
 
 
 
    
+# ------ состояние воркера пула процессов ------
+_worker_state: Optional[tuple[ASTAnalyzerPipeline, GraphProto]] = None
 
 
+def _init_worker(pipeline: ASTAnalyzerPipeline, graph: GraphProto) -> None:
+    global _worker_state
+    pipeline.cache = None
+    _worker_state = (pipeline, graph)
+
+
+def _record_in_worker(file: FileInfo, full_path: Path) -> FileFacts:
+    """Читает и разбирает файл в воркере, возвращая компактные picklable факты"""
+    if _worker_state is None:
+        raise RuntimeError("воркер пула не инициализирован (_init_worker)")
+    pipeline, graph = _worker_state
+    return pipeline.record_file(graph, file, pipeline._read(full_path))
+
+
+
+
+# Место импорта: (модуль из from или None для import, ((имя, ключ цели в таблице символов), ...), позиция)
+ImportSite = tuple[Optional[str], tuple[tuple[str, Optional[str]], ...], Optional[CodeSpan]]
 
 
 class ImportAnalyzer(AnalyzerBase):
-    def __init__(self, graph, root: Path):
-        super().__init__(graph)  
-        self.find_class = FindNodeByImportLike(graph=graph,root=root)
+    """
+    Импорты модуля → рёбра IMPORTS/FROM.
+    При обходе записываются только места импорта (и псевдонимы в таблице символов);
+    узлы-цели ищутся в finalize, когда в графе и таблице символов есть все модули запуска.
+    """
+    version = "2"
+
+    def __init__(
+        self, 
+        graph, 
+        root: Path, 
+        index: Optional[ModuleIndex] = None, 
+        scope_resolver: Optional[ImportScopeResolver] = None,
+        symbols: Optional[SymbolTable] = None
+    ):
+        super().__init__(graph, symbols)  
+        index = index if index is not None else ModuleIndex(root)
+        self.index = index
+        self.find_class = FindNodeByImportLike(graph=graph,root=root,index=index)
         self.module_resolver = ModuleResolver(
-            FindNodeByImportLike(graph=graph, root=root),
+            FindNodeByImportLike(graph=graph, root=root, index=index),
             ModuleInfoFactoryByName(),
-            ModuleImportScopeClassifer(root),
+            ModuleImportScopeClassifer(root, index, scope_resolver),
             FileToModuleAdapter(),
         )
         self.class_resolver = ClassResolver(
@@ -219,43 +432,119 @@ class ImportAnalyzer(AnalyzerBase):
             ClassInfoFactoryByName(),
             None,  # классификатор не нужен
         )
-        
+        # места импорта текущего файла и всех файлов запуска (модуль, места) — в порядке файлов
+        self._sites: list[ImportSite] = []
+        self.imports: list[tuple[ModuleInfo, list[ImportSite]]] = []
+
+    # ------ ключи таблицы символов ------
+    def _project_key(self, dotted: str) -> Optional[str]:
+        """Ключ модуля проекта по имени импорта (None — модуль не из проекта)"""
+        path = self.index.get(dotted)
+        if path is None:
+            return None
+        rel = path.relative_to(self.index.root)
+        if not rel.suffix:
+            return ".".join(rel.parts)
+        return module_key(FileInfo(name=rel.stem, format=rel.suffix, path=rel.parent))
+
+    def _from_key(self, node: ast.ImportFrom) -> Optional[str]:
+        if not node.level:
+            return self._project_key(node.module or "")
+        # относительный импорт: от пакета текущего модуля
+        parts = self.module_key.split(".") if self.module_key else []
+        file = self.module.file if self.module is not None else None
+        is_package = file is not None and file.name == "__init__"
+        package = parts if is_package else parts[:-1]
+        if node.level - 1 > len(package):
+            return None
+        package = package[:len(package) - (node.level - 1)]
+        return ".".join(package + (node.module.split(".") if node.module else [])) or None
+
+    def prepare(self, module: ModuleInfo, factory_codespan: FactoryCodeSpan) -> None:
+        super().prepare(module, factory_codespan)
+        self._sites = []
+        self.imports.append((module, self._sites))
 
     def visit_Import(self, node: ast.Import):
-        for alias in node.names:
-            imported = self.module_resolver.resolve(alias.name)
-            if not imported.span:
-                imported.span = self._get_codespan(node)
-            self.graph.add_node(imported)
-            self.graph.add_edge(self.module, imported, data=Relation.IMPORTS)
+        self._sites.append((None, tuple((alias.name, None) for alias in node.names), self._get_codespan(node)))
+        if self.symbols is not None and self.module_key is not None:
+            for alias in node.names:
+                local = alias.asname or alias.name.partition(".")[0]
+                target = self._project_key(alias.name if alias.asname else local)
+                if target:
+                    self.symbols.alias(self.module_key, local, target)
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
         base_name = node.module or ""
-        base_module = self.module_resolver.resolve(base_name)
-
+        symbols, module = self.symbols, self.module_key
+        base_key = self._from_key(node) if symbols is not None else None
+        names = []
         for alias in node.names:
             full_name = f"{base_name}.{alias.name}" if base_name else alias.name
-            
+            target = None
+            if base_key and symbols is not None and module is not None:
+                target = self._project_key(full_name) if not node.level else None
+                target = target or f"{base_key}.{alias.name}"
+                symbols.alias(module, alias.asname or alias.name, target)
+            names.append((alias.name, target))
+        self._sites.append((base_name, tuple(names), self._get_codespan(node)))
+
+    def file_extras(self) -> Any:
+        return (self.module, self._sites)
+
+    def restore_extras(self, data: Any) -> None:
+        self.imports.append(data)
+
+    # ------ разрешение ------
+    def _link_import(self, name: str, span: Optional[CodeSpan]) -> None:
+        imported = self.module_resolver.resolve(name)
+        if not imported.span:
+            imported.span = span
+        self.graph.add_node(imported)
+        self.graph.add_edge(self.module, imported, data=Relation.IMPORTS)
+
+    def _link_from(self, base_name: str, names: tuple[tuple[str, Optional[str]], ...], span: Optional[CodeSpan]) -> None:
+        base_module = self.module_resolver.resolve(base_name)
+        for name, target in names:
+            full_name = f"{base_name}.{name}" if base_name else name
             # Проверяем, есть ли модуль с таким путём
             imported = self.find_class(full_name)
-            if imported and isinstance(imported, FileInfo):
-                imported:ModuleInfo = self.module_resolver.resolve(full_name)
+            known = self.symbols.get(target) if target and self.symbols is not None else None
+            if known is not None:
+                imported = known
+            elif imported and isinstance(imported, FileInfo):
+                imported = self.module_resolver.resolve(full_name)
             else:
-                imported:ClassInfo = self.class_resolver.resolve(alias.name, module=base_module)
+                imported = self.class_resolver.resolve(name, module=base_module)
             if not imported.scope:
-                imported.scope = self._get_codespan(node)
+                imported.scope = span
             self.graph.add_node(imported)
             self.graph.add_edge(self.module, imported, data=Relation.IMPORTS)
 
             if base_module and base_module is not imported:
                 self.graph.add_edge(imported, base_module, data=Relation.FROM)
 
+    def finalize(self) -> None:
+        """Рёбра импортов строятся после всех файлов запуска, в порядке файлов: цель зависит от других модулей"""
+        imports, self.imports = self.imports, []
+        for module, sites in imports:
+            self.module = module
+            for base_name, names, span in sites:
+                if base_name is None:
+                    for name, _ in names:
+                        self._link_import(name, span)
+                else:
+                    self._link_from(base_name, names, span)
+        self.module = None
+
 
 
 
 class StructureAnalyzer(AnalyzerBase):
-    def __init__(self, graph):
-        super().__init__(graph)
+    version = "4"
+
+    def __init__(self, graph, symbols: Optional[SymbolTable] = None):
+        super().__init__(graph, symbols)
 
         self.class_resolver = ClassResolver(
             FindNodeByName(graph),
@@ -263,6 +552,28 @@ class StructureAnalyzer(AnalyzerBase):
             None,  # классификатор не нужен
         )
         self.attribute_factory = AttributeFactory()
+        # id() методов → класс-владелец: вложенный класс не перетирает методы внешнего
+        self._method_owners: dict[int, ClassInfo] = {}
+        # открытые методы (владелец, первая, последняя строка): дерево обходится плоско, без возврата из visit_*
+        self._methods: list[tuple[ClassInfo, int, int]] = []
+        # базовые классы текущего файла и всех файлов запуска: (ключ модуля, модуль, [(класс, ((база, это Name), ...))])
+        self._bases: list[tuple[ClassInfo, tuple[tuple[str, bool], ...]]] = []
+        self.bases: list[tuple[Optional[str], ModuleInfo, list[tuple[ClassInfo, tuple[tuple[str, bool], ...]]]]] = []
+
+    def prepare(self, module: ModuleInfo, factory_codespan: FactoryCodeSpan) -> None:
+        super().prepare(module, factory_codespan)
+        # id() узлов прошлого дерева могут совпасть с узлами нового
+        self._reset()
+        self._bases = []
+        self.bases.append((self.module_key, module, self._bases))
+
+    def release(self) -> None:
+        super().release()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._method_owners = {}
+        self._methods = []
 
 
     def visit_ClassDef(self, node: ast.ClassDef):
@@ -278,10 +589,13 @@ class StructureAnalyzer(AnalyzerBase):
         )
         self.current_class = classifier(bases, self.current_class)
         self.graph.add_edge(self.module, self.current_class, data=Relation.DEFINES)
+        if node.col_offset == 0:
+            self._define(node.name, self.current_class)
         
-        for base in bases:
-            base_class = self.class_resolver.resolve(base,self.module)
-            self.graph.add_edge(self.current_class, base_class,  data=Relation.INHERIT)
+        # базовые классы могут быть в других модулях — рёбра INHERIT строятся в finalize
+        named = tuple((ast.unparse(b), isinstance(b, ast.Name)) for b in node.bases if isinstance(b, (ast.Name, ast.Attribute)))
+        if named:
+            self._bases.append((self.current_class, named))
         
         
                 # --- поля внутри класса ---
@@ -298,6 +612,7 @@ class StructureAnalyzer(AnalyzerBase):
                             scope=self.module.scope
                             )
                         self.graph.add_edge(self.current_class, attribute,  data=Relation.ATTRIBUTE)
+                        self._define(f"{node.name}.{target.id}", attribute)
 
             # 2️⃣ аннотированные поля
             elif isinstance(stmt, ast.AnnAssign):
@@ -309,36 +624,80 @@ class StructureAnalyzer(AnalyzerBase):
                     
                     attribute = AttributeInfo(
                         name=stmt.target.id,
-                        value=stmt.value,
+                        # строка, а не узел ast: дерево файла не должно жить дольше его разбора
+                        value=ast.unparse(stmt.value) if stmt.value else None,
                         annotation=annotation,
                         level="class",
                         scope=self.module.scope
                         )
                     self.graph.add_edge(self.current_class, attribute,  data=Relation.ATTRIBUTE)
+                    self._define(f"{node.name}.{stmt.target.id}", attribute)
 
-        # --- ищем instance-поля в методах ---
+        # --- instance-поля ищутся в visit_Assign внутри методов класса ---
         for stmt in node.body:
             if isinstance(stmt, ast.FunctionDef):
-                for sub in ast.walk(stmt):
-                    if (
-                        isinstance(sub, ast.Assign)
-                        and isinstance(sub.targets[0], ast.Attribute)
-                        and isinstance(sub.targets[0].value, ast.Name)
-                        and sub.targets[0].value.id == "self"
-                    ):
-                        attr_name = sub.targets[0].attr
-                        
-                        attribute = AttributeInfo(
-                            name=attr_name,value= ast.unparse(sub.value),
-                            annotation="None",
-                            level="instance",
-                            scope=self.module.scope
-                            )
-                        self.graph.add_edge(self.current_class, attribute,  data=Relation.ATTRIBUTE)
-        
+                self._method_owners[id(stmt)] = self.current_class
         
+        self.generic_visit(node)
         
+    def _method_at(self, lineno: int) -> Optional[ClassInfo]:
+        """Класс метода, в строках которого лежит lineno; закончившиеся методы снимаются со стека"""
+        while self._methods and self._methods[-1][2] < lineno:
+            self._methods.pop()
+        if self._methods and self._methods[-1][1] <= lineno:
+            return self._methods[-1][0]
+        return None
+
+    def visit_Assign(self, node: ast.Assign):
+        owner = self._method_at(node.lineno)
+        if (
+            owner is not None
+            and isinstance(node.targets[0], ast.Attribute)
+            and isinstance(node.targets[0].value, ast.Name)
+            and node.targets[0].value.id == "self"
+        ):
+            attribute = AttributeInfo(
+                name=node.targets[0].attr,value= ast.unparse(node.value),
+                annotation="None",
+                level="instance",
+                scope=self.module.scope
+                )
+            self.graph.add_edge(owner, attribute,  data=Relation.ATTRIBUTE)
+            self._define(f"{owner.name}.{attribute.name}", attribute)
         self.generic_visit(node)
+
+    # ------ таблица символов ------
+    def _define(self, qualname: str, obj: Any) -> None:
+        if self.symbols is not None and self.module_key is not None:
+            self.symbols.define(self.module_key, qualname, obj)
+
+    def _resolve_base(self, module: str | None, text: str, is_name: bool) -> Optional[ClassInfo]:
+        """Базовый класс: по таблице символов (с учётом модуля), иначе — по имени, как раньше"""
+        if self.symbols is not None and module is not None:
+            known = self.symbols.lookup(module, text)
+            if isinstance(known, ClassInfo):
+                return known
+        if is_name:
+            return self.class_resolver.resolve(text, self.module)
+        return None
+
+    def file_extras(self) -> Any:
+        return (self.module_key, self.module, self._bases)
+
+    def restore_extras(self, data: Any) -> None:
+        self.bases.append(data)
+
+    def finalize(self) -> None:
+        """Рёбра INHERIT всех файлов запуска, когда известны все модули (в порядке файлов)"""
+        bases, self.bases = self.bases, []
+        for key, module, classes in bases:
+            self.module = module
+            for cls, named in classes:
+                for text, is_name in named:
+                    base_class = self._resolve_base(key, text, is_name)
+                    if base_class is not None:
+                        self.graph.add_edge(cls, base_class, data=Relation.INHERIT)
+        self.module = None
         
         
     def visit_FunctionDef(self, node: ast.FunctionDef):
@@ -374,7 +733,17 @@ class StructureAnalyzer(AnalyzerBase):
             args_types=args_types
             )
         self.graph.add_node(fi)
-        if self.current_class:
+        owner = self._method_owners.pop(id(node), None)
+        if owner is not None:
+            self._method_at(node.lineno)
+            self._methods.append((owner, node.lineno, node.end_lineno or node.lineno))
+            self._define(f"{owner.name}.{node.name}", fi)
+        elif node.col_offset == 0:
+            # вложенные функции не видны на уровне модуля
+            self._define(node.name, fi)
+        if owner is not None:
+            self.graph.add_edge(owner, fi, data=Relation.METHODS)
+        elif self.current_class:
             self.graph.add_edge(self.current_class, fi, data=Relation.METHODS)
         else:
             self.graph.add_edge(self.module, fi, data=Relation.METHODS)
@@ -415,14 +784,145 @@ class ReferenceAnalyzer(AnalyzerBase):
 
 
 
+# Место вызова: (имена вызывающей функции, цепочка имён вызываемого, имя класса для self/cls)
+CallSite = tuple[tuple[str, ...], tuple[str, ...], Optional[str]]
+
+
 class CallAnalyzer(AnalyzerBase):
-    """Анализ вызовов функций и методов (Call)."""
+    """
+    Анализ вызовов функций и методов (Call) → рёбра CALLINGS между FunctionInfo.
+    При обходе собираются компактные места вызова (кортежи имён, без ast.unparse),
+    разрешаются они в finalize по таблице символов — когда известны все модули.
+    Вложенность (класс/функция) отслеживается по позициям узлов: диспетчер не сообщает о выходе из узла.
+    """
+    version = "2"
+
+    def __init__(self, graph: GraphProto, symbols: Optional[SymbolTable] = None):
+        super().__init__(graph, symbols)
+        self.sites: dict[str, list[CallSite]] = {}
+        self._sites: list[CallSite] = []
+        # (конец строки, конец колонки, имя, это класс, начало)
+        self._stack: list[tuple[int, int, str, bool, tuple[int, int]]] = []
+
+    def prepare(self, module: ModuleInfo, factory_codespan: FactoryCodeSpan) -> None:
+        super().prepare(module, factory_codespan)
+        self._stack = []
+        self._sites = []
+        if self.module_key is not None:
+            self.sites[self.module_key] = self._sites
+
+    # ------ сбор мест вызова ------
+    def _enter(self, node: ast.stmt | ast.expr) -> None:
+        """Снимает со стека закончившиеся области (по позиции node)"""
+        start = (node.lineno, node.col_offset)
+        while self._stack and self._stack[-1][:2] <= start:
+            self._stack.pop()
+
+    def _push(self, node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef, is_class: bool) -> None:
+        if self.symbols is None:
+            return
+        self._enter(node)
+        self._stack.append((node.end_lineno or node.lineno, node.end_col_offset or 0, node.name, is_class, (node.lineno, node.col_offset)))
 
-    def visit_Call(self, node: ast.Call):
-        
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._push(node, True)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        self._push(node, False)
+        self.generic_visit(node)
 
+    visit_AsyncFunctionDef = visit_FunctionDef
 
+    @staticmethod
+    def _callee_parts(func: ast.expr) -> Optional[tuple[str, ...]]:
+        parts = []
+        while isinstance(func, ast.Attribute):
+            parts.append(func.attr)
+            func = func.value
+        if not isinstance(func, ast.Name):
+            return None
+        parts.append(func.id)
+        return tuple(reversed(parts))
+
+    def visit_Call(self, node: ast.Call):
+        if self.symbols is not None:
+            self._enter(node)
+            parts = self._callee_parts(node.func)
+            # вызовы в декораторах стоят выше строки def и к функции не относятся
+            if parts and self._stack and not self._stack[-1][3] and self._stack[-1][4] <= (node.lineno, node.col_offset):
+                caller = tuple(entry[2] for entry in self._stack)
+                owner = next((entry[2] for entry in reversed(self._stack) if entry[3]), None)
+                self._sites.append((caller, parts, owner))
         self.generic_visit(node)
+
+    def file_extras(self) -> Any:
+        if self.module_key is None:
+            return None
+        return (self.module_key, self._sites)
+
+    def restore_extras(self, data: Any) -> None:
+        module, sites = data
+        self.sites[module] = sites
+
+    # ------ разрешение ------
+    def _caller(self, symbols: SymbolTable, module: str, names: tuple[str, ...]) -> Optional[FunctionInfo]:
+        """Ближайшая зарегистрированная функция: 'Class.method', 'func' (вложенные — к внешней)"""
+        for depth in range(len(names), 0, -1):
+            found = symbols.get(f"{module}.{'.'.join(names[:depth])}")
+            if isinstance(found, FunctionInfo):
+                return found
+        return None
+
+    def _method(self, symbols: SymbolTable, class_key: str, name: str, depth: int = 0) -> Optional[FunctionInfo]:
+        """Метод класса или (по рёбрам INHERIT) его предков"""
+        found = symbols.get(f"{class_key}.{name}")
+        if isinstance(found, FunctionInfo):
+            return found
+        cls = symbols.get(class_key)
+        # рёбра INHERIT видны только в графах с out_edges (IndexedGraphProto)
+        out_edges = getattr(self.graph, "out_edges", None)
+        has_node = getattr(self.graph, "has_node", None)
+        if depth > 8 or not isinstance(cls, ClassInfo) or out_edges is None or has_node is None or not has_node(cls):
+            return None
+        for _, base, data in out_edges(cls):
+            if data == Relation.INHERIT and isinstance(base, ClassInfo) and base.module is not None:
+                found = self._method(symbols, f"{module_key(base.module)}.{base.name}", name, depth + 1)
+                if found is not None:
+                    return found
+        return None
+
+    def _callee(self, symbols: SymbolTable, module: str, parts: tuple[str, ...], owner: Optional[str]) -> Optional[FunctionInfo]:
+        if parts[0] in ("self", "cls") and owner is not None:
+            return self._method(symbols, f"{module}.{owner}", parts[1]) if len(parts) == 2 else None
+        key = symbols.qualify(module, ".".join(parts))
+        if key is None:
+            return None
+        found = symbols.get(key)
+        if isinstance(found, FunctionInfo):
+            return found
+        if isinstance(found, ClassInfo):
+            # создание экземпляра — вызов __init__
+            return self._method(symbols, key, "__init__")
+        return None
+
+    def finalize(self) -> None:
+        sites_by_module, self.sites = self.sites, {}
+        symbols = self.symbols
+        if symbols is None:
+            return
+        for module, sites in sites_by_module.items():
+            resolved: dict[tuple, Optional[FunctionInfo]] = {}
+            for caller_names, parts, owner in sites:
+                caller = self._caller(symbols, module, caller_names)
+                if caller is None:
+                    continue
+                site = (parts, owner)
+                if site not in resolved:
+                    resolved[site] = self._callee(symbols, module, parts, owner)
+                callee = resolved[site]
+                if callee is not None:
+                    self.graph.add_edge(caller, callee, data=Relation.CALLINGS)
         
         
         
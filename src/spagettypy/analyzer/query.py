@@ -0,0 +1,124 @@
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Any, Iterator, Optional
+
+from .graph import IndexedGraphProto
+from .model import ClassInfo, FunctionInfo, ImportScope, ModuleInfo, Relation
+from .parsers.base import module_key
+from .parsers.module_index import strip_src_root
+
+
+def qualified_name(node: Any) -> str:
+    """Имя для вывода: 'pkg.mod' для модуля, 'pkg.mod.Class' для класса/функции"""
+    if isinstance(node, ModuleInfo):
+        return module_key(node) or node.name
+    module = getattr(node, "module", None)
+    if isinstance(module, ModuleInfo):
+        return f"{module_key(module) or module.name}.{node.name}"
+    return getattr(node, "name", str(node))
+
+
+class GraphQuery:
+    """
+    Запросы к готовому графу без повторного анализа.
+    Соседи берутся из индексов смежности графа (out_edges/in_edges), узлы — из индекса имён;
+    сам GraphQuery один раз строит отсортированный индекс полных имён модулей ('pkg.sub.mod'),
+    по которому выборка пакета — бинарный поиск по префиксу.
+    """
+    def __init__(self, graph: IndexedGraphProto) -> None:
+        self.graph = graph
+        keys: list[tuple[str, int]] = []
+        self._modules: list[ModuleInfo] = []
+        for module in graph.nodes_of_type(ModuleInfo):
+            i = len(self._modules)
+            self._modules.append(module)
+            key = module_key(module) or module.name
+            keys.append((key, i))
+            # src-раскладка: 'src.pkg.mod' ищется и как 'pkg.mod'
+            derived = strip_src_root(tuple(key.split(".")))
+            if derived:
+                keys.append((".".join(derived), i))
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._key_modules = [i for _, i in keys]
+
+    # ------ поиск узлов ------
+    def _prefixed(self, prefix: str) -> Iterator[int]:
+        """Номера модулей, чьё полное имя равно prefix или начинается с 'prefix.'"""
+        start = bisect_left(self._keys, prefix)
+        for pos in range(start, len(self._keys)):
+            key = self._keys[pos]
+            if not key.startswith(prefix):
+                break
+            if len(key) == len(prefix) or key[len(prefix)] == ".":
+                yield self._key_modules[pos]
+
+    def find(self, name: str) -> list[Any]:
+        """Узлы с таким именем или модули с таким полным именем"""
+        found = dict.fromkeys(self.graph.nodes_by_name(name))
+        start = bisect_left(self._keys, name)
+        while start < len(self._keys) and self._keys[start] == name:
+            found.setdefault(self._modules[self._key_modules[start]])
+            start += 1
+        return list(found)
+
+    def _sources(self, node: Any, relation: Relation) -> Iterator[Any]:
+        return (u for u, _, data in self.graph.in_edges(node) if data == relation)
+
+    def _targets(self, node: Any, relation: Relation) -> Iterator[Any]:
+        return (v for _, v, data in self.graph.out_edges(node) if data == relation)
+
+    # ------ запросы ------
+    def importers(self, name: str) -> list[ModuleInfo]:
+        """Модули, которые импортируют name (import name и from name import ...)"""
+        result: dict[Any, None] = {}
+        for target in self.find(name):
+            result.update(dict.fromkeys(self._sources(target, Relation.IMPORTS)))
+            # from name import x: ребро модуль → x, а x → name связаны FROM
+            for imported in self._sources(target, Relation.FROM):
+                result.update(dict.fromkeys(self._sources(imported, Relation.IMPORTS)))
+        return [m for m in result if isinstance(m, ModuleInfo)]
+
+    def imports(self, name: str) -> list[Any]:
+        """Что импортирует модуль name"""
+        result: dict[Any, None] = {}
+        for module in self.find(name):
+            if isinstance(module, ModuleInfo):
+                result.update(dict.fromkeys(self._targets(module, Relation.IMPORTS)))
+        return list(result)
+
+    def subclasses(self, name: str, recursive: bool = False) -> list[ClassInfo]:
+        """Прямые (или все, recursive=True) наследники класса name"""
+        result: dict[Any, None] = {}
+        queue = [c for c in self.find(name) if isinstance(c, ClassInfo)]
+        while queue:
+            for child in self._sources(queue.pop(), Relation.INHERIT):
+                if child not in result:
+                    result[child] = None
+                    if recursive:
+                        queue.append(child)
+        return list(result)
+
+    def bases(self, name: str) -> list[ClassInfo]:
+        """Базовые классы класса name"""
+        result: dict[Any, None] = {}
+        for cls in self.find(name):
+            if isinstance(cls, ClassInfo):
+                result.update(dict.fromkeys(self._targets(cls, Relation.INHERIT)))
+        return list(result)
+
+    def methods(self, name: str) -> list[FunctionInfo]:
+        """Методы класса name"""
+        result: dict[Any, None] = {}
+        for cls in self.find(name):
+            if isinstance(cls, ClassInfo):
+                result.update(dict.fromkeys(self._targets(cls, Relation.METHODS)))
+        return [f for f in result if isinstance(f, FunctionInfo)]
+
+    def modules(self, package: str = "", scope: Optional[ImportScope] = None) -> list[ModuleInfo]:
+        """Модули пакета package (пустая строка — все), при необходимости только с данным scope"""
+        ids = range(len(self._modules)) if not package else sorted(set(self._prefixed(package)))
+        return [
+            self._modules[i] for i in ids
+            if scope is None or self._modules[i].scope == scope
+        ]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from pathlib import PurePath, Path
+from typing import Any
+
+from .model import (
+    AttributeInfo,
+    AttributionType,
+    BaseData,
+    ClassInfo,
+    ClassType,
+    CodeSpan,
+    DirectoryNode,
+    FileInfo,
+    FunctionInfo,
+    FunctionType,
+    ImportScope,
+    ModuleInfo,
+    ModuleType,
+    Relation,
+)
+
+# Версия схемы записей узлов/рёбер (JSON, NDJSON, SQLite, снимки)
+SCHEMA_VERSION = 1
+
+MODEL_TYPES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (FileInfo, DirectoryNode, ModuleInfo, ClassInfo, FunctionInfo, AttributeInfo)
+}
+
+# поля-перечисления: при чтении строка превращается обратно в StrEnum
+_ENUM_FIELDS: dict[str, type] = {
+    "scope": ImportScope,
+}
+_TYPE_ENUMS: dict[type, type] = {
+    ModuleInfo: ModuleType,
+    ClassInfo: ClassType,
+    FunctionInfo: FunctionType,
+    AttributeInfo: AttributionType,
+}
+
+
+# имена полей по классу: fields() на каждый узел заметно дороже
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {cls: tuple(f.name for f in fields(cls)) for cls in MODEL_TYPES.values()}
+
+
+def _path(value: Any) -> str:
+    return PurePath(value).as_posix()
+
+
+def node_key(node: Any) -> str:
+    """Ключ узла внутри его типа — так же, как граф различает узлы"""
+    if isinstance(node, FileInfo):
+        return _path(PurePath(node.path) / f"{node.name}{node.format}")
+    if isinstance(node, DirectoryNode):
+        return _path(node.path)
+    if isinstance(node, BaseData):
+        return node.name
+    return str(node)
+
+
+def node_id(node: Any) -> str:
+    """Стабильный id узла: 'Тип:ключ' ('ClassInfo:Service', 'FileInfo:pkg/mod.py')"""
+    return f"{type(node).__name__}:{node_key(node)}"
+
+
+def _value(value: Any) -> Any:
+    """Поле узла → JSON-совместимое значение (вложенные узлы — по id)"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, str):
+        return value
+    if isinstance(value, PurePath):
+        return _path(value)
+    if isinstance(value, CodeSpan):
+        return [value.start_line, value.end_line, value.start_col, value.end_col]
+    if isinstance(value, (FileInfo, DirectoryNode, BaseData)):
+        return node_id(value)
+    if isinstance(value, (list, tuple)):
+        return [_value(v) for v in value]
+    return str(value)
+
+
+def encode_node(node: Any) -> dict[str, Any]:
+    # "class", а не "type": у ModuleInfo/ClassInfo/... есть своё поле type
+    record: dict[str, Any] = {"id": node_id(node), "class": type(node).__name__}
+    if is_dataclass(node):
+        for f in fields(node):
+            record[f.name] = _value(getattr(node, f.name))
+    else:
+        record["name"] = str(node)
+    return record
+
+
+def encode_edge(source: Any, target: Any, data: Any) -> dict[str, Any]:
+    return {"source": node_id(source), "target": node_id(target), "relation": _value(data)}
+
+
+def _node_name(node_ref: str) -> str:
+    return node_ref.partition(":")[2]
+
+
+def decode_node(record: dict[str, Any]) -> Any:
+    """Запись → узел модели; вложенные ссылки (module, file) восстанавливаются по id"""
+    cls = MODEL_TYPES.get(record["class"])
+    if cls is None:
+        return record.get("name", _node_name(record["id"]))
+    values = {}
+    for name in _FIELD_NAMES[cls]:
+        if name not in record:
+            continue
+        value = record[name]
+        if value is None:
+            pass
+        elif name == "path":
+            value = Path(value)
+        elif name == "span":
+            value = CodeSpan(*value)
+        elif name == "module":
+            value = ModuleInfo(name=_node_name(value))
+        elif name == "file":
+            file = PurePath(_node_name(value))
+            value = FileInfo(name=file.stem, format=file.suffix, path=Path(file.parent))
+        elif name == "type" and cls in _TYPE_ENUMS:
+            value = _TYPE_ENUMS[cls](value)
+        elif name in _ENUM_FIELDS:
+            value = _ENUM_FIELDS[name](value)
+        values[name] = value
+    return cls(**values)
+
+
+def decode_relation(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return Relation(value)
+        except ValueError:
+            return value
+    return value
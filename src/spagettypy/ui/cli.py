@@ -1,13 +1,24 @@
-from ..analyzer.parsers.directory_parser import DirectoryParser,FormatFileChecker,GitignoreFileChecker,ExcludeFileChecher
+from ..analyzer.parsers.directory_parser import DirectoryParser,FormatFileChecker,GitFinder,GitIndexWalker,ThreadedScandirWalker
+from ..analyzer.parsers.ignore_engine import IgnoreEngine, IgnoreFileChecker
+from ..analyzer.parsers.interfaces import DirectoryWalkerProto, FileChecherProto
+from functools import partial
+import pygit2
 import typer
 from pathlib import Path
-from ..analyzer.graph import GraphX
-from .commands import have
+from typing import Callable, Optional
+from ..analyzer.graph import FrozenGraph, GraphProto, GraphX, SQLiteGraph
+from ..analyzer.graph.sqlite_graph import is_sqlite
+from ..analyzer.graph.storage import load_graph
+from ..analyzer.parsers.incremental import GitChangeFinder, GraphPatcher
+from .commands import have, query, snapshot, watch
 
 
 app = typer.Typer(help=f"SpagettyPy — Python AST → UML visualizer")
 app.add_typer(have.app, name="have", help="Работа с UML")
 app.add_typer(have.app, name="get")
+app.command("watch")(watch.watch)
+app.add_typer(snapshot.app, name="snapshot", help="Бинарные снимки графа")
+app.add_typer(query.app, name="query", help="Запросы к графу (удобно с --graph)")
 
 @app.callback()
 def main(
@@ -15,20 +26,70 @@ def main(
     exclude: list[str] = typer.Option([], "--exclude", "-e"),
     gitignore: bool = typer.Option(False, "--gitignore"),
     only_python: bool = typer.Option(False, "--only_python"),
-    path: Path = typer.Option(".","--path", help="Путь к проекту")
+    path: Path = typer.Option(".","--path", help="Путь к проекту"),
+    cache_dir: Optional[Path] = typer.Option(None, "--cache-dir", help="Каталог кэша анализа файлов"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Число процессов для разбора файлов"),
+    low_memory: bool = typer.Option(False, "--low-memory", help="Не держать исходники файлов в памяти (CodeSpan без текста)"),
+    walk_threads: int = typer.Option(0, "--walk-threads", help="Потоки для чтения каталогов (медленные ФС: NFS, overlay)"),
+    graph_file: Optional[Path] = typer.Option(None, "--graph", help="Сохранённый граф или снимок вместо обхода проекта"),
+    since: Optional[str] = typer.Option(None, "--since", help="Коммит, с которого переанализировать изменённые файлы"),
+    symbols: Optional[Path] = typer.Option(None, "--symbols", help="Файл таблицы символов (JSON): читается и обновляется"),
+    sqlite: Optional[Path] = typer.Option(None, "--sqlite", help="Строить граф в файле SQLite (перезаписывается), а не в памяти")
 ):  
     base_path = path.resolve()
-    checkers = []
-    if gitignore:
-        checkers.append(GitignoreFileChecker(base_path))
-    if exclude:
-        checkers.append(ExcludeFileChecher(excludes=exclude))
+    checkers: list[FileChecherProto] = []
+    walker: Optional[DirectoryWalkerProto] = None
+    if gitignore or exclude:
+        # .gitignore (с вложенными), .git/info/exclude и --exclude — один общий матчер
+        git_dir = GitFinder()(str(base_path)) if gitignore else None
+        engine = IgnoreEngine(base_path, git_dir=git_dir, excludes=exclude, gitignore=gitignore, info_exclude=gitignore)
+        checkers.append(IgnoreFileChecker(engine))
+        if git_dir:
+            # файлы берутся из индекса git, а не обходом рабочей копии
+            walker = GitIndexWalker(git_dir)
+    if walker is None and walk_threads > 1:
+        walker = ThreadedScandirWalker(workers=walk_threads)
     if only_python:
         checkers.append(FormatFileChecker(".py"))
-    graph = GraphX()
-    dirparse = DirectoryParser(checkers=checkers, base_path=base_path)
-    ngraph = dirparse(graph=graph, context=base_path)
-    ctx.obj = {"root" : base_path, "graph": ngraph}
+    dirparse = DirectoryParser(checkers=checkers, base_path=base_path, walker=walker)
+    if sqlite:
+        if sqlite.exists() and not is_sqlite(sqlite):
+            raise typer.BadParameter(f"{sqlite} — не файл SQLite", param_hint="--sqlite")
+        for stale in (sqlite, sqlite.with_name(sqlite.name + "-wal"), sqlite.with_name(sqlite.name + "-shm")):
+            stale.unlink(missing_ok=True)
+        new_graph: Callable[[], GraphProto] = partial(SQLiteGraph, sqlite)
+    else:
+        new_graph = GraphX
+    if since and not graph_file:
+        raise typer.BadParameter("нужен сохранённый граф (--graph), который обновляется с этого коммита", param_hint="--since")
+    # pending: файлы для анализа (None — все файлы графа)
+    pending = None
+    removed = []
+    if graph_file:
+        ngraph = load_graph(graph_file)
+        pending = []
+        if since:
+            if isinstance(ngraph, FrozenGraph):
+                # снимок загружается неизменяемым
+                ngraph = ngraph.thaw()
+            if not isinstance(ngraph, (GraphX, SQLiteGraph)):
+                raise typer.BadParameter(f"{graph_file}: граф этого типа нельзя обновить", param_hint="--graph")
+            try:
+                changes = GitChangeFinder(base_path)(since)
+            except (KeyError, ValueError, pygit2.GitError) as exc:
+                raise typer.BadParameter(f"коммит {since!r} не найден: {exc}", param_hint="--since") from exc
+            patcher = GraphPatcher(ngraph, dirparse)
+            pending = patcher(changes)
+            removed = patcher.removed
+    elif ctx.invoked_subcommand == "snapshot":
+        # snapshot load обход не нужен, snapshot save строит граф сам
+        ngraph = None
+    else:
+        ngraph = dirparse(graph=new_graph(), context=base_path)
+    if isinstance(ngraph, SQLiteGraph):
+        # буфер записи вливается в файл при завершении команды
+        ctx.call_on_close(ngraph.close)
+    ctx.obj = {"root" : base_path, "graph": ngraph, "cache_dir": cache_dir, "jobs": jobs, "pending": pending, "removed": removed, "parser": dirparse, "symbols": symbols, "low_memory": low_memory, "new_graph": new_graph}
 
 
 
@@ -1,10 +1,17 @@
 import typer
 from pathlib import Path
 from ...analyzer.exporters.tree_exporter import DirectoryFormatter, TreeExporter,ShowSummary
-from ...analyzer.exporters.mermaid_exporter import MermaidExporter
-from ...analyzer.parsers.structure_analyzer import ASTAnalyzerPipeline,StructureAnalyzer, GlobalVisitor, ImportAnalyzer, CallAnalyzer
-from ...analyzer.model import ClassInfo, ModuleInfo,FunctionInfo
+from ...analyzer.exporters.mermaid_exporter import MermaidExporter, PartitionedMermaidExporter, PartitionBy
+from ...analyzer.exporters.json_exporter import JsonExporter, JsonFormat
+from ...analyzer.exporters.dot_exporter import DotExporter
+from ...analyzer.parsers.structure_analyzer import ASTAnalyzerPipeline,StructureAnalyzer, GlobalVisitor, ImportAnalyzer, CallAnalyzer, ImportScopeResolver
+from ...analyzer.parsers.cache import AnalysisCache
+from ...analyzer.parsers.module_index import ModuleIndex
+from ...analyzer.parsers.base import SymbolTable
+from ...analyzer.model import ClassInfo, ModuleInfo,FunctionInfo, FileInfo, DirectoryNode, AttributeInfo, Relation
+from ...analyzer.graph.storage import save_graph
 from enum import StrEnum
+from typing import List, Optional
 import typer
 
 class Mode(StrEnum):
@@ -12,36 +19,112 @@ class Mode(StrEnum):
     BLOCKS = "blocks"
 
 
+class NodeKind(StrEnum):
+    DIRECTORY = "directory"
+    FILE = "file"
+    MODULE = "module"
+    CLASS = "class"
+    FUNCTION = "function"
+    ATTRIBUTE = "attribute"
+
+
+NODE_KINDS: dict[NodeKind, type] = {
+    NodeKind.DIRECTORY: DirectoryNode,
+    NodeKind.FILE: FileInfo,
+    NodeKind.MODULE: ModuleInfo,
+    NodeKind.CLASS: ClassInfo,
+    NodeKind.FUNCTION: FunctionInfo,
+    NodeKind.ATTRIBUTE: AttributeInfo,
+}
+
+
 
 
 app = typer.Typer(help="Генерация UML")
 
 @app.command()
-def view(ctx: typer.Context, mode: Mode = typer.Option(Mode.COMPACT, help="Output display mode"))-> None:
+def view(
+    ctx: typer.Context, 
+    mode: Mode = typer.Option(Mode.COMPACT, help="Output display mode"),
+    save: Optional[Path] = typer.Option(None, "--save", help="Сохранить граф после анализа")
+)-> None:
     """Построить диаграмму"""
     cfg = ctx.obj
+    graph = cfg["graph"]
+    ast = build_pipeline(cfg, graph)
+    agraph = ast(graph, files=cfg.get("pending"))
+    if save:
+        save_graph(agraph, save)
+    if cfg.get("symbols") and ast.symbols is not None:
+        ast.symbols.save(cfg["symbols"])
+    typer.echo(render(agraph, mode))
+
+
+def build_pipeline(cfg: dict, graph) -> ASTAnalyzerPipeline:
+    """Пайплайн анализаторов по настройкам из ctx.obj"""
     base_path = cfg["root"]
+    cache = AnalysisCache(cfg["cache_dir"]) if cfg.get("cache_dir") else None
+    index = ModuleIndex(base_path)
+    scopes = ImportScopeResolver(base_path, index)
+    # таблица символов прошлого запуска нужна, когда анализируются не все файлы (--graph/--since)
+    symbols_path = cfg.get("symbols")
+    symbols = SymbolTable.load(symbols_path) if symbols_path and Path(symbols_path).exists() else SymbolTable()
+    return ASTAnalyzerPipeline(analyzers=[ImportAnalyzer(graph,base_path,index,scopes,symbols),StructureAnalyzer(graph=graph, symbols=symbols),GlobalVisitor(graph), CallAnalyzer(graph=graph, symbols=symbols)],root_path=base_path, cache=cache, jobs=cfg.get("jobs", 1), index=index, scope_resolver=scopes, symbols=symbols, low_memory=cfg.get("low_memory", False))
+
+
+def analyzed(cfg: dict):
+    """Граф из ctx.obj после анализа; сохранённый граф без изменений (--graph без --since) отдаётся как есть"""
     graph = cfg["graph"]
-    ast = ASTAnalyzerPipeline(analyzers=[ImportAnalyzer(graph,base_path),StructureAnalyzer(graph=graph),GlobalVisitor(graph), CallAnalyzer(graph=graph)],root_path=base_path)
-    agraph = ast(graph)
-    to_mermaid = MermaidExporter(only_classes=(ModuleInfo, FunctionInfo, ClassInfo))
-    
-    path = Path(base_path,"diagram.html")
+    if cfg.get("pending") == []:
+        return graph
+    pipeline = build_pipeline(cfg, graph)
+    pipeline.forget(cfg.get("removed", ()))
+    return pipeline(graph, files=cfg.get("pending"))
+
 
+def render(graph, mode: Mode) -> str:
     match mode:
         case Mode.BLOCKS:
             summaryzate = ShowSummary()
-            typer.echo(summaryzate(agraph))
-        case Mode.COMPACT:
-            typer.echo(agraph.show_summary())
+            return summaryzate(graph)
+        case _:
+            return graph.show_summary()
         
 
 export_app = typer.Typer(help="Экспорт UML-диаграмм в разные форматы")
 
 @export_app.command("to")
-def export_to(format: str = typer.Argument(..., help="Формат: mermaid / plantuml / dot / json")):
+def export_to(
+    ctx: typer.Context,
+    format: str = typer.Argument(..., help="Формат: mermaid / dot / json / ndjson"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Файл (по умолчанию — stdout)"),
+    compress: bool = typer.Option(False, "--gzip", help="Сжать вывод gzip (json/ndjson)"),
+    split: Optional[PartitionBy] = typer.Option(None, "--split", help="mermaid: по диаграмме на пакет или компоненту связности (-o — каталог)"),
+    max_nodes: int = typer.Option(300, "--max-nodes", help="mermaid --split: бюджет узлов на диаграмму"),
+    only: Optional[List[NodeKind]] = typer.Option(None, "--only", help="dot: только узлы этих типов (можно повторять)"),
+    relations: Optional[List[Relation]] = typer.Option(None, "--relation", help="dot: только рёбра этих связей (можно повторять)"),
+):
     """Экспортировать диаграмму в указанный формат"""
-    typer.echo(f"Экспортируем UML в формат: {format}")
+    agraph = analyzed(ctx.obj)
+    match format:
+        case "json" | "ndjson":
+            JsonExporter(JsonFormat(format), compress=compress)(agraph, output)
+        case "dot":
+            only_classes = [NODE_KINDS[kind] for kind in only] if only else None
+            DotExporter(only_classes=only_classes, relations=relations)(agraph, output)
+        case "mermaid" if split:
+            if output is None:
+                raise typer.BadParameter("--split требует каталог --output", param_hint="--output")
+            exporter = PartitionedMermaidExporter(by=split, max_nodes=max_nodes, only_classes=(ModuleInfo, FunctionInfo, ClassInfo))
+            typer.echo(exporter(agraph, output))
+        case "mermaid":
+            html = MermaidExporter(only_classes=(ModuleInfo, FunctionInfo, ClassInfo))(agraph)
+            if output:
+                output.write_text(html, encoding="utf-8")
+            else:
+                typer.echo(html)
+        case _:
+            raise typer.BadParameter(f"Неизвестный формат: {format}", param_hint="FORMAT")
 
 
 @app.command()
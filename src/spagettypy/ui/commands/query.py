@@ -0,0 +1,61 @@
+import typer
+from typing import Iterable, Optional
+from ...analyzer.model import ImportScope
+from ...analyzer.query import GraphQuery, qualified_name
+from .have import analyzed
+
+
+app = typer.Typer(help="Запросы к графу: с --graph отвечают без обхода и анализа проекта")
+
+
+def _query(ctx: typer.Context) -> GraphQuery:
+    return GraphQuery(analyzed(ctx.obj))
+
+
+def _echo(nodes: Iterable) -> None:
+    for node in nodes:
+        typer.echo(qualified_name(node))
+
+
+@app.command()
+def importers(ctx: typer.Context, name: str = typer.Argument(..., help="Модуль или импортируемое имя")) -> None:
+    """Кто импортирует NAME"""
+    _echo(_query(ctx).importers(name))
+
+
+@app.command()
+def imports(ctx: typer.Context, name: str = typer.Argument(..., help="Модуль")) -> None:
+    """Что импортирует модуль NAME"""
+    _echo(_query(ctx).imports(name))
+
+
+@app.command()
+def subclasses(
+    ctx: typer.Context,
+    name: str = typer.Argument(..., help="Класс"),
+    recursive: bool = typer.Option(False, "--all", help="Все наследники, а не только прямые"),
+) -> None:
+    """Наследники класса NAME"""
+    _echo(_query(ctx).subclasses(name, recursive=recursive))
+
+
+@app.command()
+def bases(ctx: typer.Context, name: str = typer.Argument(..., help="Класс")) -> None:
+    """Базовые классы NAME"""
+    _echo(_query(ctx).bases(name))
+
+
+@app.command()
+def methods(ctx: typer.Context, name: str = typer.Argument(..., help="Класс")) -> None:
+    """Методы класса NAME"""
+    _echo(_query(ctx).methods(name))
+
+
+@app.command()
+def modules(
+    ctx: typer.Context,
+    package: str = typer.Argument("", help="Пакет ('pkg.sub'); по умолчанию — все модули"),
+    scope: Optional[ImportScope] = typer.Option(None, "--scope", case_sensitive=False, help="Только модули с этим scope"),
+) -> None:
+    """Модули пакета PACKAGE"""
+    _echo(_query(ctx).modules(package, scope=scope))
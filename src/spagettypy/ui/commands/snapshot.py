@@ -0,0 +1,35 @@
+import time
+import typer
+from pathlib import Path
+from ...analyzer.graph.snapshot import load_snapshot, save_snapshot
+from .have import Mode, analyzed, render
+
+
+app = typer.Typer(help="Бинарные снимки графа")
+
+
+@app.command()
+def save(
+    ctx: typer.Context,
+    path: Path = typer.Argument(..., help="Файл снимка (.spg)"),
+) -> None:
+    """Проанализировать проект и сохранить граф в бинарный снимок"""
+    cfg = ctx.obj
+    if cfg["graph"] is None:
+        cfg["graph"] = cfg["parser"](graph=cfg["new_graph"](), context=cfg["root"])
+    graph = analyzed(cfg)
+    save_snapshot(graph, path)
+    typer.echo(f"Снимок сохранён: {path} ({path.stat().st_size} байт)")
+
+
+@app.command()
+def load(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Файл снимка (.spg)"),
+    mode: Mode = typer.Option(Mode.COMPACT, help="Output display mode"),
+) -> None:
+    """Загрузить снимок и показать граф (без обхода и анализа проекта)"""
+    started = time.perf_counter()
+    graph = load_snapshot(path)
+    elapsed = (time.perf_counter() - started) * 1000
+    typer.echo(render(graph, mode))
+    typer.echo(f"Загружено за {elapsed:.1f} мс: {graph!r}")
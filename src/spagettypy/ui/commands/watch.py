@@ -0,0 +1,37 @@
+import typer
+from typing import Optional
+from ...analyzer.parsers.incremental import LiveGraph, PollingWatcher
+from .have import Mode, build_pipeline, render
+
+
+def watch(
+    ctx: typer.Context,
+    mode: Mode = typer.Option(Mode.COMPACT, help="Output display mode"),
+    interval: float = typer.Option(0.5, "--interval", help="Период опроса файлов, секунд"),
+    debounce: float = typer.Option(0.3, "--debounce", help="Сколько ждать затихания правок, секунд"),
+    max_updates: Optional[int] = typer.Option(None, "--max-updates", hidden=True),
+) -> None:
+    """Держать граф в памяти и обновлять его при изменении .py файлов"""
+    cfg = ctx.obj
+    graph = cfg["graph"]
+    if hasattr(graph, "thaw"):
+        graph = graph.thaw()
+    pipeline = build_pipeline(cfg, graph)
+    pipeline.forget(cfg.get("removed", ()))
+    pipeline(graph, files=cfg.get("pending"))
+    typer.echo(render(graph, mode))
+
+    live = LiveGraph(graph, cfg["parser"], pipeline)
+    watcher = PollingWatcher(cfg["parser"], cfg["root"])
+    if max_updates == 0:
+        return
+    updates = 0
+    try:
+        for changes in watcher.changes(interval=interval, debounce=debounce):
+            if live.update(changes):
+                typer.echo(render(graph, mode))
+            updates += 1
+            if max_updates is not None and updates >= max_updates:
+                break
+    except KeyboardInterrupt:
+        pass
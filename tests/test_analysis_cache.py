@@ -0,0 +1,214 @@
+from pathlib import Path
+
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.parsers.cache import AnalysisCache
+from spagettypy.analyzer.parsers.facts import FileFacts, FactRecorder, replay_facts, PIPELINE_SLOT
+from spagettypy.analyzer.parsers.structure_analyzer import (
+    ASTAnalyzerPipeline,
+    ImportAnalyzer,
+    StructureAnalyzer,
+)
+from spagettypy.analyzer.model import FileInfo, ModuleInfo, Relation
+from spagettypy.analyzer.parsers.base import SymbolTable
+from spagettypy.analyzer.parsers.directory_parser import DirectoryParser, FormatFileChecker
+
+
+def _project(tmp_path: Path) -> GraphX:
+    (tmp_path / "m.py").write_text("import os\n\nclass A:\n    def f(self):\n        self.x = 1\n")
+    g = GraphX()
+    g.add_edge("root", FileInfo(name="m", format=".py", path=Path(".")), data=Relation.CONTAINS)
+    return g
+
+
+def _pipeline(graph, root, cache):
+    return ASTAnalyzerPipeline(
+        analyzers=[ImportAnalyzer(graph, root), StructureAnalyzer(graph)],
+        root_path=root,
+        cache=cache,
+    )
+
+
+# ───────────────────────────────
+# FactRecorder / replay_facts
+# ───────────────────────────────
+def test_fact_recorder_forwards_and_replays():
+    g = GraphX()
+    facts = FileFacts()
+    rec = FactRecorder(g, facts)
+    rec.add_node("A")
+    rec.add_edge("A", "B", data=Relation.IMPORTS)
+    assert g.has_edge("A", "B") and len(facts) == 2
+
+    g2 = GraphX()
+    replay_facts(facts, {PIPELINE_SLOT: g2})
+    assert g2.get_edge_data("A", "B") == Relation.IMPORTS
+
+
+# ───────────────────────────────
+# AnalysisCache
+# ───────────────────────────────
+def test_pipeline_cache_replays_same_graph(tmp_path):
+    cache_dir = tmp_path / ".cache"
+
+    g1 = _project(tmp_path)
+    _pipeline(g1, tmp_path, AnalysisCache(cache_dir))(g1)
+
+    g2 = _project(tmp_path)
+    cache = AnalysisCache(cache_dir)
+    pipe = _pipeline(g2, tmp_path, cache)
+    pipe.analyze_file = lambda *a, **kw: (_ for _ in ()).throw(AssertionError("parsed"))
+    pipe(g2)
+
+    assert cache.hits == 1
+    assert {repr(n) for n in g1.nodes()} == {repr(n) for n in g2.nodes()}
+    assert sorted(str(d) for *_, d in g1.edges()) == sorted(str(d) for *_, d in g2.edges())
+
+
+def test_cached_facts_hold_offsets_not_sources(tmp_path):
+    g = _project(tmp_path)
+    _pipeline(g, tmp_path, AnalysisCache(tmp_path / ".cache"))(g)
+    entries = list((tmp_path / ".cache" / "objects").rglob("*.pickle"))
+    assert entries and all(b"self.x = 1" not in e.read_bytes() for e in entries)
+
+    cls = next(n for n in g.nodes() if getattr(n, "name", None) == "A")
+    assert cls.span.source.startswith("class A:")
+
+
+def test_cache_key_changes_with_content(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("x = 1")
+    cache = AnalysisCache(tmp_path / ".cache")
+    k1 = cache.key(f, "sig")
+    f.write_text("x = 22")
+    assert cache.key(f, "sig") != k1
+
+
+def _tree_graph(tmp_path: Path, cache: AnalysisCache) -> GraphX:
+    graph = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])(GraphX(), tmp_path)
+    symbols = SymbolTable()
+    ASTAnalyzerPipeline(
+        [ImportAnalyzer(graph, tmp_path, symbols=symbols), StructureAnalyzer(graph, symbols=symbols)],
+        tmp_path, cache=cache, symbols=symbols,
+    )(graph)
+    return graph
+
+
+def test_cache_keeps_identical_files_apart(tmp_path):
+    for pkg in ("a", "b"):
+        (tmp_path / pkg).mkdir()
+        (tmp_path / pkg / "__init__.py").write_text("")
+
+    def contains(graph):
+        return {(str(u.path), v.name) for u, v, d in graph.edges() if d == Relation.CONTAINS and isinstance(v, ModuleInfo)}
+
+    cold = _tree_graph(tmp_path, AnalysisCache(tmp_path / ".cache"))
+    cache = AnalysisCache(tmp_path / ".cache")
+    warm = _tree_graph(tmp_path, cache)
+
+    assert cache.hits == 2
+    assert contains(warm) == contains(cold) == {("a", "__init__"), ("b", "__init__")}
+
+
+def test_cached_file_relinks_to_changed_modules(tmp_path):
+    (tmp_path / "a.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "b.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "c.py").write_text("from a import Base\n\nclass Child(Base):\n    pass\n")
+    _tree_graph(tmp_path, AnalysisCache(tmp_path / ".cache"))
+
+    # c.py не менялся, но его базовый класс теперь приходит из b
+    (tmp_path / "a.py").write_text("from b import Base\n")
+    graph = _tree_graph(tmp_path, AnalysisCache(tmp_path / ".cache"))
+
+    parents = {v.module.name for u, v, d in graph.edges() if d == Relation.INHERIT and u.name == "Child"}
+    assert parents == {"b"}
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = AnalysisCache(tmp_path / ".cache", max_bytes=600)
+    facts = FileFacts(ops=[(PIPELINE_SLOT, "node", "x" * 150, None, None)])
+    cache.put("k1", facts)
+    cache.put("k2", facts)
+    assert cache.get("k1") is not None  # k1 становится самым свежим
+    cache.put("k3", facts)
+
+    assert "k2" not in cache.entries
+    assert "k1" in cache.entries and "k3" in cache.entries
+
+
+def test_cache_tracks_total_bytes(tmp_path):
+    cache = AnalysisCache(tmp_path / ".cache", max_bytes=600)
+    small = FileFacts(ops=[(PIPELINE_SLOT, "node", "x" * 50, None, None)])
+    big = FileFacts(ops=[(PIPELINE_SLOT, "node", "x" * 150, None, None)])
+    cache.put("k1", small)
+    cache.put("k1", big)  # замена записи не удваивает размер
+    cache.put("k2", big)
+    cache.put("k3", big)
+    assert cache.total_bytes == sum(cache.entries.values()) <= 600
+    cache.flush()
+    assert AnalysisCache(tmp_path / ".cache").total_bytes == cache.total_bytes
+
+
+def test_cache_index_persists(tmp_path):
+    cache = AnalysisCache(tmp_path / ".cache")
+    cache.put("k", FileFacts())
+    cache.flush()
+    assert "k" in AnalysisCache(tmp_path / ".cache").entries
+
+
+# ───────────────────────────────
+# Параллельный режим (--jobs)
+# ───────────────────────────────
+def test_pipeline_parallel_matches_sequential(tmp_path):
+    (tmp_path / "big.py").write_text("class Big:\n    pass\n" * 50)
+
+    g1 = _project(tmp_path)
+    g1.add_edge("root", FileInfo(name="big", format=".py", path=Path(".")), data=Relation.CONTAINS)
+    _pipeline(g1, tmp_path, None)(g1)
+
+    g2 = _project(tmp_path)
+    g2.add_edge("root", FileInfo(name="big", format=".py", path=Path(".")), data=Relation.CONTAINS)
+    pipe = _pipeline(g2, tmp_path, AnalysisCache(tmp_path / ".cache"))
+    pipe.jobs = 2
+    pipe(g2)
+
+    assert [repr(n) for n in g1.nodes()] == [repr(n) for n in g2.nodes()]
+    assert AnalysisCache(tmp_path / ".cache").entries
+
+
+def _edge_set(graph):
+    return sorted(
+        (type(u).__name__, str(getattr(u, "name", u)), type(v).__name__, str(getattr(v, "name", v)), str(d))
+        for u, v, d in graph.edges()
+    )
+
+
+def test_pipeline_jobs_give_identical_edges(tmp_path):
+    from spagettypy.analyzer.parsers.structure_analyzer import CallAnalyzer
+
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "base.py").write_text(
+        "class Base:\n    def __init__(self):\n        self.x = 1\n    def run(self):\n        pass\n\ndef helper():\n    pass\n"
+    )
+    for i in range(6):
+        (tmp_path / "pkg" / f"m{i}.py").write_text(
+            "from .base import Base, helper\n\n"
+            f"class C{i}(Base):\n    def go(self):\n        self.run()\n        helper()\n\n"
+            f"def free{i}():\n    C{i}().go()\n"
+        )
+        # модули без классов: их функции не должны достаться классу предыдущего файла воркера
+        (tmp_path / "pkg" / f"tools{i}.py").write_text(f"def tool{i}():\n    pass\n")
+
+    def run(jobs):
+        graph = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])(GraphX(), tmp_path)
+        symbols = SymbolTable()
+        ASTAnalyzerPipeline(
+            [ImportAnalyzer(graph, tmp_path, symbols=symbols), StructureAnalyzer(graph, symbols=symbols), CallAnalyzer(graph, symbols=symbols)],
+            tmp_path, jobs=jobs, symbols=symbols,
+        )(graph)
+        return _edge_set(graph)
+
+    sequential = run(1)
+    assert ("FunctionInfo", "go", "FunctionInfo", "run", str(Relation.CALLINGS)) in sequential
+    assert run(3) == sequential
+    assert run(4) == sequential
@@ -8,10 +8,11 @@ from spagettypy.analyzer.parsers.base import (
     FactoryCodeSpan,
     AttributeFactory,
     AnalyzerBase,
+    VisitorDispatcher,
     Scope,
     SymbolRepository,
 )
-from spagettypy.analyzer.model import CodeSpan, ImportScope
+from spagettypy.analyzer.model import CodeSpan, ImportScope, LineOffsetTable
 
 
 # ───────────────────────────────
@@ -81,6 +82,63 @@ def test_factory_code_span_from_file():
     assert span.source is None  # ← корректно для этой реализации
 
 
+def test_factory_code_span_source_is_lazy_and_utf8_aware():
+    code = "s = 'привет'\r\nclass A:\n    x = 'ё'\n"
+    tree = ast.parse(code)
+    factory = FactoryCodeSpan(code)
+    spans = [factory.create_codespan(n) for n in ast.walk(tree) if isinstance(n, (ast.Assign, ast.ClassDef))]
+    assert all(span.table is factory.table for span in spans)
+    for node, span in zip([n for n in ast.walk(tree) if isinstance(n, (ast.Assign, ast.ClassDef))], spans):
+        assert span.source == ast.get_source_segment(code, node)
+
+
+def test_factory_code_span_from_file_line_count():
+    factory = FactoryCodeSpan("a = 1\nlong = 2")
+    span = factory.create_codespan_from_file(factory.source)
+    assert (span.end_line, span.end_col) == (2, 8)
+
+
+def test_factory_code_span_with_path_pickles_offsets_only(tmp_path):
+    import pickle
+
+    code = "s = 'привет'\nclass A:\n    x = 1\n"
+    path = tmp_path / "m.py"
+    path.write_text(code, encoding="utf-8")
+    node = ast.parse(code).body[1]
+    span = FactoryCodeSpan(code, path=path).create_codespan(node)
+    assert span.source == ast.get_source_segment(code, node)
+
+    data = pickle.dumps(span)
+    assert "привет".encode("utf-8") not in data and b"x = 1" not in data
+    restored = pickle.loads(data)
+    assert restored.table.path == str(path)
+    assert restored.source == span.source
+
+
+def test_code_span_source_reads_file_once_per_pass_and_detects_changes(tmp_path, monkeypatch):
+    import builtins
+
+    code = "class A:\n    x = 1\n\nclass B:\n    y = 2\n"
+    path = tmp_path / "m.py"
+    path.write_text(code, encoding="utf-8")
+    factory = FactoryCodeSpan(code, path=path)
+    nodes = ast.parse(code).body
+    spans = [factory.create_codespan(n) for n in nodes]
+
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda f, *a, **kw: opened.append(f) or real_open(f, *a, **kw))
+    with LineOffsetTable.reading():
+        assert [s.source for s in spans] * 2 == [ast.get_source_segment(code, n) for n in nodes] * 2
+    assert opened == [str(path)]
+
+    # та же длина, другой текст: смещения анализа к нему не подходят
+    path.write_text(code.replace("x = 1", "z = 9"), encoding="utf-8")
+    assert spans[0].source is None
+    path.unlink()
+    assert spans[1].source is None
+
+
 
 
 # ───────────────────────────────
@@ -144,3 +202,54 @@ def test_symbol_repository_push_pop_and_register(capsys):
 
     popped = repo.pop_scope()
     assert popped.name == "inner"
+
+
+
+# ───────────────────────────────
+# VisitorDispatcher
+# ───────────────────────────────
+class _Names(AnalyzerBase):
+    def __init__(self):
+        super().__init__(graph=None)
+        self.seen = []
+
+    def visit_Name(self, node):
+        self.seen.append(node.id)
+        self.generic_visit(node)
+
+
+class _PrunedFunctions(AnalyzerBase):
+    def __init__(self):
+        super().__init__(graph=None)
+        self.functions = []
+        self.names = []
+
+    def visit_FunctionDef(self, node):
+        # без generic_visit — тело функции этому анализатору не нужно
+        self.functions.append(node.name)
+
+    def visit_Name(self, node):
+        self.names.append(node.id)
+
+
+def test_dispatcher_routes_like_node_visitor():
+    tree = ast.parse("a = b\ndef f():\n    return c\n")
+    fused, plain = _Names(), _Names()
+    VisitorDispatcher([fused]).dispatch(tree)
+    plain.visit(tree)
+    assert fused.seen == plain.seen == ["a", "b", "c"]
+
+
+def test_dispatcher_prunes_only_for_analyzer_without_generic_visit():
+    tree = ast.parse("x = 1\ndef f():\n    return y\n")
+    names, pruned = _Names(), _PrunedFunctions()
+    VisitorDispatcher([names, pruned]).dispatch(tree)
+    assert names.seen == ["x", "y"]
+    assert pruned.functions == ["f"] and pruned.names == ["x"]
+    # после обхода generic_visit возвращается к методу класса
+    assert "generic_visit" not in vars(names)
+
+
+def test_dispatcher_ignores_node_visitor_defaults():
+    dispatcher = VisitorDispatcher([_Names()])
+    assert dispatcher._routes_for(ast.Constant) == ()
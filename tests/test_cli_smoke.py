@@ -40,14 +40,10 @@ def test_cli_gitignore_and_exclude(tmp_path, monkeypatch):
     (tmp_path / "b.tmp").write_text("ignored")
     (tmp_path / "c.py").write_text("ok")
 
-    # заглушаем тяжелые классы, чтобы не использовать pygit2
+    # заглушаем поиск репозитория, чтобы не использовать pygit2
     monkeypatch.setattr(
-        "spagettypy.ui.cli.GitignoreFileChecker",
-        lambda *a, **kw: (lambda f: True)
-    )
-    monkeypatch.setattr(
-        "spagettypy.ui.cli.ExcludeFileChecher",
-        lambda *a, **kw: (lambda f: True)
+        "spagettypy.ui.cli.GitFinder",
+        lambda *a, **kw: (lambda p: None)
     )
 
     result = runner.invoke(
@@ -61,3 +57,146 @@ def test_cli_gitignore_and_exclude(tmp_path, monkeypatch):
     )
 
     assert result.exit_code == 0
+
+
+def test_cli_saved_graph_with_since(tmp_path):
+    """Сохранённый граф + --since: переанализируются только изменённые файлы"""
+    import pygit2
+
+    repo = pygit2.init_repository(str(tmp_path))
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    repo.index.add_all()
+    repo.index.write()
+    sig = pygit2.Signature("t", "t@example.com")
+    repo.create_commit("HEAD", sig, sig, "base", repo.index.write_tree(), [])
+
+    saved = tmp_path / "graph.pickle"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "have", "view", "--save", str(saved)])
+    assert result.exit_code == 0 and saved.exists()
+
+    (tmp_path / "b.py").write_text("class B:\n    pass\n")
+    result = runner.invoke(
+        app,
+        ["--only_python", "--path", str(tmp_path), "--graph", str(saved), "--since", "HEAD", "have", "view"],
+    )
+    assert result.exit_code == 0
+    assert "ClassInfo:B" in result.stdout and "ClassInfo:A" in result.stdout
+
+
+def test_cli_since_rejects_unknown_ref_and_missing_graph(tmp_path):
+    """--since: неизвестный коммит и запуск без --graph — ошибки параметра, а не исключения"""
+    import pygit2
+
+    repo = pygit2.init_repository(str(tmp_path))
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    repo.index.add_all()
+    sig = pygit2.Signature("t", "t@example.com")
+    repo.create_commit("HEAD", sig, sig, "base", repo.index.write_tree(), [])
+    saved = tmp_path / "graph.pickle"
+    assert runner.invoke(app, ["--only_python", "--path", str(tmp_path), "have", "view", "--save", str(saved)]).exit_code == 0
+
+    result = runner.invoke(
+        app, ["--only_python", "--path", str(tmp_path), "--graph", str(saved), "--since", "no-such-ref", "have", "view"]
+    )
+    assert result.exit_code == 2
+    assert "--since" in result.output and not isinstance(result.exception, KeyError)
+
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "--since", "HEAD", "have", "view"])
+    assert result.exit_code == 2
+    assert "--graph" in result.output
+
+
+def test_cli_watch_builds_graph_once(tmp_path):
+    """watch строит граф и выводит сводку; --max-updates 0 — выйти сразу"""
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    result = runner.invoke(app, ["--path", str(tmp_path), "watch", "--max-updates", "0"])
+    assert result.exit_code == 0, result.output
+    assert "Узлов" in result.output
+
+
+def test_cli_view_writes_symbols(tmp_path):
+    """--symbols: таблица символов сохраняется после анализа"""
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    out = tmp_path / "symbols.json"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "--symbols", str(out), "have", "view"])
+    assert result.exit_code == 0, result.output
+    assert "a.A" in out.read_text()
+
+
+def test_cli_export_json(tmp_path):
+    """export to json пишет документ с узлами и рёбрами"""
+    import json
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    out = tmp_path / "graph.json"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "have", "export", "to", "json", "-o", str(out)])
+    assert result.exit_code == 0, result.output
+    doc = json.loads(out.read_text())
+    assert any(n["id"] == "ClassInfo:A" for n in doc["nodes"])
+
+
+def test_cli_snapshot_save_load(tmp_path):
+    """snapshot save → snapshot load и --graph со снимком без повторного анализа"""
+    (tmp_path / "a.py").write_text("class A:\n    def run(self):\n        pass\n")
+    snap = tmp_path / "graph.spg"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "snapshot", "save", str(snap)])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(app, ["--path", str(tmp_path), "snapshot", "load", str(snap)])
+    assert result.exit_code == 0, result.output
+    assert "ClassInfo:A" in result.stdout and "FrozenGraph" in result.stdout
+    (tmp_path / "a.py").unlink()
+    out = tmp_path / "graph.json"
+    result = runner.invoke(app, ["--path", str(tmp_path), "--graph", str(snap), "have", "export", "to", "json", "-o", str(out)])
+    assert result.exit_code == 0, result.output
+    assert "FunctionInfo:run" in out.read_text()
+
+
+def test_cli_sqlite_graph(tmp_path):
+    """--sqlite: граф строится в файле SQLite и потом открывается через --graph"""
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    db = tmp_path / "graph.sqlite"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "--sqlite", str(db), "have", "view"])
+    assert result.exit_code == 0, result.output
+    assert "ClassInfo:A" in result.stdout
+    result = runner.invoke(app, ["--path", str(tmp_path), "--graph", str(db), "have", "export", "to", "dot"])
+    assert result.exit_code == 0, result.output
+    assert '"ClassInfo:A"' in result.stdout
+
+
+def test_cli_query_saved_graph(tmp_path):
+    """query отвечает по сохранённому графу без повторного анализа"""
+    (tmp_path / "base.py").write_text("import os\n\nclass Model:\n    pass\n")
+    (tmp_path / "views.py").write_text("from base import Model\n\nclass User(Model):\n    def save(self):\n        pass\n")
+    snap = tmp_path / "graph.spg"
+    result = runner.invoke(app, ["--only_python", "--path", str(tmp_path), "snapshot", "save", str(snap)])
+    assert result.exit_code == 0, result.output
+    base = ["--path", str(tmp_path), "--graph", str(snap), "query"]
+    result = runner.invoke(app, base + ["subclasses", "Model"])
+    assert result.exit_code == 0, result.output
+    assert result.stdout.split() == ["views.User"]
+    assert runner.invoke(app, base + ["methods", "User"]).stdout.split() == ["views.save"]
+    assert runner.invoke(app, base + ["importers", "os"]).stdout.split() == ["base"]
+    assert "views" in runner.invoke(app, base + ["modules"]).stdout
+
+
+def test_cli_export_mermaid_split(tmp_path):
+    """export to mermaid --split: каталог диаграмм и index.html"""
+    (tmp_path / "a.py").write_text("class A:\n    pass\n\nclass B(A):\n    pass\n")
+    out = tmp_path / "diagrams"
+    result = runner.invoke(
+        app, ["--only_python", "--path", str(tmp_path), "have", "export", "to", "mermaid", "--split", "component", "-o", str(out)]
+    )
+    assert result.exit_code == 0, result.output
+    assert (out / "index.html").exists() and (out / "component-1.html").exists()
+
+
+def test_cli_export_dot_filters(tmp_path):
+    """export to dot: --only и --relation доходят до DotExporter"""
+    (tmp_path / "a.py").write_text("class A:\n    def run(self):\n        pass\n\nclass B(A):\n    pass\n")
+    result = runner.invoke(app, [
+        "--only_python", "--path", str(tmp_path), "have", "export", "to", "dot",
+        "--only", "class", "--only", "function", "--relation", "methods",
+    ])
+    assert result.exit_code == 0, result.output
+    assert '"ClassInfo:A" -> "FunctionInfo:run"' in result.stdout
+    assert '"ClassInfo:B" [' in result.stdout
+    assert "inherit" not in result.stdout and "ModuleInfo" not in result.stdout
@@ -2,7 +2,7 @@ from pathlib import Path
 from unittest.mock import patch
 from spagettypy.analyzer.parsers.directory_parser import (
     GitignoreFileChecker, GitExcludeFileChecker,
-    FormatFileChecker, DirectoryParser
+    FormatFileChecker, DirectoryParser, ExcludeFileChecher, ScandirWalker, GitIndexWalker, ThreadedScandirWalker
 )
 from spagettypy.analyzer.model import FileInfo
 from spagettypy.analyzer.graph.networkx_facade import GraphX
@@ -49,12 +49,11 @@ def test_directory_parser_builds_graph(tmp_path):
     (d1 / "a.py").write_text("print(1)")
     (d1 / "b.txt").write_text("ok")
 
-    parser = DirectoryParser(base_path=tmp_path)
+    def fake_walk(p, check_dir=None):
+        for name in ["a.py", "b.txt"]:
+            yield FileInfo(name=Path(name).stem, format=Path(name).suffix, path=d1)
 
-    def fake_walk(p):
-        for dirpath, _, files in [(d1, [], ["a.py", "b.txt"])]:
-            yield dirpath, [], files
-    Path.walk = fake_walk
+    parser = DirectoryParser(base_path=tmp_path, walker=fake_walk)
 
     g = GraphX()
     g2 = parser(g, tmp_path)
@@ -64,3 +63,103 @@ def test_directory_parser_builds_graph(tmp_path):
     assert "a.py" in filenames
     assert "b.txt" in filenames
 
+
+
+# ────────────────────────────────
+# ScandirWalker
+# ────────────────────────────────
+def _names(files):
+    return [str(Path(f.path, f.name + f.format)) for f in files]
+
+
+def test_scandir_walker_is_sorted_and_prunes_dirs(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "x.py").write_text("")
+    (tmp_path / "node_modules" / "deep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "deep" / "y.py").write_text("")
+    (tmp_path / "a.py").write_text("")
+
+    opened = []
+    def check_dir(path):
+        opened.append(path.name)
+        return path.name != "node_modules"
+
+    files = list(ScandirWalker()(tmp_path, check_dir))
+    assert _names(files) == [str(tmp_path / "a.py"), str(tmp_path / "b" / "x.py")]
+    assert "deep" not in opened  # в отсечённый каталог не спускались
+
+
+def test_scandir_walker_stops_on_symlink_loop(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "m.py").write_text("")
+    (tmp_path / "pkg" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    files = _names(ScandirWalker(follow_symlinks=True)(tmp_path))
+    assert files == [str(tmp_path / "pkg" / "m.py")]
+
+
+def test_scandir_walker_skips_dir_symlinks_unless_asked(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "ext.py").write_text("")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "m.py").write_text("")
+    (root / "link").symlink_to(outside, target_is_directory=True)
+
+    assert _names(ScandirWalker()(root)) == [str(root / "m.py")]
+    assert _names(ThreadedScandirWalker(workers=2)(root)) == [str(root / "m.py")]
+    followed = _names(ScandirWalker(follow_symlinks=True)(root))
+    assert followed == [str(root / "m.py"), str(root / "link" / "ext.py")]
+
+
+def test_directory_parser_prunes_excluded_dirs(tmp_path):
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "gen.py").write_text("")
+    (tmp_path / "main.py").write_text("")
+    parser = DirectoryParser(base_path=tmp_path, checkers=[ExcludeFileChecher(["build/"])])
+    assert _names(parser.iter_files(tmp_path)) == [str(tmp_path / "main.py")]
+
+
+def test_threaded_walker_matches_sequential(tmp_path):
+    for i in range(6):
+        for j in range(4):
+            d = tmp_path / f"d{i}" / f"s{j}"
+            d.mkdir(parents=True)
+            (d / f"m{j}.py").write_text("")
+        (tmp_path / f"d{i}" / "skip").mkdir()
+        (tmp_path / f"d{i}" / "skip" / "x.py").write_text("")
+    (tmp_path / "d0" / "loop").symlink_to(tmp_path, target_is_directory=True)
+
+    def check(d):
+        return d.name != "skip"
+
+    expected = _names(ScandirWalker()(tmp_path, check))
+    assert _names(ThreadedScandirWalker(workers=4, max_pending=3)(tmp_path, check)) == expected
+
+    g1 = DirectoryParser(base_path=tmp_path)(GraphX(), tmp_path)
+    g2 = DirectoryParser(base_path=tmp_path, walker=ThreadedScandirWalker(workers=4))(GraphX(), tmp_path)
+    assert list(map(repr, g1.edges())) == list(map(repr, g2.edges()))
+
+
+# ────────────────────────────────
+# GitIndexWalker
+# ────────────────────────────────
+def test_git_index_walker_lists_tracked_and_untracked(tmp_path):
+    import pygit2
+    repo = pygit2.init_repository(str(tmp_path))
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("")
+    (tmp_path / "gone.py").write_text("")
+    repo.index.add_all()
+    repo.index.write()
+
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "new.py").write_text("")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("")
+
+    walker = GitIndexWalker(tmp_path / ".git")
+    assert _names(walker(tmp_path)) == [str(tmp_path / ".gitignore"), str(tmp_path / "new.py"), str(tmp_path / "pkg" / "a.py")]
+    assert _names(walker(tmp_path / "pkg")) == [str(tmp_path / "pkg" / "a.py")]
+    assert _names(walker(tmp_path, lambda d: d.name != "pkg")) == [str(tmp_path / ".gitignore"), str(tmp_path / "new.py")]
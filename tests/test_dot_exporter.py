@@ -0,0 +1,102 @@
+import io
+from pathlib import Path
+
+from spagettypy.analyzer.exporters.dot_exporter import DotExporter
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import (
+    ClassInfo, DirectoryNode, FileInfo, FunctionInfo, ModuleInfo, Relation,
+)
+
+
+def _graph() -> GraphX:
+    g = GraphX()
+    root = DirectoryNode(Path("."))
+    pkg = DirectoryNode(Path("pkg"))
+    empty = DirectoryNode(Path("docs"))
+    f = FileInfo(name="mod", format=".py", path=Path("pkg"))
+    m = ModuleInfo(name="mod", file=f)
+    a = ClassInfo(name="A", module=m)
+    b = ClassInfo(name="B", module=m)
+    fn = FunctionInfo(name="run", module=m)
+    g.add_edge(root, pkg, data=Relation.CONTAINS)
+    g.add_edge(root, empty, data=Relation.CONTAINS)
+    g.add_edge(pkg, f, data=Relation.CONTAINS)
+    g.add_edge(f, m, data=Relation.CONTAINS)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(m, b, data=Relation.DEFINES)
+    g.add_edge(b, a, data=Relation.INHERIT)
+    g.add_edge(a, fn, data=Relation.METHODS)
+    return g
+
+
+def _render(exporter: DotExporter, graph) -> str:
+    buf = io.StringIO()
+    exporter(graph, buf)
+    return buf.getvalue()
+
+
+# ───────────────────────────────
+# DotExporter
+# ───────────────────────────────
+def test_dot_clusters_by_directory():
+    text = _render(DotExporter(), _graph())
+    assert text.startswith("digraph spagettypy {") and text.rstrip().endswith("}")
+    assert text.count("{") == text.count("}")
+    assert '"cluster_DirectoryNode:pkg"' in text
+    # каталог без подходящих узлов не даёт пустого кластера
+    assert "cluster_DirectoryNode:docs" not in text
+    # модуль объявлен один раз — внутри кластера
+    assert text.count('"ModuleInfo:mod" [label="mod"') == 1
+    assert '"ClassInfo:B" -> "ClassInfo:A" [label="inherit", arrowhead=empty];' in text
+    assert '"DirectoryNode:pkg" -> ' not in text
+
+
+def test_dot_filters_in_single_pass(tmp_path):
+    out = tmp_path / "graph.dot"
+    DotExporter(only_classes=(ClassInfo, FunctionInfo), relations=[Relation.METHODS], cluster=False)(_graph(), out)
+    text = out.read_text()
+    assert "cluster_" not in text and "ModuleInfo" not in text
+    assert '"ClassInfo:A" -> "FunctionInfo:run"' in text
+    assert "inherit" not in text
+    assert '"ClassInfo:B" [' in text
+
+
+def test_dot_clusters_keyed_by_full_path():
+    # как DirectoryParser для pkg/m.py и pkg/sub/pkg/m2.py: узел 'pkg' один на оба каталога
+    g = GraphX()
+    root, pkg, sub = DirectoryNode(Path(".")), DirectoryNode(Path("pkg")), DirectoryNode(Path("sub"))
+    top = FileInfo(name="m", format=".py", path=Path("pkg"))
+    deep = FileInfo(name="m2", format=".py", path=Path("pkg/sub/pkg"))
+    g.add_edge(root, pkg, data=Relation.CONTAINS)
+    g.add_edge(pkg, sub, data=Relation.CONTAINS)
+    g.add_edge(sub, pkg, data=Relation.CONTAINS)
+    g.add_edge(pkg, top, data=Relation.CONTAINS)
+    g.add_edge(pkg, deep, data=Relation.CONTAINS)
+    g.add_edge(deep, ModuleInfo(name="m2", file=deep), data=Relation.CONTAINS)
+
+    text = _render(DotExporter(), g)
+    assert text.count("{") == text.count("}")
+    assert text.count('subgraph "cluster_DirectoryNode:pkg" {') == 1
+    assert text.count('subgraph "cluster_DirectoryNode:pkg/sub/pkg" {') == 1
+    assert text.count('"FileInfo:pkg/m.py" [') == 1
+    assert text.count('"FileInfo:pkg/sub/pkg/m2.py" [') == 1
+    assert text.count('"ModuleInfo:m2" [label="m2"') == 1
+    # файл глубокого каталога — внутри его собственного кластера
+    deep_cluster = text.index('"cluster_DirectoryNode:pkg/sub/pkg"')
+    assert text.index('"FileInfo:pkg/sub/pkg/m2.py" [') > deep_cluster > text.index('"FileInfo:pkg/m.py" [')
+
+
+def test_dot_plain_graph_matches_indexed():
+    """Граф без out_edges: рёбра группируются по узлам, вывод тот же"""
+    class Plain:
+        def __init__(self, graph):
+            self.graph = graph
+
+        def nodes(self):
+            return self.graph.nodes()
+
+        def edges(self):
+            return self.graph.edges()
+
+    exporter = DotExporter(only_classes=(ModuleInfo, ClassInfo, FunctionInfo), relations=[Relation.DEFINES, Relation.METHODS])
+    assert _render(exporter, Plain(_graph())) == _render(exporter, _graph())
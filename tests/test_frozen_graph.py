@@ -0,0 +1,70 @@
+import pickle
+from pathlib import Path
+
+from spagettypy.analyzer.graph import FilterEdgeByRelations, FilterNodeByClass, FindNodeByName
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import ClassInfo, FileInfo, ModuleInfo, Relation
+
+
+def _graph() -> GraphX:
+    g = GraphX()
+    f = FileInfo(name="m", format=".py", path=Path("pkg"))
+    m = ModuleInfo(name="m")
+    a = ClassInfo(name="A", module=m)
+    b = ClassInfo(name="B", module=m)
+    g.add_edge("root", f, data=Relation.CONTAINS)
+    g.add_edge(f, m, data=Relation.CONTAINS)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(m, b, data=Relation.DEFINES)
+    g.add_edge(b, a, data=Relation.INHERIT)
+    g.add_node("lonely")
+    return g
+
+
+# ───────────────────────────────
+# FrozenGraph
+# ───────────────────────────────
+def test_freeze_keeps_nodes_and_edges_in_order():
+    g = _graph()
+    frozen = g.freeze()
+    assert list(frozen.nodes()) == list(g.nodes())
+    assert list(frozen.edges()) == list(g.edges())
+    assert len(frozen) == len(g) and "lonely" in frozen
+
+
+def test_frozen_adjacency_and_traversal():
+    g = _graph()
+    frozen = g.freeze()
+    m = ModuleInfo(name="m")
+    a = ClassInfo(name="A", module=m)
+    assert frozen.get_edge_data(m, a) == Relation.DEFINES
+    assert not frozen.has_edge(a, m)
+    assert list(frozen.in_edges(a)) == list(g.in_edges(a))
+    assert list(frozen.out_edges(m)) == list(g.out_edges(m))
+    assert frozen.degree(a) == g.degree(a) and frozen.degree("lonely") == 0
+    assert frozen.descendants("root") == g.descendants("root")
+    assert frozen.ancestors(a) == g.ancestors(a)
+
+
+def test_frozen_indexes_and_graph_helpers():
+    g = _graph()
+    frozen = g.freeze()
+    assert frozen.relation_counts() == g.relation_counts()
+    assert sorted(map(repr, frozen.edges_by_relation([Relation.DEFINES]))) == sorted(map(repr, g.edges_by_relation([Relation.DEFINES])))
+    assert list(frozen.nodes_by_import_path("pkg.m")) == list(g.nodes_by_import_path("pkg.m"))
+    assert FindNodeByName(frozen)("A") is not None
+    assert set(FilterNodeByClass((ClassInfo,))(frozen)) == set(FilterNodeByClass((ClassInfo,))(g))
+    assert list(FilterEdgeByRelations([Relation.INHERIT])(frozen)) == list(FilterEdgeByRelations([Relation.INHERIT])(g))
+
+
+def test_frozen_is_read_only_and_pickles():
+    frozen = _graph().freeze()
+    try:
+        frozen.add_node("x")
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("FrozenGraph must be read-only")
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert list(restored.edges()) == list(frozen.edges())
+    assert list(restored.thaw().edges()) == list(frozen.edges())
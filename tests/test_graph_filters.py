@@ -94,3 +94,26 @@ def test_filter_edge_by_relations_exclude(simple_graph):
     filt = FilterEdgeByRelations([Relation.CONTAINS], include=False)
     edges = list(filt(g))
     assert all(data != Relation.CONTAINS for _, _, data in edges)
+
+
+# ───────────────────────────────
+# Индекс по типу узлов
+# ───────────────────────────────
+def test_filter_node_by_class_yields_each_node_once(simple_graph):
+    g, a, b, c = simple_graph
+    g.add_edge(a, c, data=Relation.USES)
+    nodes = list(FilterNodeByClass(DummyA)(g))
+    assert len(nodes) == 2 and set(map(id, nodes)) == {id(a), id(c)}
+
+
+def test_filter_node_by_class_skips_isolated_and_removed(simple_graph):
+    g, a, b, c = simple_graph
+    g.add_node(DummyA())
+    g.remove_node(c)
+    assert list(FilterNodeByClass(DummyA)(g)) == [a]
+
+
+def test_filter_edge_by_class_include_uses_type_index(simple_graph):
+    g, a, b, c = simple_graph
+    g.add_edge(a, c, data=Relation.USES)
+    assert list(FilterEdgeByClass(DummyA)(g)) == [(a, c, Relation.USES)]
@@ -98,3 +98,32 @@ def test_find_node_by_import_like_not_found(graph_with_nodes):
     result = finder("nonexistent.module")
     assert result == n1
 
+
+
+# ───────────────────────────────
+# Индексы GraphX
+# ───────────────────────────────
+def test_find_node_by_import_like_relative_paths():
+    g = GraphX()
+    a = DummyNode("module", path="pkg/a")
+    b = DummyNode("module", path="pkg/b")
+    g.add_node(a)
+    g.add_node(b)
+    finder = FindNodeByImportLike(g, Path("/project"))
+    assert finder("pkg.b.module") is b
+    assert finder("b.module") is b
+    assert finder("x.module") is a
+
+
+def test_finders_do_not_scan_indexed_graph(graph_with_nodes, monkeypatch):
+    g, root, (n1, n2, *_ ) = graph_with_nodes
+    monkeypatch.setattr(g, "nodes", lambda: (_ for _ in ()).throw(AssertionError("scan")))
+    assert FindNodeByName(g)("other") == n2
+    assert FindNodeByImportLike(g, root)("pkg.sub.module") == n1
+
+
+def test_name_index_follows_remove_node(graph_with_nodes):
+    g, root, (n1, *_ ) = graph_with_nodes
+    g.remove_node(n1)
+    assert FindNodeByName(g)("module") is None
+    assert list(g.nodes_by_name("module")) == []
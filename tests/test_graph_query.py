@@ -0,0 +1,66 @@
+import time
+from pathlib import Path
+
+from spagettypy.analyzer.graph import GraphX
+from spagettypy.analyzer.model import ClassInfo, FileInfo, FunctionInfo, ImportScope, ModuleInfo, Relation
+from spagettypy.analyzer.query import GraphQuery, qualified_name
+
+
+def _graph() -> GraphX:
+    g = GraphX()
+    base = ModuleInfo(name="base", file=FileInfo(name="base", format=".py", path=Path("src/pkg")), scope=ImportScope.LOCAL)
+    views = ModuleInfo(name="views", file=FileInfo(name="views", format=".py", path=Path("src/pkg/web")), scope=ImportScope.LOCAL)
+    numpy = ModuleInfo(name="numpy", scope=ImportScope.DEPENDENCY)
+    np_linalg = ModuleInfo(name="numpy.linalg", scope=ImportScope.DEPENDENCY)
+    model = ClassInfo(name="Model", module=base)
+    user = ClassInfo(name="User", module=views)
+    admin = ClassInfo(name="Admin", module=views)
+    g.add_edge(base, model, data=Relation.DEFINES)
+    g.add_edge(views, user, data=Relation.DEFINES)
+    g.add_edge(user, model, data=Relation.INHERIT)
+    g.add_edge(admin, user, data=Relation.INHERIT)
+    g.add_edge(user, FunctionInfo(name="save", module=views), data=Relation.METHODS)
+    g.add_edge(user, FunctionInfo(name="delete", module=views), data=Relation.METHODS)
+    # from pkg.base import Model  /  import numpy
+    g.add_edge(views, model, data=Relation.IMPORTS)
+    g.add_edge(model, base, data=Relation.FROM)
+    g.add_edge(base, numpy, data=Relation.IMPORTS)
+    g.add_edge(views, np_linalg, data=Relation.IMPORTS)
+    return g
+
+
+# ───────────────────────────────
+# GraphQuery
+# ───────────────────────────────
+def test_query_relations():
+    q = GraphQuery(_graph())
+    assert [m.name for m in q.importers("numpy")] == ["base"]
+    assert [m.name for m in q.importers("pkg.base")] == ["views"]
+    assert [c.name for c in q.subclasses("Model")] == ["User"]
+    assert {c.name for c in q.subclasses("Model", recursive=True)} == {"User", "Admin"}
+    assert [c.name for c in q.bases("Admin")] == ["User"]
+    assert [f.name for f in q.methods("User")] == ["save", "delete"]
+    assert qualified_name(next(iter(q.methods("User")))) == "src.pkg.web.views.save"
+
+
+def test_query_modules_by_package_and_scope():
+    q = GraphQuery(_graph())
+    assert {m.name for m in q.modules("pkg")} == {"base", "views"}
+    assert [m.name for m in q.modules("pkg.web")] == ["views"]
+    assert q.modules("pk") == []
+    assert {m.name for m in q.modules("numpy", scope=ImportScope.DEPENDENCY)} == {"numpy", "numpy.linalg"}
+    assert q.modules("pkg", scope=ImportScope.DEPENDENCY) == []
+
+
+def test_query_uses_indexes_on_large_graph():
+    g = _graph()
+    for i in range(20000):
+        m = ModuleInfo(name=f"m{i}", file=FileInfo(name=f"m{i}", format=".py", path=Path(f"gen/p{i % 50}")))
+        g.add_edge(m, ClassInfo(name=f"C{i}", module=m), data=Relation.DEFINES)
+    q = GraphQuery(g)
+    started = time.perf_counter()
+    for _ in range(100):
+        q.subclasses("Model")
+        q.modules("pkg.web")
+    assert time.perf_counter() - started < 0.5
+    assert len(q.modules("gen.p7")) == 400
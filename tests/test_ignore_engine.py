@@ -0,0 +1,75 @@
+from pathlib import Path
+
+from spagettypy.analyzer.model import FileInfo
+from spagettypy.analyzer.parsers.directory_parser import DirectoryParser
+from spagettypy.analyzer.parsers.ignore_engine import IgnoreEngine, IgnoreFileChecker
+
+
+def _repo(tmp_path: Path) -> Path:
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("secret.py\n")
+    (tmp_path / ".gitignore").write_text("# comment\n*.log\nbuild/\n")
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / ".gitignore").write_text("gen_*.py\n/local.py\n!keep.log\n")
+    return tmp_path / ".git"
+
+
+# ───────────────────────────────
+# IgnoreEngine
+# ───────────────────────────────
+def test_engine_combines_all_sources(tmp_path):
+    engine = IgnoreEngine(tmp_path, git_dir=_repo(tmp_path), excludes=["docs/"])
+    flags = engine.ignored([
+        tmp_path / "a.log",
+        tmp_path / "secret.py",
+        tmp_path / "main.py",
+        tmp_path / "pkg" / "sub" / "gen_x.py",   # вложенный .gitignore, без привязки
+        tmp_path / "pkg" / "local.py",           # привязан к pkg/
+        tmp_path / "pkg" / "sub" / "local.py",
+        tmp_path / "pkg" / "keep.log",           # отрицание во вложенном .gitignore
+    ])
+    assert flags == [True, True, False, True, True, False, False]
+
+
+def test_engine_batch_matches_single_checks(tmp_path):
+    engine = IgnoreEngine(tmp_path, git_dir=_repo(tmp_path), excludes=["docs/", "*.tmp"])
+    paths = [
+        tmp_path / "pkg" / "sub" / "gen_x.py",
+        tmp_path / "docs" / "conf.py",
+        tmp_path / "x.tmp",
+        tmp_path / "pkg" / "keep.log",
+        tmp_path / "pkg" / "sub" / "gen_x.py",  # повтор
+        "pkg/local.py",                         # относительно base_path
+        tmp_path / "pkg" / "mod.py",
+    ]
+    expected = [IgnoreEngine(tmp_path, git_dir=tmp_path / ".git", excludes=["docs/", "*.tmp"]).is_ignored(p) for p in paths]
+    assert engine.ignored(paths) == expected == [True, True, True, False, True, True, False]
+
+    files = [FileInfo(name=Path(p).stem, format=Path(p).suffix, path=Path(p).parent) for p in paths]
+    assert [f.name for f in engine.filter_files(files)] == ["keep", "mod"]
+
+
+def test_engine_reports_ignored_directories(tmp_path):
+    engine = IgnoreEngine(tmp_path, git_dir=_repo(tmp_path), excludes=["docs/"])
+    assert engine.is_dir_ignored(tmp_path / "build")
+    assert engine.is_dir_ignored(tmp_path / "docs")
+    assert engine.is_dir_ignored(tmp_path / ".git")
+    assert not engine.is_dir_ignored(tmp_path / "pkg")
+
+
+def test_engine_without_repo_uses_excludes_only(tmp_path):
+    engine = IgnoreEngine(tmp_path, excludes=["*.tmp"])
+    assert engine.is_file_ignored(FileInfo(name="x", format=".tmp", path=tmp_path))
+    assert not engine.is_file_ignored(FileInfo(name="x", format=".log", path=tmp_path))
+
+
+def test_parser_prunes_with_engine(tmp_path):
+    _repo(tmp_path)
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("")
+    (tmp_path / "pkg" / "gen_a.py").write_text("")
+    (tmp_path / "pkg" / "mod.py").write_text("")
+    engine = IgnoreEngine(tmp_path, git_dir=tmp_path / ".git")
+    parser = DirectoryParser(base_path=tmp_path, checkers=[IgnoreFileChecker(engine)])
+    found = {f"{f.name}{f.format}" for f in parser.iter_files(tmp_path)}
+    assert found == {".gitignore", "mod.py"}
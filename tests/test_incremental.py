@@ -0,0 +1,218 @@
+from pathlib import Path
+
+import pygit2
+
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.graph.storage import save_graph, load_graph
+from spagettypy.analyzer.model import FileInfo, ClassInfo, ModuleInfo
+from spagettypy.analyzer.parsers.directory_parser import DirectoryParser, FormatFileChecker
+from spagettypy.analyzer.parsers.incremental import ChangeSet, GitChangeFinder, GraphPatcher, LiveGraph, PollingWatcher
+from spagettypy.analyzer.parsers.base import SymbolTable
+from spagettypy.analyzer.parsers.module_index import ModuleIndex
+from spagettypy.analyzer.parsers.structure_analyzer import (
+    ASTAnalyzerPipeline,
+    CallAnalyzer,
+    ImportAnalyzer,
+    StructureAnalyzer,
+)
+from spagettypy.analyzer.serialization import node_id
+
+
+def _commit_all(repo: pygit2.Repository, message: str) -> pygit2.Oid:
+    repo.index.add_all()
+    repo.index.write()
+    tree = repo.index.write_tree()
+    sig = pygit2.Signature("t", "t@example.com")
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    return repo.create_commit("HEAD", sig, sig, message, tree, parents)
+
+
+def _analyze(graph, root, files=None):
+    ASTAnalyzerPipeline([StructureAnalyzer(graph)], root)(graph, files=files)
+    return graph
+
+
+def _full_pipeline(graph, root, symbols=None):
+    """Анализаторы как в CLI: импорты, структура с наследованием, вызовы по таблице символов"""
+    symbols = symbols if symbols is not None else SymbolTable()
+    index = ModuleIndex(root)
+    analyzers = [ImportAnalyzer(graph, root, index, symbols=symbols), StructureAnalyzer(graph, symbols), CallAnalyzer(graph, symbols)]
+    return ASTAnalyzerPipeline(analyzers, root, index=index, symbols=symbols)
+
+
+def _project(root):
+    (root / "shapes.py").write_text("class Base:\n    def run(self):\n        pass\n\ndef helper():\n    pass\n")
+    (root / "canvas.py").write_text(
+        "from shapes import Base, helper\n\nclass App(Base):\n    def go(self):\n        helper()\n        self.run()\n"
+    )
+    (root / "scene.py").write_text("import canvas\nfrom shapes import helper\n\ndef main():\n    canvas.App()\n    helper()\n")
+
+
+def _rebuilt(root):
+    """Граф полного анализа проекта с нуля"""
+    parser = DirectoryParser(base_path=root, checkers=[FormatFileChecker(".py")])
+    graph = parser(GraphX(), root)
+    _full_pipeline(graph, root)(graph)
+    return graph
+
+
+def _edge_ids(graph):
+    return {(node_id(u), node_id(v), str(d)) for u, v, d in graph.edges()}
+
+
+def _class_names(graph):
+    return {n.name for n in graph.nodes() if isinstance(n, ClassInfo)}
+
+
+def test_git_change_finder_lists_changes(tmp_path):
+    repo = pygit2.init_repository(str(tmp_path))
+    (tmp_path / "keep.py").write_text("x = 1\n")
+    (tmp_path / "gone.py").write_text("x = 1\n")
+    (tmp_path / "edit.py").write_text("x = 1\n")
+    base = _commit_all(repo, "base")
+
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "edit.py").write_text("x = 2\n")
+    (tmp_path / "new.py").write_text("y = 1\n")
+
+    changes = GitChangeFinder(tmp_path)(str(base))
+    assert sorted(p.name for p in changes.changed) == ["edit.py", "new.py"]
+    assert [p.name for p in changes.removed] == ["gone.py"]
+
+
+def test_graph_patcher_replaces_stale_module_subgraph(tmp_path):
+    (tmp_path / "a.py").write_text("class Old:\n    def f(self):\n        self.v = 1\n")
+    (tmp_path / "b.py").write_text("class Keep:\n    pass\n")
+    parser = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])
+    graph = _analyze(parser(GraphX(), tmp_path), tmp_path)
+    assert _class_names(graph) == {"Old", "Keep"}
+
+    save_graph(graph, tmp_path / "graph.pickle")
+    graph = load_graph(tmp_path / "graph.pickle")
+
+    (tmp_path / "a.py").write_text("class New:\n    pass\n")
+    pending = GraphPatcher(graph, parser)(ChangeSet(changed=[tmp_path / "a.py"]))
+    assert pending == [FileInfo(name="a", format=".py", path=Path("."))]
+
+    _analyze(graph, tmp_path, files=pending)
+    assert _class_names(graph) == {"New", "Keep"}
+    assert all(getattr(n, "name", None) != "f" for n in graph.nodes())
+
+
+def test_graph_patcher_removes_deleted_file(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    parser = DirectoryParser(base_path=tmp_path)
+    graph = _analyze(parser(GraphX(), tmp_path), tmp_path)
+
+    (tmp_path / "a.py").unlink()
+    assert GraphPatcher(graph, parser)(ChangeSet(removed=[tmp_path / "a.py"])) == []
+    assert not any(isinstance(n, (FileInfo, ModuleInfo, ClassInfo)) for n in graph.nodes())
+
+
+def test_graph_patcher_matches_full_analysis(tmp_path):
+    """--since: правка и удаление импортируемого модуля дают тот же граф, что полный анализ"""
+    _project(tmp_path)
+    parser = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])
+    symbols = SymbolTable()
+    graph = parser(GraphX(), tmp_path)
+    _full_pipeline(graph, tmp_path, symbols)(graph)
+    save_graph(graph, tmp_path / "graph.pickle")
+    symbols.save(tmp_path / "symbols.json")
+
+    # FROM-рёбра Base/helper → shapes строят canvas и scene, которые не менялись
+    (tmp_path / "shapes.py").write_text("class Base:\n    def start(self):\n        pass\n\ndef helper():\n    pass\n")
+    graph = load_graph(tmp_path / "graph.pickle")
+    patcher = GraphPatcher(graph, parser)
+    pending = patcher(ChangeSet(changed=[tmp_path / "shapes.py"]))
+    _full_pipeline(graph, tmp_path, SymbolTable.load(tmp_path / "symbols.json"))(graph, files=pending)
+    assert ("ClassInfo:Base", "ModuleInfo:shapes", "from") in _edge_ids(graph)
+    assert _edge_ids(graph) == _edge_ids(_rebuilt(tmp_path))
+
+    (tmp_path / "shapes.py").unlink()
+    symbols = SymbolTable.load(tmp_path / "symbols.json")
+    pending = patcher(ChangeSet(removed=[tmp_path / "shapes.py"]))
+    pipeline = _full_pipeline(graph, tmp_path, symbols)
+    pipeline.forget(patcher.removed)
+    pipeline(graph, files=pending)
+    assert _edge_ids(graph) == _edge_ids(_rebuilt(tmp_path))
+    assert {node_id(n) for n in graph.nodes()} == {node_id(n) for n in _rebuilt(tmp_path).nodes()}
+
+
+# ───────────────────────────────
+# watch: PollingWatcher / LiveGraph
+# ───────────────────────────────
+def test_polling_watcher_reports_py_changes(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("-")
+    watcher = PollingWatcher(DirectoryParser(base_path=tmp_path), tmp_path)
+    assert not watcher.poll()
+
+    (tmp_path / "a.py").write_text("x = 22\n")
+    (tmp_path / "b.py").unlink()
+    (tmp_path / "notes.txt").write_text("--")
+    changes = watcher.poll()
+    assert changes.changed == [tmp_path / "a.py"]
+    assert changes.removed == [tmp_path / "b.py"]
+
+
+def test_polling_watcher_relists_only_changed_directories(tmp_path, monkeypatch):
+    import os
+    import time
+
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    old = time.time() - 60
+    for d in (tmp_path, tmp_path / "pkg"):
+        os.utime(d, (old, old))
+    watcher = PollingWatcher(DirectoryParser(base_path=tmp_path), tmp_path)
+
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: listed.append(Path(p)) or scandir(p))
+    assert not watcher.poll()
+    assert listed == []
+
+    # правка файла на месте не меняет mtime каталога — её ловит stat файла
+    (tmp_path / "pkg" / "a.py").write_text("x = 22\n")
+    assert watcher.poll().changed == [tmp_path / "pkg" / "a.py"]
+    (tmp_path / "pkg" / "c.py").write_text("y = 1\n")
+    assert watcher.poll().changed == [tmp_path / "pkg" / "c.py"]
+    assert listed == [tmp_path / "pkg"]
+
+
+def test_live_graph_reports_only_real_changes(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    parser = DirectoryParser(base_path=tmp_path)
+    graph = parser(GraphX(), tmp_path)
+    pipeline = ASTAnalyzerPipeline([StructureAnalyzer(graph)], tmp_path)
+    pipeline(graph)
+    live = LiveGraph(graph, parser, pipeline)
+
+    # правка без изменения структуры не меняет граф
+    (tmp_path / "a.py").write_text("class A:\n    pass  # comment\n")
+    assert not live.update(ChangeSet(changed=[tmp_path / "a.py"]))
+
+    (tmp_path / "a.py").write_text("class B:\n    pass\n")
+    assert live.update(ChangeSet(changed=[tmp_path / "a.py"]))
+    assert _class_names(graph) == {"B"}
+
+
+def test_live_graph_matches_full_analysis_after_edits(tmp_path):
+    """watch: правки импортируемого модуля не уводят граф от полного анализа"""
+    _project(tmp_path)
+    parser = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])
+    graph = parser(GraphX(), tmp_path)
+    pipeline = _full_pipeline(graph, tmp_path)
+    pipeline(graph)
+    live = LiveGraph(graph, parser, pipeline)
+
+    for body in ("    def run(self):\n        return 1\n", "    def start(self):\n        pass\n"):
+        (tmp_path / "shapes.py").write_text(f"class Base:\n{body}\ndef helper():\n    pass\n")
+        live.update(ChangeSet(changed=[tmp_path / "shapes.py"]))
+        assert _edge_ids(graph) == _edge_ids(_rebuilt(tmp_path))
+
+    (tmp_path / "shapes.py").unlink()
+    assert live.update(ChangeSet(removed=[tmp_path / "shapes.py"]))
+    assert _edge_ids(graph) == _edge_ids(_rebuilt(tmp_path))
@@ -0,0 +1,84 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+from spagettypy.analyzer.exporters.json_exporter import JsonExporter, JsonFormat
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import (
+    AttributeInfo, ClassInfo, CodeSpan, DirectoryNode, FileInfo, FunctionInfo, ImportScope, ModuleInfo, Relation,
+)
+from spagettypy.analyzer.serialization import decode_node, encode_node, node_id
+
+
+def _graph() -> GraphX:
+    g = GraphX()
+    d = DirectoryNode(Path("pkg"))
+    f = FileInfo(name="mod", format=".py", path=Path("pkg"))
+    m = ModuleInfo(name="mod", file=f, scope=ImportScope.LOCAL, span=CodeSpan(1, 9, 1, 0))
+    a = ClassInfo(name="A", module=m)
+    fn = FunctionInfo(name="run", module=m, args_types=["self"], return_type="None")
+    attr = AttributeInfo(name="x", annotation="int", value="1")
+    g.add_edge(DirectoryNode(Path(".")), d, data=Relation.CONTAINS)
+    g.add_edge(d, f, data=Relation.CONTAINS)
+    g.add_edge(f, m, data=Relation.CONTAINS)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(a, fn, data=Relation.METHODS)
+    g.add_edge(a, attr, data=Relation.ATTRIBUTE)
+    return g
+
+
+# ───────────────────────────────
+# serialization
+# ───────────────────────────────
+def test_stable_ids_and_round_trip():
+    g = _graph()
+    ids = {node_id(n) for n in g.nodes()}
+    assert {"FileInfo:pkg/mod.py", "ModuleInfo:mod", "ClassInfo:A", "DirectoryNode:pkg"} <= ids
+    for node in g.nodes():
+        restored = decode_node(json.loads(json.dumps(encode_node(node))))
+        assert type(restored) is type(node) and node_id(restored) == node_id(node)
+    module = decode_node(encode_node(next(n for n in g.nodes() if isinstance(n, ModuleInfo))))
+    assert module.scope == ImportScope.LOCAL and module.span.end_line == 9 and module.file.path == Path("pkg")
+
+
+# ───────────────────────────────
+# JsonExporter
+# ───────────────────────────────
+def test_json_export_document(tmp_path):
+    out = tmp_path / "graph.json"
+    JsonExporter()(_graph(), out)
+    doc = json.loads(out.read_text())
+    assert doc["schema"] == 1
+    ids = {n["id"] for n in doc["nodes"]}
+    assert len(doc["edges"]) == 6
+    assert all(e["source"] in ids and e["target"] in ids for e in doc["edges"])
+    assert {"source": "ClassInfo:A", "target": "FunctionInfo:run", "relation": "methods"} in doc["edges"]
+
+
+def test_ndjson_gzip_export(tmp_path):
+    out = tmp_path / "graph.ndjson.gz"
+    JsonExporter(JsonFormat.NDJSON, compress=True)(_graph(), out)
+    lines = [json.loads(line) for line in gzip.open(out, "rt")]
+    assert lines[0] == {"kind": "meta", "schema": 1}
+    assert sum(r["kind"] == "node" for r in lines) == 7
+    assert sum(r["kind"] == "edge" for r in lines) == 6
+
+
+def test_json_export_to_stream():
+    buf = io.StringIO()
+    JsonExporter()(_graph(), buf)
+    assert json.loads(buf.getvalue())["nodes"]
+
+
+def test_json_export_to_binary_stream_respects_compress():
+    plain = io.BytesIO()
+    JsonExporter()(_graph(), plain)
+    assert not plain.closed
+    assert json.loads(plain.getvalue().decode("utf-8"))["schema"] == 1
+
+    zipped = io.BytesIO()
+    JsonExporter(JsonFormat.NDJSON, compress=True)(_graph(), zipped)
+    assert not zipped.closed
+    lines = gzip.decompress(zipped.getvalue()).decode("utf-8").splitlines()
+    assert json.loads(lines[0]) == {"kind": "meta", "schema": 1}
@@ -0,0 +1,60 @@
+from spagettypy.analyzer.exporters.mermaid_exporter import MermaidExporter
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import ModuleInfo, ClassInfo, Relation
+
+
+def _graph():
+    g = GraphX()
+    m = ModuleInfo(name="pkg.mod")
+    a = ClassInfo(name="A", module=m)
+    b = ClassInfo(name="B", module=m)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(a, b, data=Relation.INHERIT)
+    return g
+
+
+def test_mermaid_exporter_by_classes():
+    out = MermaidExporter(only_classes=(ModuleInfo, ClassInfo))(_graph())
+    assert "pkg_mod --> A" in out and "A --> B" in out
+
+
+def test_mermaid_exporter_by_relations():
+    out = MermaidExporter(relations=[Relation.INHERIT])(_graph())
+    assert "A --> B" in out
+    assert "pkg_mod" not in out
+
+
+# ───────────────────────────────
+# PartitionedMermaidExporter
+# ───────────────────────────────
+def _packages_graph():
+    from pathlib import Path
+    from spagettypy.analyzer.model import FileInfo
+    g = GraphX()
+    for pkg in ("app", "lib"):
+        m = ModuleInfo(name=f"{pkg}_mod", file=FileInfo(name=f"{pkg}_mod", format=".py", path=Path(pkg)))
+        for i in range(5):
+            g.add_edge(m, ClassInfo(name=f"{pkg}_C{i}", module=m), data=Relation.DEFINES)
+    return g
+
+
+def test_partitioned_mermaid_by_package(tmp_path):
+    from spagettypy.analyzer.exporters.mermaid_exporter import PartitionedMermaidExporter, PartitionBy
+    index = PartitionedMermaidExporter(by=PartitionBy.PACKAGE, max_nodes=4, max_open_files=1)(_packages_graph(), tmp_path)
+    files = sorted(p.name for p in tmp_path.glob("*.html") if p.name != "index.html")
+    # 6 узлов на пакет при бюджете 4 → две диаграммы на пакет
+    assert files == ["app-2.html", "app.html", "lib-2.html", "lib.html"]
+    text = (tmp_path / "app.html").read_text()
+    assert text.count("-->") == 3 and "lib_" not in text and text.rstrip().endswith("</html>")
+    assert 'href="lib-2.html"' in index.read_text() and "lib-2.html\">lib</a> — 3 nodes, 2 edges" in index.read_text()
+
+
+def test_partitioned_mermaid_by_component(tmp_path):
+    from spagettypy.analyzer.exporters.mermaid_exporter import PartitionedMermaidExporter, PartitionBy
+    g = _graph()
+    g.add_edge(ClassInfo(name="X", module=None), ClassInfo(name="Y", module=None), data=Relation.INHERIT)
+    PartitionedMermaidExporter(by=PartitionBy.COMPONENT, max_nodes=3)(g, tmp_path)
+    first = (tmp_path / "component-1.html").read_text()
+    second = (tmp_path / "component-2.html").read_text()
+    assert "pkg_mod --> A" in first and "A --> B" in first and "X" not in first
+    assert "X --> Y" in second
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from spagettypy.analyzer.parsers.module_index import ModuleIndex
+from spagettypy.analyzer.parsers.structure_analyzer import ModuleFileFinder
+from spagettypy.analyzer.graph.finders import FindNodeByImportLike
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import FileInfo, Relation
+
+
+def _tree(tmp_path: Path) -> Path:
+    pkg = tmp_path / "src" / "app" / "core"
+    pkg.mkdir(parents=True)
+    (tmp_path / "src" / "app" / "__init__.py").write_text("")
+    (pkg / "engine.py").write_text("")
+    ns = tmp_path / "plugins" / "extra"
+    ns.mkdir(parents=True)
+    (ns / "tool.py").write_text("")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "hidden.py").write_text("")
+    return tmp_path
+
+
+def test_module_index_packages_and_src_layout(tmp_path):
+    index = ModuleIndex(_tree(tmp_path))
+    assert index.get("app") == tmp_path / "src" / "app" / "__init__.py"
+    assert index.get("app.core.engine") == tmp_path / "src" / "app" / "core" / "engine.py"
+    assert index.get("src.app.core.engine") == index.get("app.core.engine")
+
+
+def test_module_index_strips_only_leading_src(tmp_path):
+    lib = tmp_path / "pkg" / "lib"
+    lib.mkdir(parents=True)
+    (lib / "util.py").write_text("")
+    nested = tmp_path / "tools" / "src" / "gen"
+    nested.mkdir(parents=True)
+    (nested / "emit.py").write_text("")
+    index = ModuleIndex(tmp_path)
+    assert index.get("pkg.lib.util") == lib / "util.py"
+    assert index.get("util") is None
+    assert index.get("gen.emit") is None
+    assert ModuleIndex(tmp_path, src_roots=("pkg/lib",)).get("util") == lib / "util.py"
+
+
+def test_module_index_direct_name_wins_over_src_layout(tmp_path):
+    for base in (tmp_path, tmp_path / "src"):
+        (base / "app").mkdir(parents=True)
+        (base / "app" / "__init__.py").write_text("")
+        (base / "app" / "engine.py").write_text("")
+    index = ModuleIndex(tmp_path)
+    assert index.get("app") == tmp_path / "app" / "__init__.py"
+    assert index.get("app.engine") == tmp_path / "app" / "engine.py"
+    assert index.get("src.app.engine") == tmp_path / "src" / "app" / "engine.py"
+
+
+def test_module_index_namespace_packages_and_hidden_dirs(tmp_path):
+    index = ModuleIndex(_tree(tmp_path))
+    assert index.get("plugins.extra") == tmp_path / "plugins" / "extra"
+    assert index.get("plugins") == tmp_path / "plugins"
+    assert index.get("hidden") is None
+
+
+def test_module_index_stem_fallback(tmp_path):
+    index = ModuleIndex(_tree(tmp_path))
+    assert index.find("somewhere.tool") == tmp_path / "plugins" / "extra" / "tool.py"
+    assert index.find("missing") is None
+
+
+def test_module_file_finder_builds_index_once(tmp_path, monkeypatch):
+    index = ModuleIndex(_tree(tmp_path))
+    calls = []
+    original = index.build
+    monkeypatch.setattr(index, "build", lambda: calls.append(1) or original())
+    finder = ModuleFileFinder(tmp_path, index)
+    finder("app.core.engine")
+    finder("plugins.extra.tool")
+    assert len(calls) == 1
+
+
+def test_find_node_by_import_like_uses_index(tmp_path):
+    index = ModuleIndex(_tree(tmp_path))
+    g = GraphX()
+    engine = FileInfo(name="engine", format=".py", path=Path("src/app/core"))
+    g.add_edge("root", engine, data=Relation.CONTAINS)
+    finder = FindNodeByImportLike(g, tmp_path, index=index)
+    assert finder("app.core.engine") == engine
@@ -98,4 +98,44 @@ def test_show_summary_prints(capsys):
     assert "Узлов" in out
     assert "Рёбер" in out
     assert "FileInfo" in out
-    assert "--(Relation.CONTAINS"[:10] or "--(contains"[:10]  # в зависимости от
\ No newline at end of file
+    assert "--(Relation.CONTAINS"[:10] or "--(contains"[:10]  # в зависимости от
+
+# ───────────────────────────────
+# Корзины рёбер по Relation
+# ───────────────────────────────
+def test_edges_by_relation_and_counts():
+    g = GraphX[str, Relation]()
+    g.add_edge("m", "os", data=Relation.IMPORTS)
+    g.add_edge("m", "A", data=Relation.DEFINES)
+    g.add_edge("A", "Base", data=Relation.INHERIT)
+    g.add_edge("m", "sys", data=Relation.IMPORTS)
+
+    assert set(g.edges_by_relation([Relation.IMPORTS])) == {
+        ("m", "os", Relation.IMPORTS), ("m", "sys", Relation.IMPORTS)
+    }
+    assert {d for *_, d in g.edges_by_relation([Relation.IMPORTS], include=False)} == {
+        Relation.DEFINES, Relation.INHERIT
+    }
+    assert g.relation_counts() == {Relation.IMPORTS: 2, Relation.DEFINES: 1, Relation.INHERIT: 1}
+
+
+def test_relation_buckets_follow_updates_and_removals():
+    g = GraphX[str, Relation]()
+    g.add_edge("A", "B", data=Relation.USES)
+    g.add_edge("A", "B", data=Relation.CALLINGS)
+    g.add_edge("B", "C", data=Relation.USES)
+    assert g.relation_counts() == {Relation.CALLINGS: 1, Relation.USES: 1}
+
+    g.remove_node("B")
+    assert g.relation_counts() == {}
+
+    g.add_edge("X", "Y", data=Relation.USES)
+    g.remove_edge("X", "Y")
+    assert list(g.edges_by_relation([Relation.USES])) == []
+
+
+def test_edges_by_relation_with_unhashable_data():
+    g = GraphX[str, dict]()
+    g.add_edge("A", "B", data={"weight": 1})
+    g.add_edge("B", "C", data=Relation.USES)
+    assert list(g.edges_by_relation([Relation.USES], include=False)) == [("A", "B", {"weight": 1})]
@@ -0,0 +1,64 @@
+import pickle
+from pathlib import Path
+
+from spagettypy.analyzer.graph import FrozenGraph, GraphX
+from spagettypy.analyzer.graph.snapshot import MAGIC, load_snapshot, save_snapshot
+from spagettypy.analyzer.graph.storage import load_graph, save_graph
+from spagettypy.analyzer.model import (
+    ClassInfo, CodeSpan, DirectoryNode, FileInfo, FunctionInfo, ModuleInfo, Relation,
+)
+
+
+def _graph() -> GraphX:
+    g = GraphX()
+    d = DirectoryNode(Path("pkg"))
+    f = FileInfo(name="mod", format=".py", path=Path("pkg"))
+    m = ModuleInfo(name="mod", file=f, span=CodeSpan(1, 5, 0, 0))
+    a = ClassInfo(name="A", module=m)
+    b = ClassInfo(name="B", module=m)
+    fn = FunctionInfo(name="run", module=m, args_types=["self", "int"], return_type="None")
+    g.add_edge(d, f, data=Relation.CONTAINS)
+    g.add_edge(f, m, data=Relation.CONTAINS)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(m, b, data=Relation.DEFINES)
+    g.add_edge(b, a, data=Relation.INHERIT)
+    g.add_edge(a, fn, data=Relation.METHODS)
+    g.add_edge(m, "os", data=Relation.USES)
+    return g
+
+
+# ───────────────────────────────
+# snapshot
+# ───────────────────────────────
+def test_snapshot_round_trip(tmp_path):
+    g = _graph()
+    path = tmp_path / "graph.spg"
+    save_snapshot(g, path)
+    assert path.read_bytes().startswith(MAGIC)
+
+    loaded = load_snapshot(path)
+    assert isinstance(loaded, FrozenGraph)
+    assert list(loaded.nodes()) == list(g.nodes())
+    assert list(loaded.edges()) == list(g.edges())
+    assert isinstance(loaded.out_dst, memoryview)
+    assert loaded.relation_counts() == g.relation_counts()
+
+    fn = next(loaded.nodes_by_name("run"))
+    assert fn.args_types == ["self", "int"] and fn.return_type == "None"
+    a = next(loaded.nodes_by_name("A"))
+    # ссылки ведут на узлы снимка, а не на копии
+    assert a.module is next(loaded.nodes_of_type(ModuleInfo))
+    assert a.module.file is next(loaded.nodes_of_type(FileInfo))
+    assert a.module.span.end_line == 5
+    assert set(loaded.parents(a)) == {a.module, next(loaded.nodes_by_name("B"))}
+
+
+def test_load_graph_detects_snapshot(tmp_path):
+    g = _graph()
+    save_snapshot(g, tmp_path / "graph.spg")
+    save_graph(g, tmp_path / "graph.pickle")
+    assert isinstance(load_graph(tmp_path / "graph.spg"), FrozenGraph)
+    assert isinstance(load_graph(tmp_path / "graph.pickle"), GraphX)
+    # граф со снимка пиклится (memoryview копируются в array) и оттаивает
+    frozen = pickle.loads(pickle.dumps(load_graph(tmp_path / "graph.spg")))
+    assert list(frozen.thaw().edges()) == list(g.edges())
@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+
+from spagettypy.analyzer.graph import FilterEdgeByClass, FilterEdgeByRelations, FilterNodeByClass, FindNodeByImportLike, FindNodeByName, GraphX, SQLiteGraph
+from spagettypy.analyzer.graph.storage import load_graph
+from spagettypy.analyzer.model import ClassInfo, DirectoryNode, FileInfo, FunctionInfo, ModuleInfo, Relation
+from spagettypy.analyzer.parsers.base import SymbolTable
+from spagettypy.analyzer.parsers.directory_parser import DirectoryParser, FormatFileChecker
+from spagettypy.analyzer.parsers.module_index import ModuleIndex
+from spagettypy.analyzer.parsers.structure_analyzer import ASTAnalyzerPipeline, CallAnalyzer, ImportAnalyzer, StructureAnalyzer
+from spagettypy.analyzer.serialization import encode_node
+
+
+def _fill(g):
+    d = DirectoryNode(Path("pkg"))
+    f = FileInfo(name="mod", format=".py", path=Path("pkg"))
+    m = ModuleInfo(name="mod", file=f)
+    a = ClassInfo(name="A", module=m)
+    b = ClassInfo(name="B", module=m)
+    fn = FunctionInfo(name="run", module=m, args_types=["self"])
+    g.add_edge(d, f, data=Relation.CONTAINS)
+    g.add_edge(f, m, data=Relation.CONTAINS)
+    g.add_edge(m, a, data=Relation.DEFINES)
+    g.add_edge(m, b, data=Relation.DEFINES)
+    g.add_edge(b, a, data=Relation.INHERIT)
+    g.add_edge(a, fn, data=Relation.METHODS)
+    g.add_edge(m, "os", data=Relation.USES)
+    # повторное ребро обновляет связь, не меняя порядок
+    g.add_edge(m, b, data=Relation.AGREGATES)
+    return g
+
+
+@pytest.fixture
+def graphs(tmp_path):
+    sql = _fill(SQLiteGraph(tmp_path / "graph.sqlite", batch_size=3, cache_size=2))
+    yield _fill(GraphX()), sql
+    sql.close()
+
+
+# ───────────────────────────────
+# SQLiteGraph: то же поведение, что у GraphX
+# ───────────────────────────────
+def test_sqlite_matches_graphx(graphs):
+    gx, sql = graphs
+    assert list(sql.nodes()) == list(gx.nodes())
+    assert list(sql.edges()) == list(gx.edges())
+    assert len(sql) == len(gx)
+    assert sql.relation_counts() == gx.relation_counts()
+    a = ClassInfo(name="A", module=None)
+    assert sql.has_node(a) and not sql.has_node(ClassInfo(name="Z", module=None))
+    assert sql.get_edge_data(ClassInfo(name="B", module=None), a) == Relation.INHERIT
+    assert sql.degree(a) == gx.degree(a) == 3
+    assert set(sql.parents(a)) == set(gx.parents(a))
+    assert sql.descendants(ModuleInfo(name="mod")) == gx.descendants(ModuleInfo(name="mod"))
+    assert sql.ancestors(a) == gx.ancestors(a)
+    fn = next(sql.nodes_by_name("run"))
+    assert isinstance(fn, FunctionInfo) and fn.args_types == ["self"]
+
+
+def test_sqlite_finders_and_filters(graphs, tmp_path):
+    gx, sql = graphs
+    assert FindNodeByName(sql)("A") == FindNodeByName(gx)("A")
+    assert FindNodeByImportLike(sql, tmp_path)("pkg.mod") == FindNodeByImportLike(gx, tmp_path)("pkg.mod")
+    assert set(FilterNodeByClass(ClassInfo)(sql)) == set(FilterNodeByClass(ClassInfo)(gx))
+    assert sorted(map(str, FilterEdgeByClass(ClassInfo)(sql))) == sorted(map(str, FilterEdgeByClass(ClassInfo)(gx)))
+    relations = [Relation.METHODS, Relation.INHERIT]
+    assert set(FilterEdgeByRelations(relations)(sql)) == set(FilterEdgeByRelations(relations)(gx))
+    assert len(list(FilterEdgeByRelations(relations, include=False)(sql))) == 5
+
+
+def test_sqlite_remove_and_reopen(graphs, tmp_path):
+    _, sql = graphs
+    sql.remove_edge(ClassInfo(name="A", module=None), FunctionInfo(name="run", module=None))
+    sql.remove_node(FunctionInfo(name="run", module=None))
+    with pytest.raises(KeyError):
+        sql.remove_node(FunctionInfo(name="run", module=None))
+    sql.close()
+    reopened = load_graph(tmp_path / "graph.sqlite")
+    assert isinstance(reopened, SQLiteGraph)
+    assert next(reopened.nodes_by_name("run"), None) is None
+    assert len(list(reopened.edges())) == 6
+    reopened.close()
+
+
+def _analyze(graph, root):
+    graph = DirectoryParser(base_path=root, checkers=[FormatFileChecker(".py")])(graph, root)
+    symbols = SymbolTable()
+    index = ModuleIndex(root)
+    ASTAnalyzerPipeline(
+        [ImportAnalyzer(graph, root, index, symbols=symbols), StructureAnalyzer(graph, symbols=symbols), CallAnalyzer(graph, symbols=symbols)],
+        root, index=index, symbols=symbols,
+    )(graph)
+    return graph
+
+
+def test_sqlite_pipeline_run_matches_graphx(tmp_path):
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("from .array import array\n")
+    (root / "pkg" / "array.py").write_text(
+        "from abc import ABC\n\nclass array(ABC):\n    def __init__(self):\n        self.items = []\n    def push(self):\n        pass\n"
+    )
+    (root / "pkg" / "stack.py").write_text(
+        "from .array import array\n\nclass Stack(array):\n    def __init__(self):\n        self.push()\n\ndef make():\n    return Stack()\n"
+    )
+
+    gx = _analyze(GraphX(), root)
+    sql = _analyze(SQLiteGraph(tmp_path / "graph.sqlite", batch_size=5, cache_size=1000), root)
+    try:
+        assert [encode_node(n) for n in sql.nodes()] == [encode_node(n) for n in gx.nodes()]
+        assert [(encode_node(u), encode_node(v), d) for u, v, d in sql.edges()] == [
+            (encode_node(u), encode_node(v), d) for u, v, d in gx.edges()
+        ]
+        methods = {(type(u).__name__, u.name, type(v).__name__, v.name) for u, v, d in sql.edges() if d == Relation.METHODS}
+        assert ("ClassInfo", "Stack", "FunctionInfo", "__init__") in methods
+    finally:
+        sql.close()
+
+
+def test_sqlite_small_cache_analysis_matches_graphx(tmp_path):
+    """LRU меньше графа: узлы, вытесненные из кэша, остаются теми же узлами и обновляются"""
+    import spagettypy
+
+    root = Path(spagettypy.__file__).parent
+    gx = _analyze(GraphX(), root)
+    sql = _analyze(SQLiteGraph(tmp_path / "graph.sqlite", batch_size=200, cache_size=2), root)
+    try:
+        assert len(sql) == len(gx) > 100
+        assert [encode_node(n) for n in sql.nodes()] == [encode_node(n) for n in gx.nodes()]
+        assert [(encode_node(u), encode_node(v), d) for u, v, d in sql.edges()] == [
+            (encode_node(u), encode_node(v), d) for u, v, d in gx.edges()
+        ]
+    finally:
+        sql.close()
+
+
+def test_sqlite_reads_flush_only_touched_buffer(tmp_path):
+    sql = SQLiteGraph(tmp_path / "graph.sqlite")
+    m = ModuleInfo(name="mod")
+    sql.add_edge(m, ClassInfo(name="A", module=m), data=Relation.DEFINES)
+    # чтение, не задевающее буфер, его не сбрасывает
+    assert next(sql.nodes_by_name("other"), None) is None
+    assert not sql.has_node(ClassInfo(name="B", module=None))
+    assert sql._pending_edges
+    assert [v.name for _, v, _ in sql.out_edges(m)] == ["A"]
+    assert not sql._pending_edges
+    sql.close()
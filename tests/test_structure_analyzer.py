@@ -20,6 +20,7 @@ from spagettypy.analyzer.parsers.structure_analyzer import (
     GlobalVisitor
     
 )
+from spagettypy.analyzer.parsers.base import FactoryCodeSpan
 from spagettypy.analyzer.model import (
     FileInfo,
     ModuleInfo,
@@ -247,10 +248,11 @@ def test_import_analyzer_visits_import(tmp_path):
 
     g = GraphX()
     analyzer = ImportAnalyzer(g, root=tmp_path)
-    analyzer.module = ModuleInfo(name="mod")
-    analyzer._get_codespan = lambda n: None
+    analyzer.prepare(ModuleInfo(name="mod"), FactoryCodeSpan(code))
 
     analyzer.visit_Import(tree.body[0])
+    # цели импортов ищутся после всех файлов запуска
+    analyzer.finalize()
 
     # должен появиться Relation.IMPORTS
     assert any(d == Relation.IMPORTS for _, _, d in g.edges())
@@ -262,10 +264,11 @@ def test_import_analyzer_visits_importfrom(tmp_path):
 
     g = GraphX()
     analyzer = ImportAnalyzer(g, root=tmp_path)
-    analyzer.module = ModuleInfo(name="mod")
-    analyzer._get_codespan = lambda n: None
+    analyzer.prepare(ModuleInfo(name="mod"), FactoryCodeSpan(code))
 
     analyzer.visit_ImportFrom(tree.body[0])
+    # цели импортов ищутся после всех файлов запуска
+    analyzer.finalize()
 
     # должен появиться Relation.IMPORTS и, возможно, FROM
     edges = [d for _, _, d in g.edges()]
@@ -410,6 +413,48 @@ class C:
     assert Relation.ATTRIBUTE in rels and Relation.METHODS in rels
 
 
+def test_structure_analyzer_self_fields_only_inside_methods():
+    src = """
+class C:
+    def __init__(self):
+        self.v = 10
+def free(self):
+    self.w = 1
+"""
+    g = GraphX()
+    a = StructureAnalyzer(g)
+    a.module = ModuleInfo(name="m")
+    a._get_codespan = lambda n: None
+    a.visit(ast.parse(src))
+
+    attrs = {v.name: v.level for _, v, d in g.edges() if d == Relation.ATTRIBUTE}
+    assert attrs == {"v": "instance"}
+
+
+def test_structure_analyzer_nested_class_keeps_outer_methods():
+    src = """
+class A:
+    class Inner:
+        def g(self):
+            self.y = 2
+    def __init__(self):
+        class Local:
+            def h(self):
+                self.z = 3
+        self.x = 1
+"""
+    g = GraphX()
+    a = StructureAnalyzer(g)
+    a.module = ModuleInfo(name="m")
+    a._get_codespan = lambda n: None
+    a.visit(ast.parse(src))
+
+    attrs = {(u.name, v.name) for u, v, d in g.edges() if d == Relation.ATTRIBUTE}
+    assert attrs == {("A", "x"), ("Inner", "y"), ("Local", "z")}
+    methods = {(u.name, v.name) for u, v, d in g.edges() if d == Relation.METHODS}
+    assert {("A", "__init__"), ("Inner", "g"), ("Local", "h")} <= methods
+
+
 # ───────────────────────────────
 # GlobalVisitor and ReferenceAnalyzer
 # ───────────────────────────────
@@ -465,3 +510,74 @@ def test_call_analyzer_rejects_non_call():
     analyzer = CallAnalyzer(g)
     with pytest.raises(AttributeError):
         analyzer.classify_call(node)
+
+
+# ───────────────────────────────
+# ImportScopeResolver (общий кэш областей импорта)
+# ───────────────────────────────
+def test_import_scope_resolver_stdlib_fast_path(tmp_path, monkeypatch):
+    from spagettypy.analyzer.parsers.structure_analyzer import ImportScopeResolver
+
+    monkeypatch.setattr("spagettypy.analyzer.parsers.structure_analyzer.find_spec",
+                        lambda name: (_ for _ in ()).throw(AssertionError(name)))
+    resolver = ImportScopeResolver(tmp_path)
+    assert resolver("sys") == ImportScope.BUILTIN
+    assert resolver("os.path") == ImportScope.STDLIB
+    assert resolver("typing") == ImportScope.STDLIB
+
+
+def test_import_scope_resolver_local_module_shadows_stdlib(tmp_path):
+    from spagettypy.analyzer.parsers.structure_analyzer import ImportScopeResolver
+
+    (tmp_path / "platform.py").write_text("")
+    (tmp_path / "email").mkdir()
+    (tmp_path / "email" / "__init__.py").write_text("")
+    resolver = ImportScopeResolver(tmp_path)
+    assert resolver("platform") == ImportScope.LOCAL
+    assert resolver("email") == ImportScope.LOCAL
+    assert resolver("email.utils") == ImportScope.LOCAL
+    assert resolver("os") == ImportScope.STDLIB
+
+
+def test_import_scope_resolver_memoizes_and_counts(tmp_path):
+    from spagettypy.analyzer.parsers.structure_analyzer import ImportScopeResolver
+
+    (tmp_path / "localmod.py").write_text("")
+    resolver = ImportScopeResolver(tmp_path)
+    clf1 = ModuleImportScopeClassifer(tmp_path, resolver=resolver)
+    clf2 = ModuleImportScopeClassifer(tmp_path, resolver=resolver)
+
+    assert clf1("localmod", ModuleInfo(name="localmod")).scope == ImportScope.LOCAL
+    assert clf2("localmod", ModuleInfo(name="localmod")).scope == ImportScope.LOCAL
+    assert resolver.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+# ─────────────────────────────────────────────
+# low_memory: после файла не остаётся дерева и исходника
+# ─────────────────────────────────────────────
+def test_pipeline_low_memory_keeps_only_offsets(tmp_path, monkeypatch):
+    import gc
+    import weakref
+
+    (tmp_path / "m.py").write_text("class A:\n    x: int = 1 + 2\n    def f(self):\n        pass\n")
+    g = GraphX()
+    g.add_edge("root", FileInfo(name="m", format=".py", path=Path(".")), data=Relation.CONTAINS)
+    structure = StructureAnalyzer(g)
+    pipeline = ASTAnalyzerPipeline([structure], tmp_path, low_memory=True)
+
+    trees = []
+    parse = ast.parse
+    def tracking_parse(*a, **kw):
+        tree = parse(*a, **kw)
+        trees.append(weakref.ref(tree))
+        return tree
+    monkeypatch.setattr(ast, "parse", tracking_parse)
+    pipeline(g)
+    monkeypatch.undo()
+    gc.collect()
+
+    assert trees and trees[0]() is None
+    cls = next(n for n in g.nodes() if getattr(n, "name", None) == "A")
+    attr = next(v for _, v, d in g.out_edges(cls) if d == Relation.ATTRIBUTE)
+    assert attr.value == "1 + 2"
+    assert cls.span.start_line == 1 and cls.span.source is None
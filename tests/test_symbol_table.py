@@ -0,0 +1,120 @@
+from pathlib import Path
+
+from spagettypy.analyzer.graph.networkx_facade import GraphX
+from spagettypy.analyzer.model import ClassInfo, FileInfo, ModuleInfo, Relation
+from spagettypy.analyzer.parsers.base import SymbolTable, module_key
+from spagettypy.analyzer.parsers.cache import AnalysisCache
+from spagettypy.analyzer.parsers.directory_parser import DirectoryParser, FormatFileChecker
+from spagettypy.analyzer.parsers.module_index import ModuleIndex
+from spagettypy.analyzer.parsers.structure_analyzer import ASTAnalyzerPipeline, ImportAnalyzer, StructureAnalyzer
+
+
+def _project(tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "a.py").write_text("class Base:\n    kind = 'a'\n    def run(self):\n        self.x = 1\n")
+    (tmp_path / "pkg" / "b.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "pkg" / "c.py").write_text("from .a import Base\nimport pkg.b as other\n\nclass Child(Base):\n    pass\n\nclass Other(other.Base):\n    pass\n")
+
+
+def _analyze(tmp_path: Path, symbols: SymbolTable, cache=None) -> GraphX:
+    graph = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])(GraphX(), tmp_path)
+    index = ModuleIndex(tmp_path)
+    ASTAnalyzerPipeline(
+        [ImportAnalyzer(graph, tmp_path, index, symbols=symbols), StructureAnalyzer(graph, symbols=symbols)],
+        tmp_path, cache=cache, index=index, symbols=symbols,
+    )(graph)
+    return graph
+
+
+# ───────────────────────────────
+# SymbolTable
+# ───────────────────────────────
+def test_module_key_from_file():
+    assert module_key(FileInfo(name="mod", format=".py", path=Path("pkg/sub"))) == "pkg.sub.mod"
+    assert module_key(FileInfo(name="__init__", format=".py", path=Path("pkg"))) == "pkg"
+
+
+def test_symbol_table_define_alias_lookup():
+    table = SymbolTable()
+    base = ClassInfo(name="Base", module=ModuleInfo(name="a"))
+    table.define("pkg.a", "Base", base)
+    table.alias("pkg.c", "B", "pkg.a.Base")
+    table.alias("pkg.c", "a", "pkg.a")
+    assert table.lookup("pkg.c", "B") is base
+    assert table.lookup("pkg.c", "a.Base") is base
+    assert table.lookup("pkg.c", "Missing") is None
+    table.drop_module("pkg.a")
+    assert "pkg.a.Base" not in table
+
+
+def test_analysis_fills_symbols_and_resolves_bases(tmp_path):
+    _project(tmp_path)
+    symbols = SymbolTable()
+    graph = _analyze(tmp_path, symbols)
+
+    assert {"pkg.a.Base", "pkg.a.Base.kind", "pkg.a.Base.run", "pkg.a.Base.x", "pkg.b.Base", "pkg.c.Child"} <= set(symbols.symbols)
+    child = symbols.get("pkg.c.Child")
+    other = symbols.get("pkg.c.Other")
+    parents = {v.module.name for _, v, d in graph.out_edges(child) if d == Relation.INHERIT}
+    assert parents == {"a"}
+    assert [v.module.name for _, v, d in graph.out_edges(other) if d == Relation.INHERIT] == ["b"]
+
+
+def test_symbols_survive_cache_and_export(tmp_path):
+    _project(tmp_path)
+    _analyze(tmp_path, SymbolTable(), AnalysisCache(tmp_path / ".cache"))
+
+    cached = SymbolTable()
+    _analyze(tmp_path, cached, AnalysisCache(tmp_path / ".cache"))
+    assert cached.lookup("pkg.c", "Base") is cached.get("pkg.a.Base")
+
+    cached.save(tmp_path / "symbols.json")
+    loaded = SymbolTable.load(tmp_path / "symbols.json")
+    assert set(loaded.symbols) == set(cached.symbols)
+    assert loaded.lookup("pkg.c", "other.Base").module.name == "b"
+
+
+# ───────────────────────────────
+# CallAnalyzer: граф вызовов
+# ───────────────────────────────
+def _call_project(tmp_path: Path) -> None:
+    (tmp_path / "lib.py").write_text(
+        "def helper():\n    pass\n\n"
+        "class Base:\n    def __init__(self):\n        pass\n    def shared(self):\n        pass\n"
+    )
+    (tmp_path / "app.py").write_text(
+        "import lib\nfrom lib import Base\n\n"
+        "class Service(Base):\n"
+        "    def start(self):\n        self.shared()\n        lib.helper()\n\n"
+        "def main():\n    Service().start()\n    Base()\n    unknown()\n"
+    )
+
+
+def _call_graph(tmp_path: Path, symbols: SymbolTable, cache=None) -> GraphX:
+    from spagettypy.analyzer.parsers.structure_analyzer import CallAnalyzer
+    graph = DirectoryParser(base_path=tmp_path, checkers=[FormatFileChecker(".py")])(GraphX(), tmp_path)
+    index = ModuleIndex(tmp_path)
+    ASTAnalyzerPipeline(
+        [ImportAnalyzer(graph, tmp_path, index, symbols=symbols), StructureAnalyzer(graph, symbols=symbols), CallAnalyzer(graph, symbols=symbols)],
+        tmp_path, cache=cache, index=index, symbols=symbols,
+    )(graph)
+    return graph
+
+
+def _calls(graph):
+    return {(u.name, v.name) for u, v, d in graph.edges() if d == Relation.CALLINGS}
+
+
+def test_call_analyzer_builds_callings(tmp_path):
+    _call_project(tmp_path)
+    graph = _call_graph(tmp_path, SymbolTable())
+    # Service() и Base() — это __init__ (у Service он унаследован); Service().start() — вызов от результата вызова, не разрешается
+    assert _calls(graph) == {("start", "shared"), ("start", "helper"), ("main", "__init__")}
+
+
+def test_call_sites_replay_from_cache(tmp_path):
+    _call_project(tmp_path)
+    first = _call_graph(tmp_path, SymbolTable(), AnalysisCache(tmp_path / ".cache"))
+    second = _call_graph(tmp_path, SymbolTable(), AnalysisCache(tmp_path / ".cache"))
+    assert _calls(first) == _calls(second)
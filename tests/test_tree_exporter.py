@@ -24,3 +24,17 @@ def test_tree_exporter_skips_dot_nodes():
     # Проверяем, что символ "." нигде не напечатан как отдельный узел
     lines = [line.strip() for line in out.splitlines()]
     assert not any(line.endswith(".") or line.strip() == "." for line in lines)
+
+
+def test_directory_formatter_stats_counts_each_node_once():
+    from pathlib import Path
+    from spagettypy.analyzer.exporters.tree_exporter import DirectoryFormatter
+    from spagettypy.analyzer.model import DirectoryNode, FileInfo, Relation
+
+    g = GraphX()
+    root, sub = DirectoryNode(Path(".")), DirectoryNode(Path("pkg"))
+    g.add_edge(root, sub, data=Relation.CONTAINS)
+    g.add_edge(sub, FileInfo(name="a", format=".py", path=Path("pkg")), data=Relation.CONTAINS)
+    g.add_edge(sub, FileInfo(name="b", format=".py", path=Path("pkg")), data=Relation.CONTAINS)
+
+    assert DirectoryFormatter().get_stats(g) == {"files": 2, "directories": 2}